@@ -0,0 +1,68 @@
+"""
+Compare the sync (DRF) and async read endpoints under concurrent load.
+
+Start the server twice, once per worker type, and run this against each:
+
+    # WSGI, sync workers
+    gunicorn -c gunicorn.conf.py
+    python -m benchmarks.compare_async --base-url http://localhost:5000 \
+        --username bench --password benchpass123 --label wsgi
+
+    # ASGI, uvicorn workers
+    GUNICORN_ASYNC=True gunicorn -c gunicorn.conf.py
+    python -m benchmarks.compare_async ... --label asgi
+
+Each run prints one JSON document with req/s and p50/p90/p99 latency for
+/posts/ vs /async/posts/, /posts/<id>/ vs /async/posts/<id>/ and the
+comment list, so results can be diffed between runs.
+"""
+
+import argparse
+import json
+import sys
+
+from benchmarks.loadgen import obtain_token, run_load
+
+PAIRS = [
+    ("post_list", "/posts/?page_size=20", "/async/posts/?page_size=20"),
+    ("post_detail", "/posts/{post_id}/", "/async/posts/{post_id}/"),
+    (
+        "post_comments",
+        "/posts/{post_id}/comments/?page_size=20",
+        "/async/posts/{post_id}/comments/?page_size=20",
+    ),
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:5000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--post-id", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--label", default="", help="Free-form run label.")
+    args = parser.parse_args(argv)
+
+    token = obtain_token(args.base_url, args.username, args.password)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    results = []
+    for name, sync_path, async_path in PAIRS:
+        for variant, path in (("sync", sync_path), ("async", async_path)):
+            result = run_load(
+                args.base_url,
+                path.format(post_id=args.post_id),
+                args.requests,
+                args.concurrency,
+                headers=headers,
+            )
+            results.append({"endpoint": name, "variant": variant, **result})
+
+    json.dump({"label": args.label, "results": results}, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
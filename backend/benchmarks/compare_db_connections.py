@@ -0,0 +1,125 @@
+"""
+Compare per-request latency across PostgreSQL connection modes.
+
+Starts gunicorn once per mode, with the same PostgreSQL settings as the
+current environment, and load-tests endpoints that always query the
+database:
+
+    per_request  DB_CONN_MAX_AGE=0: a new connection for every request
+    persistent   DB_CONN_MAX_AGE=60 with health checks
+    pooled       DB_POOL=True: a psycopg pool per worker
+
+Seed data first (python -m benchmarks.run or manage.py seed_blog), then:
+
+    python -m benchmarks.compare_db_connections --username bench_0 \
+        --password benchpass123 --workers 4 --threads 4
+
+Prints one JSON document with req/s and p50/p90/p99 latency per mode and
+endpoint, so results can be diffed between runs.
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from benchmarks.loadgen import obtain_token, run_load
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+MODES = {
+    "per_request": {"DB_POOL": "False", "DB_CONN_MAX_AGE": "0"},
+    "persistent": {"DB_POOL": "False", "DB_CONN_MAX_AGE": "60"},
+    "pooled": {"DB_POOL": "True"},
+}
+
+ENDPOINTS = [
+    ("post_comments", "/posts/{post_id}/comments/?page_size=20"),
+    ("my_posts", "/posts/my/?page_size=20"),
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_gunicorn(env, port, timeout=30):
+    """
+    Start gunicorn with gunicorn.conf.py and wait until /health/ answers.
+    """
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"],
+        cwd=BACKEND_DIR,
+        env={**env, "GUNICORN_PORT": str(port), "THROTTLE_ENABLED": "False"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health/", timeout=1)
+            return process
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("gunicorn did not start; check the database settings.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--post-id", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = parser.parse_args(argv)
+
+    results = []
+    for mode in args.modes:
+        env = {
+            **os.environ,
+            **MODES[mode],
+            "GUNICORN_WORKERS": str(args.workers),
+            "GUNICORN_THREADS": str(args.threads),
+        }
+        env.pop("DB_POOL_MAX_SIZE", None)
+        port = free_port()
+        process = start_gunicorn(env, port)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            token = obtain_token(base_url, args.username, args.password)
+            headers = {"Authorization": f"Bearer {token}"}
+            for name, path in ENDPOINTS:
+                result = run_load(
+                    base_url,
+                    path.format(post_id=args.post_id),
+                    args.requests,
+                    args.concurrency,
+                    headers=headers,
+                )
+                results.append({"mode": mode, "endpoint": name, **result})
+        finally:
+            process.terminate()
+            process.wait()
+
+    json.dump(
+        {"workers": args.workers, "threads": args.threads, "results": results},
+        sys.stdout,
+        indent=2,
+    )
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
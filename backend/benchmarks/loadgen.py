@@ -0,0 +1,113 @@
+"""
+Minimal concurrent HTTP load generator built on the standard library.
+
+Each client thread keeps one keep-alive connection open and issues
+requests back to back, so the numbers reflect server throughput rather
+than connection setup.
+"""
+
+import http.client
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+def obtain_token(base_url, username, password):
+    """
+    Log in through /api/token/ and return an access token.
+    """
+    parts = urlsplit(base_url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+    body = json.dumps({"username": username, "password": password})
+    connection.request(
+        "POST", "/api/token/", body, {"Content-Type": "application/json"}
+    )
+    response = connection.getresponse()
+    payload = json.loads(response.read())
+    connection.close()
+    if response.status != 200:
+        raise RuntimeError(f"Login failed ({response.status}): {payload}")
+    return payload["access"]
+
+
+def percentile(samples, fraction):
+    """
+    Nearest-rank percentile of a sorted list.
+    """
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, max(0, round(fraction * len(samples)) - 1))
+    return samples[index]
+
+
+def run_load(
+    base_url, path, requests, concurrency, method="GET", headers=None, body=None
+):
+    """
+    Issue ``requests`` requests to ``path`` from ``concurrency`` clients.
+
+    ``body`` may be a callable taking the request number, so write endpoints
+    can send unique payloads. Returns a dict of throughput and latency
+    percentiles (milliseconds).
+    """
+    parts = urlsplit(base_url)
+    headers = dict(headers or {})
+    counter = iter(range(requests))
+    lock = threading.Lock()
+    latencies = []
+    statuses = {}
+
+    def next_request():
+        with lock:
+            return next(counter, None)
+
+    def client():
+        connection = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+        local = []
+        local_statuses = {}
+        while (number := next_request()) is not None:
+            payload = body(number) if callable(body) else body
+            started = time.perf_counter()
+            try:
+                connection.request(method, path, payload, headers)
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(
+                    parts.hostname, parts.port or 80
+                )
+                status = "error"
+            local.append((time.perf_counter() - started) * 1000)
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+        connection.close()
+        with lock:
+            latencies.extend(local)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(client)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "path": path,
+        "method": method,
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p90_ms": round(percentile(latencies, 0.90), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+        "statuses": {str(key): value for key, value in statuses.items()},
+    }
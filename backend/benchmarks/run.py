@@ -0,0 +1,257 @@
+"""
+Benchmark suite for the blog API.
+
+Seeds a configurable volume of authors, posts and comments, measures the
+number of database queries each endpoint runs, then drives the endpoints
+with concurrent clients and reports throughput and latency percentiles.
+Results are written as JSON so runs can be compared over time.
+
+Local run against SQLite (starts an in-process server):
+
+    DB_ENGINE=sqlite SQLITE_PATH=/tmp/bench.sqlite3 \
+        python -m benchmarks.run --posts 5000 --output results/sqlite.json
+
+Against a running server and PostgreSQL (e.g. the docker-compose `db`
+service), with the same settings/env as the server:
+
+    python -m benchmarks.run --base-url http://localhost:5000 --posts 100000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blogapi.settings")
+    # The load test hammers /api/token/ and /api/register/ from one address;
+    # measure the endpoints, not the rate limiter, for the in-process server.
+    os.environ.setdefault("THROTTLE_ENABLED", "False")
+    import django
+
+    django.setup()
+
+
+def start_server():
+    """
+    Serve the WSGI app on a free local port from a background thread.
+    """
+    from django.core.wsgi import get_wsgi_application
+
+    server = make_server(
+        "127.0.0.1",
+        0,
+        get_wsgi_application(),
+        server_class=ThreadingWSGIServer,
+        handler_class=QuietHandler,
+    )
+    server.request_queue_size = 1024
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def seed(options):
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+    call_command(
+        "seed_blog",
+        authors=options.authors,
+        posts=options.posts,
+        comments=options.comments,
+        password=options.password,
+        prefix=options.prefix,
+    )
+
+
+def endpoints(options, post_id, run_id):
+    """
+    Return the benchmarked requests as (name, method, path, body, auth) tuples.
+    """
+    login = json.dumps(
+        {"username": f"{options.prefix}_0", "password": options.password}
+    )
+
+    def register(number):
+        return json.dumps(
+            {
+                "username": f"reg_{run_id}_{number}",
+                "email": f"reg_{run_id}_{number}@example.com",
+                "password": options.password,
+            }
+        )
+
+    return [
+        ("post_list", "GET", "/posts/", None, True),
+        ("post_list_page", "GET", "/posts/?page_size=20", None, True),
+        ("post_detail", "GET", f"/posts/{post_id}/", None, True),
+        ("post_comments", "GET", f"/posts/{post_id}/comments/", None, True),
+        ("token_obtain_pair", "POST", "/api/token/", login, False),
+        ("register_user", "POST", "/api/register/", register, False),
+    ]
+
+
+def count_queries(requests, token):
+    """
+    Run each request once in-process and count its database queries.
+    """
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+
+    client = Client()
+    counts = {}
+    for name, method, path, body, auth in requests:
+        cache.clear()
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"} if auth else {}
+        payload = body(f"probe_{name}") if callable(body) else body
+        with CaptureQueriesContext(connection) as queries:
+            if method == "GET":
+                client.get(path, **headers)
+            else:
+                client.post(path, payload, content_type="application/json", **headers)
+        counts[name] = len(queries.captured_queries)
+    return counts
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results, stream):
+    columns = ("endpoint", "rps", "p50_ms", "p90_ms", "p99_ms", "queries")
+    stream.write("{:<20}{:>10}{:>10}{:>10}{:>10}{:>9}\n".format(*columns))
+    for row in results:
+        stream.write(
+            "{:<20}{:>10}{:>10}{:>10}{:>10}{:>9}\n".format(
+                *(row.get(column, "") for column in columns)
+            )
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the blog API.")
+    parser.add_argument("--base-url", help="Server to test; default: in-process.")
+    parser.add_argument("--authors", type=int, default=50)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--comments", type=int, default=5, help="Per post.")
+    parser.add_argument("--no-seed", action="store_true")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument(
+        "--auth-requests",
+        type=int,
+        default=50,
+        help="Requests for token/register, which hash passwords.",
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--password", default="benchpass123")
+    parser.add_argument("--prefix", default="bench")
+    parser.add_argument("--output", help="Write JSON results to this file.")
+    options = parser.parse_args(argv)
+
+    sys.path.insert(0, str(BACKEND_DIR))
+    setup_django()
+    from django.db import connection
+
+    from benchmarks.loadgen import obtain_token, run_load
+    from blog.models import Post
+
+    if not options.no_seed:
+        seed(options)
+
+    server = None
+    base_url = options.base_url
+    if base_url is None:
+        server, base_url = start_server()
+
+    post_id = (
+        Post.objects.filter(comment_count__gt=0)
+        .order_by("-id")
+        .values_list("id", flat=True)
+        .first()
+    )
+    if post_id is None:
+        raise SystemExit("No posts to benchmark; run without --no-seed.")
+
+    run_id = uuid.uuid4().hex[:8]
+    token = obtain_token(base_url, f"{options.prefix}_0", options.password)
+    requests = endpoints(options, post_id, run_id)
+    queries = count_queries(requests, token)
+
+    results = []
+    for name, method, path, body, auth in requests:
+        headers = {"Content-Type": "application/json"}
+        if auth:
+            headers["Authorization"] = f"Bearer {token}"
+        total = options.requests if auth else options.auth_requests
+        result = run_load(
+            base_url,
+            path,
+            total,
+            options.concurrency,
+            method=method,
+            headers=headers,
+            body=body,
+        )
+        results.append({"endpoint": name, "queries": queries[name], **result})
+
+    if server is not None:
+        server.shutdown()
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "database": connection.vendor,
+        "base_url": options.base_url or "in-process",
+        "volumes": {
+            "authors": options.authors,
+            "posts": Post.objects.count(),
+            "comments_per_post": options.comments,
+        },
+        "concurrency": options.concurrency,
+        "results": results,
+    }
+    print_table(results, sys.stderr)
+    if options.output:
+        path = Path(options.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2) + "\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    started = time.monotonic()
+    main()
+    sys.stderr.write(f"Finished in {time.monotonic() - started:.1f}s\n")
@@ -1,6 +1,11 @@
 from django.contrib import admin
 
-from .models import Author, Comment, Post
+from .counters import recount_comments, recount_replies, recount_tags
+from .feeds import fan_out
+from .models import Author, Category, Comment, Post, PostStatus, Tag
+from .publishing import publish_now
+from .rendering import rendered_fields
+from .slugs import rename_slug
 
 
 class AuthorAdmin(admin.ModelAdmin):
@@ -13,7 +18,14 @@ class AuthorAdmin(admin.ModelAdmin):
     readonly_fields: Prevents editing of created_at and updated_at fields.
     """
 
-    list_display = ("user", "bio", "website", "created_at", "updated_at")
+    list_display = (
+        "user",
+        "bio",
+        "website",
+        "follower_count",
+        "created_at",
+        "updated_at",
+    )
     search_fields = ("user__username", "bio", "website")
     list_filter = ("created_at", "updated_at")
     readonly_fields = (
@@ -28,14 +40,65 @@ class PostAdmin(admin.ModelAdmin):
 
     list_display: Specifies the fields to display in the list view.
     search_fields: Allows searching posts by title, content, and author's username.
-    list_filter: Adds filters for created and updated timestamps.
+    list_filter: Adds filters for status and created and updated timestamps.
     readonly_fields: Prevents editing of created_at and updated_at fields.
+    Saving a post with changed content re-renders content_html and excerpt;
+    posts are pushed into the author's followers' feeds when published.
+    Renaming a post moves its slug, keeping the old one as a redirect. Deleting posts
+    soft-deletes them (archive_posts removes them later) and refreshes the
+    post counts of their tags.
     """
 
-    list_display = ("title", "author", "created_at", "updated_at")
+    list_display = (
+        "title",
+        "author",
+        "status",
+        "publish_at",
+        "comment_count",
+        "view_count",
+        "created_at",
+        "updated_at",
+    )
     search_fields = ("title", "content", "author__user__username")
-    list_filter = ("created_at", "updated_at")
-    readonly_fields = ("created_at", "updated_at")
+    list_filter = ("status", "created_at", "updated_at")
+    readonly_fields = ("slug", "created_at", "updated_at")
+
+    def save_model(self, request, obj, form, change):
+        """
+        Save a post, rendering its content if it is new or changed, moving
+        its slug if the title changed and fanning it out once published.
+        Changing its status recounts its tags.
+        """
+        if not change or "content" in form.changed_data:
+            for name, value in rendered_fields(obj.content).items():
+                setattr(obj, name, value)
+        if change and "title" in form.changed_data:
+            obj.slug = rename_slug(obj, obj.title)
+        publishing = obj.status == PostStatus.PUBLISHED and (
+            not change or "status" in form.changed_data
+        )
+        if publishing:
+            for name, value in publish_now().items():
+                setattr(obj, name, value)
+        super().save_model(request, obj, form, change)
+        if publishing:
+            fan_out(obj)
+        if change and "status" in form.changed_data:
+            recount_tags(Tag.objects.filter(post_links__post=obj))
+
+    def delete_model(self, request, obj):
+        """
+        Soft-delete a post and refresh its tags' post counts.
+        """
+        self.delete_queryset(request, Post.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        """
+        Soft-delete posts and refresh the affected tags' post counts.
+        """
+        tag_ids = set(queryset.values_list("tag_links__tag_id", flat=True))
+        queryset.soft_delete()
+        recount_tags(Tag.objects.filter(pk__in=tag_ids))
 
 
 class CommentAdmin(admin.ModelAdmin):
@@ -46,14 +109,58 @@ class CommentAdmin(admin.ModelAdmin):
     search_fields: Allows searching comments by author's username, post title, and content.
     list_filter: Adds a filter for created_at timestamp.
     readonly_fields: Prevents editing of created_at field.
+    raw_id_fields: Picks the parent comment by id instead of listing every comment.
+    Deleting comments refreshes the denormalized counters on their posts
+    and parent comments.
     """
 
-    list_display = ("author", "post", "created_at")
+    list_display = ("author", "post", "depth", "created_at")
     search_fields = ("author__user__username", "post__title", "content")
     list_filter = ("created_at",)
     readonly_fields = ("created_at",)
+    raw_id_fields = ("parent",)
+
+    def delete_model(self, request, obj):
+        """
+        Delete a comment and refresh its post's comment counters.
+        """
+        super().delete_model(request, obj)
+        recount_comments(Post.objects.filter(pk=obj.post_id))
+        recount_replies(Comment.objects.filter(pk=obj.parent_id))
+
+    def delete_queryset(self, request, queryset):
+        """
+        Bulk-delete comments and refresh the affected posts' counters.
+        """
+        rows = list(queryset.values_list("post_id", "parent_id"))
+        super().delete_queryset(request, queryset)
+        recount_comments(Post.objects.filter(pk__in={post for post, _ in rows}))
+        recount_replies(Comment.objects.filter(pk__in={parent for _, parent in rows}))
+
+
+class CategoryAdmin(admin.ModelAdmin):
+    """
+    Custom admin configuration for the Category model.
+    """
+
+    list_display = ("name", "created_at")
+    search_fields = ("name",)
+
+
+class TagAdmin(admin.ModelAdmin):
+    """
+    Custom admin configuration for the Tag model.
+
+    Tags are created by posts; post_count is maintained by blog.tags.
+    """
+
+    list_display = ("name", "post_count")
+    search_fields = ("name",)
+    ordering = ("-post_count", "name")
 
 
 admin.site.register(Author, AuthorAdmin)
 admin.site.register(Post, PostAdmin)
 admin.site.register(Comment, CommentAdmin)
+admin.site.register(Category, CategoryAdmin)
+admin.site.register(Tag, TagAdmin)
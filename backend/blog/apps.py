@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
 
 
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
+
+    def ready(self):
+        from .metrics import install_query_wrapper
+        from .search import install_sqlite_search
+
+        post_migrate.connect(install_sqlite_search, sender=self)
+        connection_created.connect(install_query_wrapper)
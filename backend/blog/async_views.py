@@ -0,0 +1,312 @@
+import json
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, Max
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound
+from rest_framework.request import Request
+
+from . import cache as post_cache
+from .authentication import AuthorJWTAuthentication, aauthor_id_of
+from .conditional import (
+    latest,
+    make_etag,
+    not_modified_response,
+    set_conditional_headers,
+)
+from .events import comment_channel, get_broker
+from .models import Comment, Post
+from .pagination import CommentCursorPagination, PostCursorPagination
+from .serializers import CommentSerializer, PostSerializer
+from .tags import with_tags
+from .threads import build_tree, get_reply_depth, replies_queryset
+from .viewcounts import arecord_view
+
+
+class AsyncAPIView(View):
+    """
+    Base class for async, read-only endpoints served with the async ORM.
+
+    DRF views are sync-only, so these are plain Django async views that
+    reuse the DRF serializers, pagination and JWT authentication. Token
+    checks need no database queries (see AuthorJWTAuthentication), so
+    authenticating does not block the event loop.
+    """
+
+    http_method_names = ["get", "head", "options"]
+    authentication = AuthorJWTAuthentication()
+
+    def authenticate(self, request):
+        """
+        Authenticate the request. Returns an error response, or None on success.
+        """
+        try:
+            result = self.authentication.authenticate(request)
+        except APIException as exc:
+            return self.error_response(request, exc)
+        if result is None:
+            return self.error_response(request, NotAuthenticated())
+        request.user, request.auth = result
+        return None
+
+    def error_response(self, request, exc):
+        """
+        Render a DRF exception the way DRF's exception handler would.
+        """
+        detail = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+        response = JsonResponse(detail, status=exc.status_code)
+        if exc.status_code == 401:
+            response["WWW-Authenticate"] = self.authentication.authenticate_header(
+                request
+            )
+        return response
+
+    async def paginated(self, request, paginator, queryset, serializer_class):
+        """
+        Serialize a queryset, paginated if the client opted in.
+        """
+        page = await paginator.apaginate_queryset(queryset, Request(request))
+        context = {"request": request}
+        if page is None:
+            objects = [obj async for obj in queryset]
+            return serializer_class(objects, many=True, context=context).data
+        data = serializer_class(page, many=True, context=context).data
+        return {"next": paginator.get_next_link(), "results": data}
+
+
+class AsyncPostListView(AsyncAPIView):
+    """
+    GET /async/posts/
+
+    Async variant of GET /posts/ with the same keyset pagination and
+    conditional GET behaviour.
+    """
+
+    async def get(self, request):
+        error = self.authenticate(request)
+        if error is not None:
+            return error
+
+        aggregate = await Post.objects.published().aaggregate(
+            updated=Max("updated_at"),
+            commented=Max("last_comment_at"),
+            total=Count("id"),
+        )
+        last_modified = latest(aggregate["updated"], aggregate["commented"])
+        etag = make_etag(
+            "posts",
+            last_modified,
+            aggregate["total"],
+            post_cache.request_variant(request),
+        )
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        try:
+            data = await self.paginated(
+                request,
+                PostCursorPagination(),
+                PostSerializer.expand_queryset(
+                    with_tags(Post.objects.published()), request
+                ),
+                PostSerializer,
+            )
+        except APIException as exc:
+            return self.error_response(request, exc)
+        response = JsonResponse(data, safe=False)
+        return set_conditional_headers(response, etag, last_modified)
+
+
+class AsyncPostDetailView(AsyncAPIView):
+    """
+    GET /async/posts/<id>/
+
+    Async variant of GET /posts/<id>/, counting views the same way.
+    """
+
+    async def get(self, request, pk):
+        error = self.authenticate(request)
+        if error is not None:
+            return error
+
+        author_id = await aauthor_id_of(request.user)
+        try:
+            posts = PostSerializer.expand_queryset(
+                with_tags(Post.objects.visible_to(author_id).filter(pk=pk)), request
+            )
+        except APIException as exc:
+            return self.error_response(request, exc)
+        post = await posts.afirst()
+        if post is None:
+            return self.error_response(request, NotFound("Post not found."))
+        await arecord_view(post.pk)
+        last_modified = latest(post.updated_at, post.last_comment_at)
+        etag = make_etag(
+            "post",
+            pk,
+            last_modified,
+            post.comment_count,
+            post_cache.request_variant(request),
+        )
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        data = PostSerializer(post, context={"request": request}).data
+        return set_conditional_headers(JsonResponse(data), etag, last_modified)
+
+
+class AsyncCommentListView(AsyncAPIView):
+    """
+    GET /async/posts/<id>/comments/
+
+    Async variant of GET /posts/<id>/comments/, with the same threading.
+    """
+
+    async def comment_tree(self, request, post_id):
+        """
+        Return top-level comments, or one subtree, with nested replies.
+        """
+        depth = get_reply_depth(request)
+        comments = Comment.objects.filter(post_id=post_id)
+        parent_id = request.GET.get("parent")
+        if parent_id is not None:
+            root = None
+            if parent_id.isdigit():
+                root = await comments.filter(pk=parent_id).afirst()
+            if root is None:
+                raise NotFound("Comment not found.")
+            replies = [c async for c in replies_queryset([root], depth)]
+            data = CommentSerializer([root] + replies, many=True).data
+            return build_tree(data[:1], data[1:])[0]
+
+        roots = comments.filter(parent__isnull=True)
+        paginator = CommentCursorPagination()
+        page = await paginator.apaginate_queryset(roots, Request(request))
+        roots = page if page is not None else [c async for c in roots]
+        replies = [c async for c in replies_queryset(roots, depth)]
+        data = CommentSerializer(roots + replies, many=True).data
+        tree = build_tree(data[: len(roots)], data[len(roots) :])
+        if page is None:
+            return tree
+        return {"next": paginator.get_next_link(), "results": tree}
+
+    async def get(self, request, post_id):
+        error = self.authenticate(request)
+        if error is not None:
+            return error
+
+        author_id = await aauthor_id_of(request.user)
+        state = await (
+            Post.objects.visible_to(author_id)
+            .filter(pk=post_id)
+            .annotate(
+                last_modified=Max("comments__created_at"), total=Count("comments")
+            )
+            .values("last_modified", "total")
+            .afirst()
+        )
+        if state is None:
+            return self.error_response(request, NotFound("Post not found."))
+        etag = make_etag(
+            "comments",
+            post_id,
+            state["last_modified"],
+            state["total"],
+            post_cache.request_variant(request),
+        )
+        not_modified = not_modified_response(request, etag, state["last_modified"])
+        if not_modified is not None:
+            return not_modified
+
+        try:
+            data = await self.comment_tree(request, post_id)
+        except APIException as exc:
+            return self.error_response(request, exc)
+        response = JsonResponse(data, safe=False)
+        return set_conditional_headers(response, etag, state["last_modified"])
+
+
+class CommentStreamView(AsyncAPIView):
+    """
+    GET /posts/<id>/comments/stream/
+
+    Server-sent events stream of new comments on a post, so clients do not
+    have to poll the comment list. Each comment saved through
+    POST /posts/<id>/comments/ is sent as a "comment" event whose id is the
+    comment id and whose data is the CommentSerializer JSON.
+
+    Clients reconnecting with Last-Event-ID (EventSource sends it itself)
+    first receive the comments they missed, up to EVENTS_REPLAY_LIMIT. An
+    SSE comment is sent every EVENTS_HEARTBEAT_SECONDS so proxies keep idle
+    streams open. EventSource cannot set headers, so the access token may
+    also be passed as ?token=.
+
+    An open stream is a coroutine waiting on a queue (see blog.events), so
+    a worker holds thousands of them without a thread each. Requires the
+    ASGI server (GUNICORN_ASYNC=True).
+    """
+
+    def authenticate(self, request):
+        """
+        Authenticate with the Authorization header, or ?token= for EventSource.
+        """
+        token = request.GET.get("token")
+        if token and "HTTP_AUTHORIZATION" not in request.META:
+            request.META["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+        return super().authenticate(request)
+
+    async def get(self, request, post_id):
+        error = self.authenticate(request)
+        if error is not None:
+            return error
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(
+                {"detail": "Comment streams need the ASGI server."}, status=501
+            )
+        posts = Post.objects.visible_to(await aauthor_id_of(request.user))
+        if not await posts.filter(pk=post_id).aexists():
+            return self.error_response(request, NotFound("Post not found."))
+
+        last_event_id = request.headers.get("Last-Event-ID") or request.GET.get(
+            "last_event_id", ""
+        )
+        last_id = int(last_event_id) if last_event_id.isdigit() else None
+        response = StreamingHttpResponse(
+            self.events(post_id, last_id), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # Stop nginx (the ingress) from buffering the stream.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def events(self, post_id, last_id):
+        """
+        Yield SSE frames: missed comments first, then new ones as they are saved.
+        """
+        broker = get_broker()
+        # Subscribe before reading missed comments so none fall in between.
+        async with broker.subscribe(comment_channel(post_id)) as subscription:
+            replayed = set()
+            if last_id is not None:
+                missed = Comment.objects.filter(
+                    post_id=post_id, id__gt=last_id
+                ).order_by("id")[: settings.EVENTS_REPLAY_LIMIT]
+                async for comment in missed:
+                    replayed.add(comment.pk)
+                    data = json.dumps(CommentSerializer(comment).data)
+                    yield self.frame(comment.pk, data)
+            # An overflowed stream ends; the client reconnects and catches up.
+            while not subscription.overflowed:
+                message = await subscription.get(settings.EVENTS_HEARTBEAT_SECONDS)
+                if message is None:
+                    yield ": keepalive\n\n"
+                elif message["id"] not in replayed:
+                    yield self.frame(message["id"], message["data"])
+
+    @staticmethod
+    def frame(event_id, data):
+        return f"id: {event_id}\nevent: comment\ndata: {data}\n\n"
@@ -0,0 +1,92 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.utils.functional import SimpleLazyObject
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import Author
+
+AUTHOR_ID_CLAIM = "author_id"
+
+
+class LazyTokenUser(SimpleLazyObject):
+    """
+    A User proxy built from access token claims.
+
+    ``pk``, ``id``, ``is_authenticated`` and ``author`` are answered from the
+    token without touching the database. Any other attribute loads the real
+    User row on first access. ``author`` is an unsaved Author carrying only
+    its primary key, which is enough for foreign key assignment, filtering
+    and equality checks.
+    """
+
+    def __init__(self, user_id, author_id=None):
+        super().__init__(lambda: self._load_user(user_id))
+        # LazyObject proxies __setattr__ to the wrapped object, so claim-backed
+        # attributes are written straight into the proxy's own __dict__.
+        self.__dict__["pk"] = user_id
+        self.__dict__["id"] = user_id
+        self.__dict__["is_authenticated"] = True
+        self.__dict__["is_anonymous"] = False
+        if author_id is not None:
+            self.__dict__["author"] = Author(pk=author_id, user_id=user_id)
+
+    def __bool__(self):
+        return True
+
+    @staticmethod
+    def _load_user(user_id):
+        try:
+            user = User.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+        except User.DoesNotExist:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
+
+
+class AuthorJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that resolves the user and author from token claims.
+
+    Authenticated requests cost no user or author queries unless a view
+    needs a User field that is not carried in the token. Because the user
+    row is not re-read, deactivating a user takes effect when their access
+    token expires (ACCESS_TOKEN_LIFETIME).
+    """
+
+    def get_user(self, validated_token):
+        """
+        Return a lazy user backed by the validated token.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+        return LazyTokenUser(user_id, validated_token.get(AUTHOR_ID_CLAIM))
+
+
+def author_id_of(user):
+    """
+    Return the id of a user's author profile, or None if there is none.
+
+    Answered from the token claim for LazyTokenUser, without a query.
+    """
+    author = getattr(user, "author", None)
+    return author.pk if author is not None else None
+
+
+async def aauthor_id_of(user):
+    """
+    Async variant of author_id_of.
+
+    The token claim is answered in place. Without one (superusers, users
+    with no author profile, tokens issued before the claim) the user and
+    author are loaded in a thread, as the ORM cannot run on the event loop.
+    """
+    author = user.__dict__.get("author") if isinstance(user, LazyTokenUser) else None
+    if author is not None:
+        return author.pk
+    return await sync_to_async(author_id_of)(user)
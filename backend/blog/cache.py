@@ -0,0 +1,187 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from .routers import reads_from_replica
+
+
+class CacheStats:
+    """
+    Thread-safe hit/miss/eviction counters for the post cache.
+
+    Counters are per process; sum them across workers to size the cache.
+    """
+
+    fields = ("hits", "misses", "sets", "evictions", "invalidations")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self._counts[name] += amount
+
+    def snapshot(self):
+        with self._lock:
+            return {name: self._counts[name] for name in self.fields}
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+stats = CacheStats()
+
+
+class LRUCache(LocMemCache):
+    """
+    Local-memory LRU cache backend that records evictions in ``stats``.
+
+    Drop-in replacement for ``django.core.cache.backends.locmem.LocMemCache``.
+    """
+
+    def _cull(self):
+        before = len(self._cache)
+        super()._cull()
+        stats.incr("evictions", before - len(self._cache))
+
+
+def get_cache():
+    """
+    Return the Django cache used for post responses.
+    """
+    return caches[settings.BLOG_CACHE_ALIAS]
+
+
+def request_variant(request):
+    """
+    Hash the parts of a request that change the serialized output.
+
+    Image and pagination links are absolute, so the host is part of the key.
+    """
+    raw = f"{request.get_host()}?{request.META.get('QUERY_STRING', '')}"
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def _generation(cache, key):
+    """
+    Read a generation counter, seeding it if it is missing.
+
+    Counters are seeded from the clock so that an evicted counter never
+    comes back at a value that matches entries written before the eviction.
+    """
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def _bump(cache, key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+    stats.incr("invalidations")
+
+
+def _list_generation_key():
+    return "blog:posts:gen"
+
+
+def _post_generation_key(post_id):
+    return f"blog:post:{post_id}:gen"
+
+
+def _post_key(cache, post_id, variant):
+    generation = _generation(cache, _post_generation_key(post_id))
+    return f"blog:post:{post_id}:{generation}:{variant}"
+
+
+def _post_list_key(cache, variant):
+    generation = _generation(cache, _list_generation_key())
+    return f"blog:posts:{generation}:{variant}"
+
+
+def _get(cache, key):
+    data = cache.get(key)
+    stats.incr("misses" if data is None else "hits")
+    return data
+
+
+def _set(cache, key, data):
+    # Data read from a replica may predate the last invalidation by the
+    # replication lag, so it is only kept for the sticky window.
+    if reads_from_replica.get():
+        timeout = settings.REPLICA_STICKY_SECONDS
+    else:
+        timeout = settings.BLOG_CACHE_TIMEOUT
+    cache.set(key, data, timeout)
+    stats.incr("sets")
+
+
+def get_post(post_id, variant):
+    """
+    Return the cached (validator state, PostSerializer output) pair for a post, or None.
+    """
+    cache = get_cache()
+    return _get(cache, _post_key(cache, post_id, variant))
+
+
+def set_post(post_id, variant, data):
+    """
+    Store the (validator state, PostSerializer output) pair for a post.
+    """
+    cache = get_cache()
+    _set(cache, _post_key(cache, post_id, variant), data)
+
+
+def get_post_list(variant):
+    """
+    Return the cached (validator state, page data) pair for a list page, or None.
+    """
+    cache = get_cache()
+    return _get(cache, _post_list_key(cache, variant))
+
+
+def set_post_list(variant, data):
+    """
+    Store the (validator state, page data) pair for a list page.
+    """
+    cache = get_cache()
+    _set(cache, _post_list_key(cache, variant), data)
+
+
+def invalidate_post_list():
+    """
+    Drop every cached list page by bumping the global generation.
+    """
+    _bump(get_cache(), _list_generation_key())
+
+
+def invalidate_post(post_id):
+    """
+    Drop the cached detail of a post and every cached list page.
+    """
+    cache = get_cache()
+    _bump(cache, _post_generation_key(post_id))
+    _bump(cache, _list_generation_key())
+
+
+def invalidate_posts(post_ids):
+    """
+    Drop the cached details of many posts and every cached list page.
+
+    Deleting the generation counters costs one round trip for any number
+    of posts; they are re-seeded from the clock, past the old values.
+    """
+    cache = get_cache()
+    cache.delete_many([_post_generation_key(post_id) for post_id in post_ids])
+    stats.incr("invalidations", len(post_ids))
+    _bump(cache, _list_generation_key())
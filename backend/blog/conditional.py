@@ -0,0 +1,44 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    """
+    Build a strong ETag from the values that determine a representation.
+    """
+    raw = "|".join(str(part) for part in parts)
+    return quote_etag(hashlib.sha256(raw.encode("utf-8")).hexdigest())
+
+
+def latest(*timestamps):
+    """
+    Return the newest of the given timestamps, ignoring None.
+    """
+    present = [timestamp for timestamp in timestamps if timestamp is not None]
+    return max(present) if present else None
+
+
+def set_conditional_headers(response, etag, last_modified):
+    """
+    Attach ETag and Last-Modified headers to a response.
+    """
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified_response(request, etag, last_modified):
+    """
+    Evaluate If-None-Match / If-Modified-Since against the current state.
+
+    Returns a 304 (or 412) response when the client's copy is current,
+    otherwise None so the view can build the full response.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        set_conditional_headers(response, etag, last_modified)
+    return response
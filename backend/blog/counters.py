@@ -0,0 +1,79 @@
+from django.db.models import Count, F, IntegerField, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Comment, Post, PostStatus, PostTag
+
+
+def comment_added(comment):
+    """
+    Bump the denormalized counters of the comment's post in one UPDATE,
+    and the reply count of its parent for replies.
+
+    F() expressions keep concurrent comments from losing increments.
+    """
+    created_at = Value(comment.created_at)
+    Post.objects.filter(pk=comment.post_id).update(
+        comment_count=F("comment_count") + 1,
+        last_comment_at=Greatest(Coalesce("last_comment_at", created_at), created_at),
+    )
+    if comment.parent_id is not None:
+        Comment.objects.filter(pk=comment.parent_id).update(
+            reply_count=F("reply_count") + 1
+        )
+
+
+def recount_comments(posts):
+    """
+    Recompute comment_count and last_comment_at for a Post queryset.
+
+    Runs a single UPDATE with correlated subqueries; returns the row count.
+    """
+    comments = Comment.objects.filter(post=OuterRef("pk")).order_by().values("post")
+    return posts.update(
+        comment_count=Coalesce(
+            Subquery(comments.annotate(total=Count("id")).values("total")),
+            0,
+            output_field=IntegerField(),
+        ),
+        last_comment_at=Subquery(
+            comments.annotate(latest=Max("created_at")).values("latest")
+        ),
+    )
+
+
+def recount_replies(comments):
+    """
+    Recompute reply_count for a Comment queryset in a single UPDATE.
+    """
+    replies = Comment.objects.filter(parent=OuterRef("pk")).order_by().values("parent")
+    return comments.update(
+        reply_count=Coalesce(
+            Subquery(replies.annotate(total=Count("id")).values("total")),
+            0,
+            output_field=IntegerField(),
+        )
+    )
+
+
+def recount_tags(tags):
+    """
+    Recompute post_count for a Tag queryset in a single UPDATE.
+
+    Only live, published posts are counted, as the tag cloud is public.
+    """
+    links = (
+        PostTag.objects.filter(
+            tag=OuterRef("pk"),
+            post__deleted_at__isnull=True,
+            post__status=PostStatus.PUBLISHED,
+        )
+        .order_by()
+        .values("tag")
+    )
+    return tags.update(
+        post_count=Coalesce(
+            Subquery(links.annotate(total=Count("id")).values("total")),
+            0,
+            output_field=IntegerField(),
+        )
+    )
@@ -0,0 +1,242 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Each worker process has one Broker. Streams subscribe to a channel with
+# an asyncio queue on their event loop, so an idle stream holds no thread.
+# Publishers (sync views) hand messages to the backend, which delivers them
+# to the broker of every process that should see them: only this one for
+# LocalBackend, every process subscribed to Redis for RedisBackend.
+
+
+class LocalBackend:
+    """
+    Delivers messages to streams in this process only.
+
+    Fine for a single worker; with several workers or pods, a comment
+    reaches only the streams served by the process that saved it.
+    """
+
+    def __init__(self, deliver):
+        self.deliver = deliver
+
+    def publish(self, channel, message):
+        self.deliver(channel, message)
+
+    def listen(self):
+        """
+        Start receiving messages; called when the first stream subscribes.
+        """
+
+
+class RecordingBackend(LocalBackend):
+    """
+    Test stand-in: delivers locally and keeps every published message.
+    """
+
+    def __init__(self, deliver):
+        super().__init__(deliver)
+        self.published = []
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+        super().publish(channel, message)
+
+
+class RedisBackend:
+    """
+    Delivers messages to streams in every process through Redis pub/sub.
+
+    Publishing is one PUBLISH. Each process runs a single listener thread,
+    started with its first stream, that pattern-subscribes to all channels
+    and hands messages to the local broker. Requires the redis package and
+    EVENTS_REDIS_URL.
+    """
+
+    prefix = "blog:events:"
+
+    def __init__(self, deliver):
+        try:
+            import redis
+        except ImportError:
+            raise ImproperlyConfigured("RedisBackend requires the redis package.")
+        if not settings.EVENTS_REDIS_URL:
+            raise ImproperlyConfigured("RedisBackend requires EVENTS_REDIS_URL.")
+        self.deliver = deliver
+        self.client = redis.Redis.from_url(settings.EVENTS_REDIS_URL)
+        self._lock = threading.Lock()
+        self._listener = None
+
+    def publish(self, channel, message):
+        self.client.publish(self.prefix + channel, json.dumps(message))
+
+    def listen(self):
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._run, name="event-listener", daemon=True
+                )
+                self._listener.start()
+
+    def _run(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(self.prefix + "*")
+                for item in pubsub.listen():
+                    channel = item["channel"].decode()[len(self.prefix) :]
+                    self.deliver(channel, json.loads(item["data"]))
+            except Exception:
+                logger.exception("Event listener lost its Redis connection")
+                time.sleep(1)
+
+
+class Subscription:
+    """
+    A stream's view of one channel: a bounded queue on the stream's event loop.
+
+    A stream that falls EVENTS_QUEUE_SIZE messages behind is marked
+    overflowed; it should close so the client reconnects and catches up
+    with Last-Event-ID.
+    """
+
+    def __init__(self, broker, channel):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(settings.EVENTS_QUEUE_SIZE)
+        self.overflowed = False
+
+    def put(self, message):
+        """
+        Queue a message; safe to call from any thread.
+        """
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # The stream's event loop has already closed.
+            pass
+
+    def _put(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        """
+        Return the next message, or None if none arrives within `timeout` seconds.
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    """
+    Per-process pub/sub hub between publishing views and open streams.
+    """
+
+    def __init__(self, backend_class):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+        self.backend = backend_class(self.deliver)
+
+    def publish(self, channel, message):
+        """
+        Publish a JSON-serializable message to every stream on `channel`.
+        """
+        self.backend.publish(channel, message)
+
+    def deliver(self, channel, message):
+        """
+        Hand a message to this process's streams on `channel`.
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(message)
+
+    def subscribe(self, channel):
+        """
+        Subscribe the running event loop to `channel`.
+
+        Use as `async with broker.subscribe(channel) as subscription:`.
+        """
+        self.backend.listen()
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+    def subscriber_count(self, channel=None):
+        """
+        Return the number of open subscriptions, on `channel` or in total.
+        """
+        with self._lock:
+            if channel is not None:
+                return len(self._subscriptions.get(channel, ()))
+            return sum(len(subs) for subs in self._subscriptions.values())
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """
+    Return this process's broker, built from EVENTS_BACKEND on first use.
+    """
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = Broker(import_string(settings.EVENTS_BACKEND))
+        return _broker
+
+
+def reset_broker():
+    """
+    Drop the broker so the next get_broker() reads EVENTS_BACKEND again.
+    """
+    global _broker
+    with _broker_lock:
+        _broker = None
+
+
+def comment_channel(post_id):
+    return f"comments:{post_id}"
+
+
+def publish_comment(comment_id, post_id, data):
+    """
+    Publish a saved comment's serialized data to its post's streams.
+
+    The data is encoded to JSON once here rather than once per stream.
+    """
+    message = {"id": comment_id, "data": json.dumps(data, cls=DjangoJSONEncoder)}
+    get_broker().publish(comment_channel(post_id), message)
@@ -0,0 +1,192 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, When
+
+from .models import Author, FeedEntry, Follow, Post
+
+# Timelines are precomputed: a new post is written into each follower's
+# FeedEntry rows (fan-out on write), so reading a page is one range scan on
+# the (owner, created_at, post) index. Authors with more followers than
+# FEED_FANOUT_MAX_FOLLOWERS are not fanned out; their recent posts are read
+# at request time and merged in (the pull path). Timelines are trimmed to
+# FEED_MAX_LENGTH entries by `manage.py trim_feeds`.
+
+
+def _pulled_key(author_id):
+    return f"feed:pulled:{author_id}"
+
+
+def pulled_followees(author_id):
+    """
+    Return the ids of followed authors whose posts are pulled, not pushed.
+
+    Cached for FEED_PULL_CACHE_SECONDS; follow and unfollow clear it.
+    """
+    cache = caches[settings.BLOG_CACHE_ALIAS]
+    ids = cache.get(_pulled_key(author_id))
+    if ids is None:
+        ids = list(
+            Follow.objects.filter(
+                follower_id=author_id, followee__pulled_into_feeds=True
+            ).values_list("followee_id", flat=True)
+        )
+        cache.set(_pulled_key(author_id), ids, settings.FEED_PULL_CACHE_SECONDS)
+    return ids
+
+
+def fan_out(post):
+    """
+    Write a new post into its author's followers' timelines.
+
+    Returns the number of timelines written. Authors with more than
+    FEED_FANOUT_MAX_FOLLOWERS followers are pulled instead (they were
+    flagged when they crossed it), so nothing is written for them.
+    """
+    limit = settings.FEED_FANOUT_MAX_FOLLOWERS
+    followers = list(
+        Follow.objects.filter(followee_id=post.author_id).values_list(
+            "follower_id", flat=True
+        )[: limit + 1]
+    )
+    if len(followers) > limit:
+        return 0
+    FeedEntry.objects.bulk_create(
+        [
+            FeedEntry(owner_id=follower_id, post_id=post.pk, created_at=post.created_at)
+            for follower_id in followers
+        ],
+        batch_size=settings.FEED_FANOUT_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    return len(followers)
+
+
+def follow(follower_id, followee_id):
+    """
+    Make one author follow another; returns False if they already did.
+
+    Bumps the followee's follower_count (flagging them as pulled once it
+    passes FEED_FANOUT_MAX_FOLLOWERS) and copies their latest
+    FEED_BACKFILL_SIZE posts into the follower's timeline.
+    """
+    with transaction.atomic():
+        _, created = Follow.objects.get_or_create(
+            follower_id=follower_id, followee_id=followee_id
+        )
+        if not created:
+            return False
+        # Both sides of the comparison read the pre-update count.
+        Author.objects.filter(pk=followee_id).update(
+            follower_count=F("follower_count") + 1,
+            pulled_into_feeds=Case(
+                When(
+                    follower_count__gte=settings.FEED_FANOUT_MAX_FOLLOWERS,
+                    then=True,
+                ),
+                default=F("pulled_into_feeds"),
+            ),
+        )
+        recent = (
+            Post.objects.published()
+            .filter(author_id=followee_id)
+            .order_by("-created_at", "-id")[: settings.FEED_BACKFILL_SIZE]
+        )
+        FeedEntry.objects.bulk_create(
+            [
+                FeedEntry(owner_id=follower_id, post_id=pk, created_at=created_at)
+                for pk, created_at in recent.values_list("id", "created_at")
+            ],
+            ignore_conflicts=True,
+        )
+    caches[settings.BLOG_CACHE_ALIAS].delete(_pulled_key(follower_id))
+    return True
+
+
+def unfollow(follower_id, followee_id):
+    """
+    Stop following an author and drop their posts from the follower's timeline.
+
+    Returns False if the follower did not follow them.
+    """
+    with transaction.atomic():
+        deleted, _ = Follow.objects.filter(
+            follower_id=follower_id, followee_id=followee_id
+        ).delete()
+        if not deleted:
+            return False
+        Author.objects.filter(pk=followee_id).update(
+            follower_count=F("follower_count") - 1
+        )
+        FeedEntry.objects.filter(
+            owner_id=follower_id, post__author_id=followee_id
+        ).delete()
+    caches[settings.BLOG_CACHE_ALIAS].delete(_pulled_key(follower_id))
+    return True
+
+
+def _before(queryset, position, pk_field):
+    """
+    Restrict a queryset to rows sorting after `position` in newest-first order.
+    """
+    if position is None:
+        return queryset
+    created_at, pk = position
+    return queryset.filter(created_at__lte=created_at).filter(
+        Q(created_at__lt=created_at) | Q(**{f"{pk_field}__lt": pk})
+    )
+
+
+def timeline(author_id, position, limit):
+    """
+    Return up to `limit` (created_at, post id) keys of an author's timeline,
+    newest first, starting after `position` (a key, or None for the top).
+
+    Reads at most `limit` rows from the precomputed timeline and `limit`
+    posts by pulled authors, whatever the timeline length.
+    """
+    entries = FeedEntry.objects.filter(owner_id=author_id).values_list(
+        "created_at", "post_id"
+    )
+    keys = list(
+        _before(entries, position, "post_id").order_by("-created_at", "-post_id")[
+            :limit
+        ]
+    )
+    pulled = pulled_followees(author_id)
+    if pulled:
+        posts = (
+            Post.objects.published()
+            .filter(author_id__in=pulled)
+            .values_list("created_at", "id")
+        )
+        keys += _before(posts, position, "id").order_by("-created_at", "-id")[:limit]
+        # Posts written before an author was pulled are in both sources.
+        keys = sorted(set(keys), reverse=True)[:limit]
+    return keys
+
+
+def trim_feeds(max_length):
+    """
+    Delete all but the newest `max_length` entries of every timeline.
+
+    Returns the number of entries deleted.
+    """
+    owners = (
+        FeedEntry.objects.values("owner_id")
+        .annotate(total=Count("id"))
+        .filter(total__gt=max_length)
+        .values_list("owner_id", flat=True)
+    )
+    deleted = 0
+    for owner_id in list(owners):
+        entries = FeedEntry.objects.filter(owner_id=owner_id)
+        oldest_kept = entries.order_by("-created_at", "-post_id").values_list(
+            "created_at", "post_id"
+        )[max_length - 1 : max_length]
+        for created_at, post_id in oldest_kept:
+            deleted += entries.filter(
+                Q(created_at__lt=created_at)
+                | Q(created_at=created_at, post_id__lt=post_id)
+            ).delete()[0]
+    return deleted
@@ -0,0 +1,144 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from . import cache as post_cache
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "jpeg": {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+}
+
+_executor = None
+
+
+def get_executor():
+    """
+    Return the shared worker pool, creating it on first use.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_RENDITION_WORKERS,
+            thread_name_prefix="image-renditions",
+        )
+    return _executor
+
+
+def schedule_renditions(instance, field_name):
+    """
+    Queue rendition generation for an uploaded image once the upload commits.
+
+    The request thread only stores the original upload; decoding and
+    encoding happen on the worker pool.
+    """
+    if not getattr(instance, field_name):
+        return
+    args = (instance._meta.label, instance.pk, field_name)
+    if settings.IMAGE_RENDITION_EAGER:
+        transaction.on_commit(lambda: generate_renditions(*args))
+    else:
+        transaction.on_commit(lambda: get_executor().submit(_run_in_worker, *args))
+
+
+def _run_in_worker(*args):
+    try:
+        generate_renditions(*args)
+    except Exception:
+        logger.exception("Rendition generation failed for %s %s", args[0], args[1])
+    finally:
+        # Worker threads get their own DB connections; don't leak them.
+        connections.close_all()
+
+
+def render(image, width, fmt):
+    """
+    Resize an image to ``width`` and encode it as ``fmt`` without metadata.
+
+    Returns (bytes, width, height).
+    """
+    height = max(1, round(image.height * width / image.width))
+    resized = image.resize((width, height), Image.Resampling.LANCZOS)
+    if fmt == "jpeg" or "A" not in resized.getbands():
+        resized = resized.convert("RGB")
+    else:
+        resized = resized.convert("RGBA")
+    buffer = BytesIO()
+    # Only the options listed here are written, so EXIF/ICC/XMP are dropped.
+    resized.save(buffer, **FORMATS[fmt])
+    return buffer.getvalue(), width, height
+
+
+def generate_renditions(model_label, pk, field_name):
+    """
+    Build resized WebP/JPEG renditions of an image field and record them.
+
+    Renditions are stored next to the original under ``renditions/`` and
+    saved to ``<field_name>_renditions`` as a list of
+    {"name", "format", "width", "height"} entries.
+    """
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).first()
+    field_file = getattr(instance, field_name, None) if instance else None
+    if not field_file:
+        return
+
+    try:
+        with field_file.storage.open(field_file.name, "rb") as source:
+            image = Image.open(source)
+            image = ImageOps.exif_transpose(image)
+            image.load()
+    except (OSError, ValueError):
+        logger.exception("Could not read %s %s for renditions", model_label, pk)
+        return
+
+    directory, filename = os.path.split(field_file.name)
+    stem = os.path.splitext(filename)[0]
+    widths = [w for w in settings.IMAGE_RENDITION_WIDTHS if w < image.width]
+    widths = widths or [image.width]
+
+    renditions = []
+    for fmt in settings.IMAGE_RENDITION_FORMATS:
+        for width in widths:
+            data, width, height = render(image, width, fmt)
+            name = field_file.storage.save(
+                os.path.join(directory, "renditions", f"{stem}-{width}w.{fmt}"),
+                ContentFile(data),
+            )
+            renditions.append(
+                {"name": name, "format": fmt, "width": width, "height": height}
+            )
+
+    updates = {f"{field_name}_renditions": renditions}
+    if any(field.name == "updated_at" for field in model._meta.fields):
+        updates["updated_at"] = timezone.now()
+    # Only record renditions if the image was not replaced in the meantime.
+    model.objects.filter(pk=pk, **{field_name: field_file.name}).update(**updates)
+    if model_label == "blog.Post":
+        post_cache.invalidate_post(pk)
+
+
+def srcset(renditions, request=None):
+    """
+    Build {"<format>": "<url> <width>w, ..."} from a renditions list.
+    """
+    result = {}
+    for rendition in sorted(renditions or [], key=lambda r: r["width"]):
+        url = default_storage.url(rendition["name"])
+        if request is not None:
+            url = request.build_absolute_uri(url)
+        entry = f"{url} {rendition['width']}w"
+        fmt = rendition["format"]
+        result[fmt] = f"{result[fmt]}, {entry}" if fmt in result else entry
+    return result
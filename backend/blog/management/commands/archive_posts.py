@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from blog.models import ArchivedComment, ArchivedPost, Comment, FeedEntry, Post
+
+
+class Command(BaseCommand):
+    """
+    Move posts soft-deleted more than --older-than days ago, with their
+    comments, out of the live tables into ArchivedPost and ArchivedComment.
+
+    Every step copies and deletes at most --batch-size rows in its own short
+    transaction, so a post with a huge thread never holds locks for long:
+    comments go first (replies before their parents, so no delete cascades
+    into unarchived rows), then feed entries, then the posts. Copies skip
+    rows already archived, so an interrupted run can simply be repeated.
+
+    Usage:
+        python manage.py archive_posts --older-than 30
+    """
+
+    help = "Archive posts soft-deleted more than N days ago, with their comments."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            required=True,
+            metavar="DAYS",
+            help="Archive posts deleted at least this many days ago.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows moved per transaction (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        days = options["older_than"]
+        batch_size = options["batch_size"]
+        if days < 0:
+            raise CommandError("--older-than must not be negative.")
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be positive.")
+
+        cutoff = timezone.now() - timedelta(days=days)
+        due = Post.all_objects.filter(deleted_at__lt=cutoff).order_by(
+            "deleted_at", "id"
+        )
+        posts = comments = 0
+        while True:
+            post_ids = list(due.values_list("id", flat=True)[:batch_size])
+            if not post_ids:
+                break
+            comments += self.archive_comments(post_ids, batch_size)
+            self.delete_feed_entries(post_ids, batch_size)
+            posts += self.archive_posts(post_ids)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Archived {posts} posts and {comments} comments.")
+        )
+
+    def archive_comments(self, post_ids, batch_size):
+        """
+        Move the comments of `post_ids` to ArchivedComment, batch by batch.
+
+        Comments are taken in descending (post, path) order, read backwards
+        from the (post, path) index: a reply's path extends its parent's,
+        so every reply is moved before the comment it answers.
+        """
+        comments = Comment.objects.filter(post_id__in=post_ids).order_by(
+            "-post_id", "-path"
+        )
+        moved = 0
+        while True:
+            rows = list(
+                comments.values(
+                    "id", "post_id", "author_id", "parent_id", "content", "created_at"
+                )[:batch_size]
+            )
+            if not rows:
+                return moved
+            with transaction.atomic():
+                ArchivedComment.objects.bulk_create(
+                    [ArchivedComment(**row) for row in rows], ignore_conflicts=True
+                )
+                Comment.objects.filter(pk__in=[row["id"] for row in rows]).delete()
+            moved += len(rows)
+
+    def delete_feed_entries(self, post_ids, batch_size):
+        """
+        Remove the posts from follower timelines, batch by batch.
+        """
+        entries = FeedEntry.objects.filter(post_id__in=post_ids)
+        while True:
+            entry_ids = list(entries.values_list("id", flat=True)[:batch_size])
+            if not entry_ids:
+                return
+            FeedEntry.objects.filter(pk__in=entry_ids).delete()
+
+    def archive_posts(self, post_ids):
+        """
+        Move the posts themselves; their tag links and slug history go too.
+        """
+        posts = Post.all_objects.filter(pk__in=post_ids)
+        rows = posts.values(
+            "id",
+            "author_id",
+            "title",
+            "slug",
+            "content",
+            "created_at",
+            "updated_at",
+            "deleted_at",
+        )
+        with transaction.atomic():
+            ArchivedPost.objects.bulk_create(
+                [ArchivedPost(**row) for row in rows], ignore_conflicts=True
+            )
+            posts.delete()
+        return len(post_ids)
@@ -0,0 +1,113 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Prefetch
+
+from blog.models import Comment, Post
+from blog.tags import with_tags
+
+
+class Command(BaseCommand):
+    """
+    Export posts and their comments as NDJSON, one post per line.
+
+    Rows are streamed with iterator(chunk_size=...) and comments and tags
+    are prefetched per chunk, so memory stays constant for any table size.
+    Replies are nested under their parent comment's "replies" key. The
+    output can be fed back to import_posts.
+
+    Usage:
+        python manage.py export_posts posts.ndjson --chunk-size 2000
+        python manage.py export_posts - > posts.ndjson
+    """
+
+    help = "Export posts and comments to an NDJSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON file to write, or - for stdout.")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Rows fetched from the database per round trip (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size <= 0:
+            raise CommandError("--chunk-size must be positive.")
+
+        to_stdout = options["path"] == "-"
+        if to_stdout:
+            stream = sys.stdout
+        else:
+            try:
+                stream = open(options["path"], "w", encoding="utf-8")
+            except OSError as exc:
+                raise CommandError(str(exc))
+
+        posts = (
+            with_tags(Post.objects.select_related("author__user", "category"))
+            .prefetch_related(
+                Prefetch(
+                    "comments",
+                    queryset=Comment.objects.select_related("author__user").order_by(
+                        "path"
+                    ),
+                )
+            )
+            .order_by("id")
+        )
+
+        started = time.monotonic()
+        count = 0
+        try:
+            for post in posts.iterator(chunk_size=chunk_size):
+                stream.write(json.dumps(self.to_row(post)))
+                stream.write("\n")
+                count += 1
+        finally:
+            if not to_stdout:
+                stream.close()
+
+        elapsed = time.monotonic() - started
+        rate = count / elapsed if elapsed > 0 else 0.0
+        # Keep stdout clean for the NDJSON stream when exporting to it.
+        report = self.stderr if to_stdout else self.stdout
+        report.write(
+            self.style.SUCCESS(
+                f"Exported {count} posts in {elapsed:.2f}s ({rate:.0f} rows/sec)."
+            )
+        )
+
+    @staticmethod
+    def to_row(post):
+        # Comments arrive in path order, so parents precede their replies.
+        comments = {}
+        top_level = []
+        for comment in post.comments.all():
+            row = {
+                "author": comment.author.user.username,
+                "content": comment.content,
+                "created_at": comment.created_at.isoformat(),
+            }
+            comments[comment.pk] = row
+            if comment.parent_id is None:
+                top_level.append(row)
+            else:
+                comments[comment.parent_id].setdefault("replies", []).append(row)
+        return {
+            "author": post.author.user.username,
+            "title": post.title,
+            "content": post.content,
+            # isoformat() keeps microseconds, which DjangoJSONEncoder drops.
+            "created_at": post.created_at.isoformat(),
+            "updated_at": post.updated_at.isoformat(),
+            "status": post.status,
+            "publish_at": post.publish_at.isoformat() if post.publish_at else None,
+            "tags": [tag.name for tag in post.tags.all()],
+            "category": post.category.name if post.category_id else None,
+            "comments": top_level,
+        }
@@ -0,0 +1,290 @@
+import json
+import sys
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from blog import cache as post_cache
+from blog.counters import recount_comments, recount_tags
+from blog.models import Author, Comment, Post, PostStatus, PostTag, Tag
+from blog.rendering import rendered_fields
+from blog.serializers import PostImportSerializer
+from blog.slugs import assign_slugs
+from blog.tags import upsert_categories, upsert_tags
+from blog.threads import assign_paths
+
+
+class Command(BaseCommand):
+    """
+    Import posts and their comments from NDJSON.
+
+    Each line is one post:
+        {"author": "<username>", "title": "...", "content": "...",
+         "created_at": "...", "status": "published", "publish_at": "...",
+         "tags": ["..."], "category": "...",
+         "comments": [{"author": "<username>", "content": "...",
+                       "replies": [...]}]}
+
+    The file is read in batches, so memory stays constant regardless of its
+    size. Each batch is validated, resolves its authors with a single query
+    and is written with bulk_create inside one transaction. Tags and
+    categories are upserted by name once per batch, and the batch's tag
+    counts are recounted. Invalid rows are reported and skipped.
+
+    Usage:
+        python manage.py import_posts posts.ndjson --batch-size 1000
+        cat posts.ndjson | python manage.py import_posts -
+    """
+
+    help = "Import posts and comments from an NDJSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON file to read, or - for stdin.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows validated and written per transaction (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be positive.")
+
+        if options["path"] == "-":
+            stream = sys.stdin
+        else:
+            try:
+                stream = open(options["path"], encoding="utf-8")
+            except OSError as exc:
+                raise CommandError(str(exc))
+
+        started = time.monotonic()
+        totals = {"posts": 0, "comments": 0, "skipped": 0}
+        try:
+            lines = enumerate(stream, start=1)
+            while True:
+                batch = list(islice(lines, batch_size))
+                if not batch:
+                    break
+                posts, comments, skipped = self.import_batch(batch)
+                totals["posts"] += posts
+                totals["comments"] += comments
+                totals["skipped"] += skipped
+                if options["verbosity"] >= 2:
+                    self.stdout.write(
+                        f"Imported {totals['posts']} posts so far "
+                        f"({self.rate(totals['posts'], started):.0f} rows/sec)"
+                    )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        if totals["posts"]:
+            post_cache.invalidate_post_list()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {totals['posts']} posts and {totals['comments']} comments, "
+                f"skipped {totals['skipped']} rows in "
+                f"{time.monotonic() - started:.2f}s "
+                f"({self.rate(totals['posts'] + totals['comments'], started):.0f} rows/sec)."
+            )
+        )
+
+    @staticmethod
+    def rate(rows, started):
+        elapsed = time.monotonic() - started
+        return rows / elapsed if elapsed > 0 else 0.0
+
+    def skip(self, line_number, message):
+        self.stderr.write(f"Line {line_number}: {message}")
+
+    def parse_batch(self, batch):
+        """
+        Decode and validate a batch of lines. Returns (line_number, data) pairs.
+        """
+        rows = []
+        for line_number, line in batch:
+            if not line.strip():
+                continue
+            try:
+                payload = json.loads(line)
+            except ValueError as exc:
+                self.skip(line_number, f"invalid JSON ({exc})")
+                continue
+            serializer = PostImportSerializer(data=payload)
+            if not serializer.is_valid():
+                self.skip(line_number, json.dumps(serializer.errors))
+                continue
+            rows.append((line_number, serializer.validated_data))
+        return rows
+
+    @staticmethod
+    def row_authors(data):
+        """
+        Return the usernames of a post and of its comments at every depth.
+        """
+        usernames = {data["author"]}
+        pending = list(data.get("comments", []))
+        while pending:
+            comment = pending.pop()
+            usernames.add(comment["author"])
+            pending.extend(comment.get("replies", []))
+        return usernames
+
+    def import_batch(self, batch):
+        """
+        Validate and write one batch. Returns (posts, comments, skipped) counts.
+        """
+        rows = self.parse_batch(batch)
+        skipped = sum(1 for _, line in batch if line.strip()) - len(rows)
+
+        usernames = set()
+        for _, data in rows:
+            usernames.update(self.row_authors(data))
+        authors = {
+            author.user.username: author
+            for author in Author.objects.select_related("user").filter(
+                user__username__in=usernames
+            )
+        }
+        taken = set(
+            Post.objects.filter(
+                title__in=[data["title"] for _, data in rows]
+            ).values_list("title", flat=True)
+        )
+
+        accepted = []
+        for line_number, data in rows:
+            missing = self.row_authors(data) - authors.keys()
+            if missing:
+                self.skip(line_number, f"unknown authors {sorted(missing)}")
+            elif data["title"] in taken:
+                self.skip(line_number, f"title {data['title']!r} already exists")
+            else:
+                taken.add(data["title"])
+                accepted.append(data)
+                continue
+            skipped += 1
+
+        with transaction.atomic():
+            categories = {
+                category.name: category.pk
+                for category in upsert_categories(
+                    {data["category"] for data in accepted if data.get("category")}
+                )
+            }
+            posts = [
+                Post(
+                    author=authors[data["author"]],
+                    title=data["title"],
+                    content=data["content"],
+                    status=data["status"],
+                    publish_at=data.get("publish_at"),
+                    category_id=categories.get(data.get("category")),
+                    **rendered_fields(data["content"]),
+                )
+                for data in accepted
+            ]
+            assign_slugs(posts)
+            posts = Post.objects.bulk_create(posts)
+            comments = self.create_comments(posts, accepted, authors)
+            self.restore_timestamps(posts, accepted, comments)
+            self.create_tags(posts, accepted)
+            if comments:
+                recount_comments(Post.objects.filter(pk__in=[p.pk for p in posts]))
+
+        return len(posts), len(comments), skipped
+
+    def create_tags(self, posts, accepted):
+        """
+        Upsert the batch's tags with one query, link them to their posts and
+        recount the affected tags.
+        """
+        names = {name for data in accepted for name in data.get("tags", [])}
+        if not names:
+            return
+        tag_ids = {tag.name: tag.pk for tag in upsert_tags(names)}
+        PostTag.objects.bulk_create(
+            [
+                PostTag(post=post, tag_id=tag_ids[name])
+                for post, data in zip(posts, accepted)
+                for name in data.get("tags", [])
+            ]
+        )
+        recount_tags(Tag.objects.filter(pk__in=tag_ids.values()))
+
+    def create_comments(self, posts, accepted, authors):
+        """
+        Bulk-create comments one reply level at a time.
+
+        Each level needs its parents' ids and paths, so a thread of depth n
+        costs n INSERT + UPDATE rounds per batch rather than one per comment.
+        Returns (comment, created_at) pairs.
+        """
+        created = []
+        level = [
+            (post, None, data)
+            for post, row in zip(posts, accepted)
+            for data in row.get("comments", [])
+        ]
+        while level:
+            comments = Comment.objects.bulk_create(
+                [
+                    Comment(
+                        post=post,
+                        parent=parent,
+                        depth=parent.depth + 1 if parent else 0,
+                        reply_count=len(data.get("replies", [])),
+                        author=authors[data["author"]],
+                        content=data["content"],
+                    )
+                    for post, parent, data in level
+                ]
+            )
+            assign_paths(comments)
+            created.extend(
+                (comment, data.get("created_at"))
+                for comment, (_, _, data) in zip(comments, level)
+            )
+            level = [
+                (post, comment, reply)
+                for comment, (post, _, data) in zip(comments, level)
+                for reply in data.get("replies", [])
+            ]
+        return created
+
+    def restore_timestamps(self, posts, accepted, comments):
+        """
+        Keep imported timestamps, which auto_now(_add) overrides on insert.
+        Published posts without a publish_at were published when created.
+
+        bulk_update skips pre_save, so the given values are written as-is.
+        """
+        dated_posts = []
+        for post, data in zip(posts, accepted):
+            dated = "created_at" in data or "updated_at" in data
+            if dated:
+                post.created_at = data.get("created_at", post.created_at)
+                post.updated_at = data.get("updated_at", post.created_at)
+            if post.status == PostStatus.PUBLISHED and post.publish_at is None:
+                post.publish_at = post.created_at
+                dated = True
+            if dated:
+                dated_posts.append(post)
+        if dated_posts:
+            Post.objects.bulk_update(
+                dated_posts, ["created_at", "updated_at", "publish_at"]
+            )
+
+        dated_comments = []
+        for comment, created_at in comments:
+            if created_at is not None:
+                comment.created_at = created_at
+                dated_comments.append(comment)
+        if dated_comments:
+            Comment.objects.bulk_update(dated_comments, ["created_at"])
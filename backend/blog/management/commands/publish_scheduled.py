@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from blog.publishing import publish_due
+
+
+class Command(BaseCommand):
+    """
+    Publish scheduled posts whose publish_at has passed.
+
+    Runs once (e.g. every minute from cron), or with --interval keeps
+    running and checks every that many seconds. Any number of copies can
+    run at once, one per replica: due posts are claimed with SELECT ... FOR
+    UPDATE SKIP LOCKED, so each is published exactly once.
+
+    Usage:
+        python manage.py publish_scheduled --interval 30
+    """
+
+    help = "Publish scheduled posts that are due."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Posts published per transaction (default: 500).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Keep running, checking every this many seconds (default: run once).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        interval = options["interval"]
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be positive.")
+        if interval < 0:
+            raise CommandError("--interval must not be negative.")
+
+        while True:
+            published = publish_due(batch_size)
+            if published or not interval:
+                self.stdout.write(
+                    self.style.SUCCESS(f"Published {published} scheduled posts.")
+                )
+            if not interval:
+                return
+            # Drop connections the database may have closed while idle.
+            close_old_connections()
+            time.sleep(interval)
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+
+from blog import cache as post_cache
+from blog.counters import recount_comments
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    """
+    Recompute Post.comment_count and Post.last_comment_at from Comment rows.
+
+    Repairs drift in the denormalized counters (e.g. after comments were
+    deleted by cascade). Posts are processed in id ranges, one UPDATE per
+    range, so no single statement locks the whole table.
+
+    Usage:
+        python manage.py recount_comments --batch-size 5000
+    """
+
+    help = "Recompute denormalized comment counters on posts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Posts updated per statement (default: 5000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be positive.")
+
+        bounds = Post.objects.aggregate(low=Min("id"), high=Max("id"))
+        updated = 0
+        if bounds["low"] is not None:
+            for start in range(bounds["low"], bounds["high"] + 1, batch_size):
+                updated += recount_comments(
+                    Post.objects.filter(id__gte=start, id__lt=start + batch_size)
+                )
+            post_cache.invalidate_post_list()
+
+        self.stdout.write(self.style.SUCCESS(f"Recounted comments on {updated} posts."))
@@ -0,0 +1,123 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from blog import cache as post_cache
+from blog.models import Post
+from blog.rendering import RENDER_VERSION, rendered_fields
+
+RENDERED_FIELDS = ["content_html", "excerpt", "render_version", "updated_at"]
+
+
+def init_worker():
+    """
+    Prepare a worker process; a no-op for forked workers.
+    """
+    django.setup()
+
+
+def render_range(start, stop, stale, batch_size):
+    """
+    Render the posts with start <= id < stop and return how many were written.
+
+    Runs in worker processes, each with its own database connection.
+    updated_at moves so conditional GETs see the new rendering, and the
+    posts' cached details are dropped.
+    """
+    posts = Post.objects.filter(id__gte=start, id__lt=stop).only("id", "content")
+    if stale:
+        posts = posts.filter(render_version__lt=RENDER_VERSION)
+    now = timezone.now()
+    rendered = []
+    for post in posts.iterator(chunk_size=batch_size):
+        for name, value in rendered_fields(post.content).items():
+            setattr(post, name, value)
+        post.updated_at = now
+        rendered.append(post)
+    Post.objects.bulk_update(rendered, RENDERED_FIELDS, batch_size=batch_size)
+    if rendered:
+        post_cache.invalidate_posts([post.pk for post in rendered])
+    return len(rendered)
+
+
+class Command(BaseCommand):
+    """
+    Re-render Post.content_html and Post.excerpt from Post.content.
+
+    Rendering is CPU-bound, so id ranges of --batch-size posts are spread
+    over --workers processes, each rendering its range and writing it back
+    with one bulk UPDATE. Use --stale after changing blog.rendering (and
+    bumping RENDER_VERSION) to skip posts that are already current.
+
+    Re-rendered posts get a new updated_at, so ETags and Last-Modified
+    change, and their cached details and the cached list pages are dropped.
+
+    Usage:
+        python manage.py rerender_posts --workers 8 --batch-size 500
+        python manage.py rerender_posts --stale
+    """
+
+    help = "Re-render stored HTML and excerpts for posts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Worker processes (default: CPU count); 1 renders in-process.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Posts per id range and UPDATE (default: 500).",
+        )
+        parser.add_argument(
+            "--stale",
+            action="store_true",
+            help="Only posts rendered by an older RENDER_VERSION.",
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        batch_size = options["batch_size"]
+        if workers <= 0:
+            raise CommandError("--workers must be positive.")
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be positive.")
+
+        posts = Post.objects.all()
+        if options["stale"]:
+            posts = posts.filter(render_version__lt=RENDER_VERSION)
+        bounds = posts.aggregate(low=Min("id"), high=Max("id"))
+        started = time.monotonic()
+        rendered = 0
+        if bounds["low"] is not None:
+            ranges = [
+                (start, start + batch_size, options["stale"], batch_size)
+                for start in range(bounds["low"], bounds["high"] + 1, batch_size)
+            ]
+            if workers == 1:
+                rendered = sum(render_range(*args) for args in ranges)
+            else:
+                # Workers must open their own connections, not share ours.
+                connections.close_all()
+                with ProcessPoolExecutor(workers, initializer=init_worker) as pool:
+                    futures = [pool.submit(render_range, *args) for args in ranges]
+                    for future in as_completed(futures):
+                        rendered += future.result()
+
+        elapsed = time.monotonic() - started
+        rate = rendered / elapsed if elapsed > 0 else 0.0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rendered {rendered} posts with {workers} workers in "
+                f"{elapsed:.2f}s ({rate:.0f} posts/sec)."
+            )
+        )
@@ -0,0 +1,113 @@
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from blog import cache as post_cache
+from blog.counters import recount_comments
+from blog.models import Author, Comment, Post
+from blog.rendering import rendered_fields
+from blog.slugs import assign_slugs
+from blog.threads import assign_paths
+
+
+class Command(BaseCommand):
+    """
+    Seed the database with synthetic authors, posts and comments.
+
+    Used by the benchmark suite to build reproducible data volumes. All rows
+    are written with bulk_create; every seeded user shares one password
+    hash so seeding does not pay for PBKDF2 once per user.
+
+    Usage:
+        python manage.py seed_blog --authors 100 --posts 10000 --comments 5
+    """
+
+    help = "Seed synthetic authors, posts and comments."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--authors", type=int, default=50)
+        parser.add_argument("--posts", type=int, default=1000)
+        parser.add_argument(
+            "--comments", type=int, default=5, help="Comments per post."
+        )
+        parser.add_argument("--content-size", type=int, default=2000)
+        parser.add_argument("--password", default="benchpass123")
+        parser.add_argument("--prefix", default="bench")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options["authors"] <= 0:
+            raise CommandError("--authors must be positive.")
+        prefix = options["prefix"]
+        batch_size = options["batch_size"]
+        started = time.monotonic()
+
+        password = make_password(options["password"])
+        existing = set(
+            User.objects.filter(username__startswith=f"{prefix}_").values_list(
+                "username", flat=True
+            )
+        )
+        usernames = [f"{prefix}_{i}" for i in range(options["authors"])]
+        with transaction.atomic():
+            User.objects.bulk_create(
+                [
+                    User(username=name, password=password)
+                    for name in usernames
+                    if name not in existing
+                ],
+                batch_size=batch_size,
+            )
+            users = User.objects.filter(username__in=usernames).filter(
+                author__isnull=True
+            )
+            Author.objects.bulk_create(
+                [Author(user=user) for user in users], batch_size=batch_size
+            )
+        authors = list(Author.objects.filter(user__username__in=usernames))
+
+        body = ("Lorem ipsum dolor sit amet. " * (options["content_size"] // 28 + 1))[
+            : options["content_size"]
+        ]
+        rendered = rendered_fields(body)
+        offset = Post.objects.filter(title__startswith=f"{prefix} post ").count()
+        posts_written = comments_written = 0
+        for start in range(0, options["posts"], batch_size):
+            count = min(batch_size, options["posts"] - start)
+            posts = [
+                Post(
+                    author=authors[(start + i) % len(authors)],
+                    title=f"{prefix} post {offset + start + i}",
+                    content=body,
+                    **rendered,
+                )
+                for i in range(count)
+            ]
+            with transaction.atomic():
+                assign_slugs(posts)
+                posts = Post.objects.bulk_create(posts)
+                comments = [
+                    Comment(
+                        post=post,
+                        author=authors[(post.pk + j) % len(authors)],
+                        content=f"Comment {j} on {post.title}",
+                    )
+                    for post in posts
+                    for j in range(options["comments"])
+                ]
+                Comment.objects.bulk_create(comments, batch_size=batch_size)
+                assign_paths(comments)
+                recount_comments(Post.objects.filter(pk__in=[p.pk for p in posts]))
+            posts_written += len(posts)
+            comments_written += len(comments)
+
+        post_cache.invalidate_post_list()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {len(authors)} authors, {posts_written} posts and "
+                f"{comments_written} comments in {time.monotonic() - started:.2f}s."
+            )
+        )
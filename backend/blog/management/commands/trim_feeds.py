@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.feeds import trim_feeds
+
+
+class Command(BaseCommand):
+    """
+    Cut every precomputed feed timeline down to its newest entries.
+
+    Fan-out only ever appends to timelines, so run this periodically (e.g.
+    from cron) to keep the FeedEntry table bounded; trimmed posts drop off
+    the end of the feed.
+
+    Usage:
+        python manage.py trim_feeds --max-length 800
+    """
+
+    help = "Trim feed timelines to their newest entries."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-length",
+            type=int,
+            default=settings.FEED_MAX_LENGTH,
+            help="Entries kept per timeline (default: FEED_MAX_LENGTH).",
+        )
+
+    def handle(self, *args, **options):
+        max_length = options["max_length"]
+        if max_length <= 0:
+            raise CommandError("--max-length must be positive.")
+
+        deleted = trim_feeds(max_length)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} feed entries beyond {max_length}.")
+        )
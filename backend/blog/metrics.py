@@ -0,0 +1,293 @@
+import atexit
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+
+from . import cache as post_cache
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class RequestStats:
+    """
+    Database activity of the request being served.
+    """
+
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+current_request = ContextVar("blog_metrics_request", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper that charges each query to the current request.
+
+    Installed on every connection; a no-op outside of a request. The
+    ContextVar follows the request across sync_to_async threads, so queries
+    issued by async views are counted too.
+    """
+    stats = current_request.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+def install_query_wrapper(sender=None, connection=None, **kwargs):
+    """
+    connection_created receiver: attach record_query once per connection.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def to_list(self):
+        return [self.counts, self.total, self.count]
+
+    def merge(self, data):
+        counts, total, count = data
+        self.counts = [a + b for a, b in zip(self.counts, counts)]
+        self.total += total
+        self.count += count
+
+
+class Registry:
+    """
+    In-process metrics store, rendered in the Prometheus text format.
+
+    Values are per worker process. With METRICS_DIR set, each worker writes
+    its totals there every METRICS_PUBLISH_SECONDS, and collect() sums the
+    files of all workers for a scrape.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._filename = None
+        self.reset()
+
+    def reset(self):
+        self.requests = {}
+        self.latency = {}
+        self.queries = {}
+        self.query_counts = {}
+        self.db_seconds = {}
+        self.cache_events = {}
+        self._last_publish = time.monotonic()
+
+    def observe(self, endpoint, method, status, seconds, stats):
+        with self._lock:
+            key = (endpoint, method, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            if endpoint not in self.latency:
+                self.latency[endpoint] = Histogram(LATENCY_BUCKETS)
+                self.query_counts[endpoint] = Histogram(QUERY_BUCKETS)
+            self.latency[endpoint].observe(seconds)
+            self.query_counts[endpoint].observe(stats.queries)
+            self.queries[endpoint] = self.queries.get(endpoint, 0) + stats.queries
+            self.db_seconds[endpoint] = (
+                self.db_seconds.get(endpoint, 0.0) + stats.db_seconds
+            )
+        if settings.METRICS_DIR and self._publish_due():
+            self.publish()
+
+    def _publish_due(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_publish < settings.METRICS_PUBLISH_SECONDS:
+                return False
+            self._last_publish = now
+            return True
+
+    def snapshot(self):
+        """
+        Return this process's metrics, and its post cache counters, as JSON data.
+        """
+        with self._lock:
+            return {
+                "requests": [[*key, value] for key, value in self.requests.items()],
+                "latency": {e: h.to_list() for e, h in self.latency.items()},
+                "query_counts": {e: h.to_list() for e, h in self.query_counts.items()},
+                "queries": dict(self.queries),
+                "db_seconds": dict(self.db_seconds),
+                "cache_events": post_cache.stats.snapshot(),
+            }
+
+    def merge(self, data):
+        """
+        Add a snapshot (see snapshot()) to this registry's values.
+        """
+        with self._lock:
+            for endpoint, method, status, value in data["requests"]:
+                key = (endpoint, method, status)
+                self.requests[key] = self.requests.get(key, 0) + value
+            for name, buckets in (
+                ("latency", LATENCY_BUCKETS),
+                ("query_counts", QUERY_BUCKETS),
+            ):
+                histograms = getattr(self, name)
+                for endpoint, values in data[name].items():
+                    histograms.setdefault(endpoint, Histogram(buckets)).merge(values)
+            for name in ("queries", "db_seconds", "cache_events"):
+                totals = getattr(self, name)
+                for key, value in data[name].items():
+                    totals[key] = totals.get(key, 0) + value
+
+    def publish(self):
+        """
+        Replace this process's file in METRICS_DIR with its current snapshot.
+
+        The file is named after the pid and start time, so a recycled pid
+        never overwrites the totals of a worker that has exited.
+        """
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._filename = f"{self._pid}-{time.time_ns()}.json"
+        path = Path(settings.METRICS_DIR) / self._filename
+        partial = path.with_suffix(".tmp")
+        try:
+            partial.write_text(json.dumps(self.snapshot()))
+            # Readers see either the previous file or the new one, never half.
+            os.replace(partial, path)
+        except OSError:
+            logger.exception("Could not write metrics to %s", path)
+
+    def render(self):
+        with self._lock:
+            lines = []
+            self._render_counter(
+                lines,
+                "blog_http_requests_total",
+                "HTTP requests by endpoint, method and status.",
+                {
+                    (("endpoint", e), ("method", m), ("status", s)): v
+                    for (e, m, s), v in self.requests.items()
+                },
+            )
+            self._render_histogram(
+                lines,
+                "blog_http_request_duration_seconds",
+                "Request latency by endpoint.",
+                self.latency,
+            )
+            self._render_histogram(
+                lines,
+                "blog_db_queries_per_request",
+                "Database queries per request by endpoint.",
+                self.query_counts,
+            )
+            self._render_counter(
+                lines,
+                "blog_db_queries_total",
+                "Database queries by endpoint.",
+                {(("endpoint", e),): v for e, v in self.queries.items()},
+            )
+            self._render_counter(
+                lines,
+                "blog_db_query_duration_seconds_total",
+                "Time spent in database queries by endpoint.",
+                {(("endpoint", e),): v for e, v in self.db_seconds.items()},
+            )
+            self._render_counter(
+                lines,
+                "blog_post_cache_events_total",
+                "Post cache hits, misses, sets, evictions and invalidations.",
+                {(("event", e),): v for e, v in self.cache_events.items()},
+            )
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _labels(pairs):
+        if not pairs:
+            return ""
+        body = ",".join(
+            '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+            for k, v in pairs
+        )
+        return "{" + body + "}"
+
+    def _render_counter(self, lines, name, help_text, values):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for labels, value in sorted(values.items()):
+            lines.append(f"{name}{self._labels(labels)} {value}")
+
+    def _render_histogram(self, lines, name, help_text, histograms):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for endpoint, histogram in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                labels = self._labels((("endpoint", endpoint), ("le", bound)))
+                lines.append(f"{name}_bucket{labels} {cumulative}")
+            labels = self._labels((("endpoint", endpoint), ("le", "+Inf")))
+            lines.append(f"{name}_bucket{labels} {histogram.count}")
+            labels = self._labels((("endpoint", endpoint),))
+            lines.append(f"{name}_sum{labels} {histogram.total}")
+            lines.append(f"{name}_count{labels} {histogram.count}")
+
+
+registry = Registry()
+
+
+def collect():
+    """
+    Return a Registry with the metrics to serve on a scrape.
+
+    Without METRICS_DIR these are this worker's. Otherwise this worker
+    publishes first, then the files of all workers are summed, including
+    those of workers that have exited, so counters never go backwards.
+    """
+    collected = Registry()
+    if not settings.METRICS_DIR:
+        collected.merge(registry.snapshot())
+        return collected
+    registry.publish()
+    for path in Path(settings.METRICS_DIR).glob("*.json"):
+        try:
+            collected.merge(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            logger.warning("Skipping unreadable metrics file %s", path)
+    return collected
+
+
+def _publish_at_exit():
+    if settings.METRICS_DIR:
+        registry.publish()
+
+
+atexit.register(_publish_at_exit)
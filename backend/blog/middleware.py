@@ -0,0 +1,67 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .metrics import RequestStats, current_request, registry
+
+logger = logging.getLogger("blog.metrics")
+
+
+class MetricsMiddleware:
+    """
+    Records request count, latency, DB query count and DB time per endpoint.
+
+    Endpoints are labelled by resolved URL name (post-list, post_comments,
+    token_obtain_pair, ...). A warning is logged when a single request runs
+    more than METRICS_QUERY_WARNING_THRESHOLD queries, which usually means
+    an N+1 pattern. Works for both sync and async views.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        self.record(request, response, time.perf_counter() - started, stats)
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request.reset(token)
+        self.record(request, response, time.perf_counter() - started, stats)
+        return response
+
+    def record(self, request, response, seconds, stats):
+        match = getattr(request, "resolver_match", None)
+        endpoint = (match.url_name if match else None) or "unresolved"
+        registry.observe(endpoint, request.method, response.status_code, seconds, stats)
+        threshold = settings.METRICS_QUERY_WARNING_THRESHOLD
+        if threshold and stats.queries > threshold:
+            logger.warning(
+                "Possible N+1: %s %s (%s) ran %d queries in %.1f ms",
+                request.method,
+                request.path,
+                endpoint,
+                stats.queries,
+                stats.db_seconds * 1000,
+            )
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:53
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from blog.search import install_postgres_search, uninstall_postgres_search
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0003_post_comment_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(install_postgres_search, uninstall_postgres_search),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0005_post_comment_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="author",
+            name="profile_picture_renditions",
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="image_renditions",
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:27
+
+from django.db import migrations, models
+
+from blog.rendering import rendered_fields
+
+
+def render_existing_posts(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    batch = []
+    for post in Post.objects.only("id", "content").iterator(chunk_size=500):
+        for name, value in rendered_fields(post.content).items():
+            setattr(post, name, value)
+        batch.append(post)
+        if len(batch) == 500:
+            Post.objects.bulk_update(
+                batch, ["content_html", "excerpt", "render_version"]
+            )
+            batch = []
+    if batch:
+        Post.objects.bulk_update(batch, ["content_html", "excerpt", "render_version"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0007_comment_threads"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="content_html",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="excerpt",
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="render_version",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(render_existing_posts, migrations.RunPython.noop),
+    ]
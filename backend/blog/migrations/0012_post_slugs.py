@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from blog.slugs import slug_base, with_suffix
+
+
+def slug_existing_posts(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    taken = set()
+    batch = []
+    for post in (
+        Post.objects.only("id", "title").order_by("id").iterator(chunk_size=500)
+    ):
+        base = slug_base(post.title)
+        slug, number = base, 2
+        while slug in taken:
+            slug, number = with_suffix(base, number), number + 1
+        taken.add(slug)
+        post.slug = slug
+        batch.append(post)
+        if len(batch) == 500:
+            Post.objects.bulk_update(batch, ["slug"])
+            batch = []
+    if batch:
+        Post.objects.bulk_update(batch, ["slug"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0011_tags_categories"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="slug",
+            field=models.SlugField(
+                editable=False, max_length=220, null=True, unique=True
+            ),
+        ),
+        migrations.RunPython(slug_existing_posts, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="post",
+            name="slug",
+            field=models.SlugField(editable=False, max_length=220, unique=True),
+        ),
+        migrations.CreateModel(
+            name="PostSlugHistory",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("slug", models.SlugField(max_length=220, unique=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="slug_history",
+                        to="blog.post",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "post slug history",
+            },
+        ),
+    ]
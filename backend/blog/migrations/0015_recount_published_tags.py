@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:12
+
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def recount_published_tags(apps, schema_editor):
+    PostTag = apps.get_model("blog", "PostTag")
+    Tag = apps.get_model("blog", "Tag")
+    links = (
+        PostTag.objects.filter(
+            tag=OuterRef("pk"),
+            post__deleted_at__isnull=True,
+            post__status="published",
+        )
+        .order_by()
+        .values("tag")
+    )
+    Tag.objects.update(
+        post_count=Coalesce(
+            Subquery(links.annotate(total=Count("id")).values("total")),
+            0,
+            output_field=IntegerField(),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0014_post_status"),
+    ]
+
+    operations = [
+        migrations.RunPython(recount_published_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,98 @@
+from django.db import migrations, models
+
+from blog.operations import AddIndexConcurrently, RemoveIndexConcurrently
+
+LIVE = models.Q(("deleted_at__isnull", True))
+PUBLIC = models.Q(("deleted_at__isnull", True), ("status", "published"))
+
+
+class Migration(migrations.Migration):
+    """
+    Rebuild the post read indexes as partial indexes over live and published
+    rows, concurrently on PostgreSQL so the table keeps taking writes.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ("blog", "0015_recount_published_tags"),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(
+            model_name="post",
+            name="post_created_id_idx",
+        ),
+        RemoveIndexConcurrently(
+            model_name="post",
+            name="post_author_created_idx",
+        ),
+        RemoveIndexConcurrently(
+            model_name="post",
+            name="post_activity_idx",
+        ),
+        RemoveIndexConcurrently(
+            model_name="post",
+            name="post_views_idx",
+        ),
+        RemoveIndexConcurrently(
+            model_name="post",
+            name="post_category_idx",
+        ),
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                condition=PUBLIC,
+                fields=["created_at", "id"],
+                name="post_created_id_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                condition=LIVE,
+                fields=["author", "created_at", "id"],
+                name="post_author_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                condition=PUBLIC,
+                fields=["last_comment_at", "id"],
+                name="post_activity_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                condition=PUBLIC,
+                fields=["view_count", "id"],
+                name="post_views_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                condition=PUBLIC,
+                fields=["category", "created_at", "id"],
+                name="post_category_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                condition=LIVE & models.Q(("status", "scheduled")),
+                fields=["publish_at", "id"],
+                name="post_scheduled_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", False)),
+                fields=["deleted_at", "id"],
+                name="post_deleted_idx",
+            ),
+        ),
+    ]
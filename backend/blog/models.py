@@ -1,5 +1,10 @@
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from .threads import child_path
 
 
 class Author(models.Model):
@@ -11,6 +16,12 @@ class Author(models.Model):
         bio (TextField): Short biography of the author.
         profile_picture (ImageField): Optional profile picture.
         website (URLField): Personal website URL.
+        profile_picture_renditions (JSONField): Resized copies of the profile
+            picture, filled in the background by blog.images.
+        follower_count (PositiveIntegerField): Denormalized number of followers.
+        pulled_into_feeds (BooleanField): Set once the author has more than
+            FEED_FANOUT_MAX_FOLLOWERS followers; their posts are then read into
+            follower feeds on request instead of being fanned out (blog.feeds).
         created_at (DateTimeField): Timestamp when the author profile was created.
         updated_at (DateTimeField): Timestamp when the author profile was last updated.
     """
@@ -20,7 +31,12 @@ class Author(models.Model):
     profile_picture = models.ImageField(
         upload_to="profile_pics/", blank=True, null=True
     )
+    profile_picture_renditions = models.JSONField(
+        default=list, blank=True, editable=False
+    )
     website = models.URLField(blank=True, null=True)
+    follower_count = models.PositiveIntegerField(default=0, editable=False)
+    pulled_into_feeds = models.BooleanField(default=False, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -28,6 +44,124 @@ class Author(models.Model):
         return self.user.username
 
 
+class Follow(models.Model):
+    """
+    Records that one author follows another.
+
+    Attributes:
+        follower (ForeignKey): The author who follows.
+        followee (ForeignKey): The author being followed.
+        created_at (DateTimeField): Timestamp when the follow was created.
+    """
+
+    follower = models.ForeignKey(
+        Author, on_delete=models.CASCADE, related_name="following"
+    )
+    followee = models.ForeignKey(
+        Author, on_delete=models.CASCADE, related_name="followers"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["follower", "followee"], name="follow_unique_pair"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["followee", "follower"], name="follow_followee_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.follower} follows {self.followee}"
+
+
+class Category(models.Model):
+    """
+    A single-level grouping of posts; each post has at most one.
+
+    Attributes:
+        name (CharField): Unique display name.
+        created_at (DateTimeField): Timestamp when the category was created.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = "categories"
+
+    def __str__(self):
+        return self.name
+
+
+class Tag(models.Model):
+    """
+    A free-form label attached to posts (see blog.tags).
+
+    Attributes:
+        name (CharField): Unique, lower-cased tag name.
+        post_count (PositiveIntegerField): Denormalized number of tagged posts,
+            which the tag cloud is read from.
+    """
+
+    name = models.CharField(max_length=50, unique=True)
+    post_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-post_count", "name"], name="tag_cloud_idx"),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class PostStatus(models.TextChoices):
+    DRAFT = "draft"
+    SCHEDULED = "scheduled"
+    PUBLISHED = "published"
+
+
+class PostQuerySet(models.QuerySet):
+    def published(self):
+        """
+        Posts everyone can read.
+        """
+        return self.filter(status=PostStatus.PUBLISHED)
+
+    def visible_to(self, author_id):
+        """
+        Published posts, plus the drafts and scheduled posts of `author_id`.
+        """
+        return self.filter(Q(status=PostStatus.PUBLISHED) | Q(author_id=author_id))
+
+    def soft_delete(self):
+        """
+        Mark the posts deleted with a single UPDATE.
+
+        Comments, tag links and feed entries stay in place, hidden with
+        their post, until archive_posts moves them out in batches.
+        """
+        return self.update(deleted_at=timezone.now())
+
+
+class LivePostManager(models.Manager.from_queryset(PostQuerySet)):
+    """
+    Default Post manager: posts that have not been soft-deleted.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+# Every Post index that serves reads is partial on this, so deleted posts
+# cost no space in them; the public list indexes also leave out drafts and
+# scheduled posts.
+LIVE = Q(deleted_at__isnull=True)
+PUBLIC = LIVE & Q(status=PostStatus.PUBLISHED)
+
+
 class Post(models.Model):
     """
     Represents a blog post written by an author.
@@ -37,22 +171,176 @@ class Post(models.Model):
         title (CharField): Title of the post.
         content (TextField): Full text content of the post.
         image (ImageField): Optional feature image for the post.
-        created_at (DateTimeField): Timestamp when the post was created.
+        image_renditions (JSONField): Resized copies of the image, filled in
+            the background by blog.images.
+        created_at (DateTimeField): Timestamp when the post was created, or
+            published if it started as a draft or scheduled post, so lists
+            and feeds show it as new when it goes public.
         updated_at (DateTimeField): Timestamp when the post was last updated.
+        search_vector (SearchVectorField): Weighted title/content tsvector,
+            maintained by a database trigger on PostgreSQL.
+        comment_count (PositiveIntegerField): Denormalized number of comments.
+        last_comment_at (DateTimeField): Timestamp of the newest comment.
+        content_html (TextField): Content rendered from Markdown to sanitized
+            HTML on write (see blog.rendering).
+        excerpt (CharField): Plain-text excerpt of the rendered content.
+        render_version (PositiveSmallIntegerField): blog.rendering version that
+            produced content_html and excerpt; 0 if not rendered yet.
+        view_count (PositiveBigIntegerField): Number of detail views, written
+            in batches by blog.viewcounts.
+        category (ForeignKey): Optional category of the post.
+        tags (ManyToManyField): Tags of the post, through PostTag.
+        slug (SlugField): Unique URL name derived from the title (see
+            blog.slugs); earlier slugs are kept in PostSlugHistory.
+        deleted_at (DateTimeField): Set when the post is soft-deleted. Deleted
+            posts are hidden by the default manager (`objects`); use
+            `all_objects` to see them.
+        status (CharField): draft, scheduled or published. Only published
+            posts are listed; the others are visible to their author only.
+        publish_at (DateTimeField): When a scheduled post is due to be
+            published (by publish_scheduled), or when the post was published.
 
+    Titles are unique among live posts only, so a deleted post's title can
+    be reused. Its slug stays reserved until the post is archived.
     """
 
     author = models.ForeignKey(Author, on_delete=models.CASCADE)
-    title = models.CharField(max_length=200, unique=True)
+    title = models.CharField(max_length=200)
     content = models.TextField()
     image = models.ImageField(upload_to="post_images/", blank=True, null=True)
+    image_renditions = models.JSONField(default=list, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    last_comment_at = models.DateTimeField(null=True, blank=True, editable=False)
+    content_html = models.TextField(blank=True, editable=False)
+    excerpt = models.CharField(max_length=255, blank=True, editable=False)
+    render_version = models.PositiveSmallIntegerField(default=0, editable=False)
+    view_count = models.PositiveBigIntegerField(default=0, editable=False)
+    category = models.ForeignKey(
+        Category, on_delete=models.SET_NULL, null=True, blank=True, related_name="posts"
+    )
+    tags = models.ManyToManyField(
+        Tag, through="PostTag", related_name="posts", blank=True
+    )
+    slug = models.SlugField(max_length=220, unique=True, editable=False)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+    status = models.CharField(
+        max_length=10, choices=PostStatus.choices, default=PostStatus.PUBLISHED
+    )
+    publish_at = models.DateTimeField(null=True, blank=True)
+
+    objects = LivePostManager()
+    all_objects = PostQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["title"], condition=LIVE, name="post_title_live_unique"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"],
+                condition=PUBLIC,
+                name="post_created_id_idx",
+            ),
+            models.Index(
+                fields=["author", "created_at", "id"],
+                condition=LIVE,
+                name="post_author_created_idx",
+            ),
+            models.Index(
+                fields=["last_comment_at", "id"],
+                condition=PUBLIC,
+                name="post_activity_idx",
+            ),
+            models.Index(
+                fields=["view_count", "id"], condition=PUBLIC, name="post_views_idx"
+            ),
+            models.Index(
+                fields=["category", "created_at", "id"],
+                condition=PUBLIC,
+                name="post_category_idx",
+            ),
+            # Finds the scheduled posts due for publish_scheduled.
+            models.Index(
+                fields=["publish_at", "id"],
+                condition=LIVE & Q(status=PostStatus.SCHEDULED),
+                name="post_scheduled_idx",
+            ),
+            # Finds the soft-deleted posts due for archive_posts.
+            models.Index(
+                fields=["deleted_at", "id"],
+                condition=Q(deleted_at__isnull=False),
+                name="post_deleted_idx",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Save the post, deriving a unique slug from the title if it has none.
+
+        Renames keep the slug; views and the admin move it with
+        blog.slugs.rename_slug() so the old URL keeps redirecting.
+        """
+        if not self.slug:
+            from .slugs import assign_slugs
+
+            assign_slugs([self])
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
 
 
+class PostSlugHistory(models.Model):
+    """
+    A slug a post used to have, kept so its old URL redirects to the new one.
+
+    Attributes:
+        slug (SlugField): The retired slug; never reassigned to another post.
+        post (ForeignKey): The post the slug belonged to.
+        created_at (DateTimeField): Timestamp when the slug was retired.
+    """
+
+    slug = models.SlugField(max_length=220, unique=True)
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="slug_history"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = "post slug history"
+
+    def __str__(self):
+        return f"{self.slug} -> {self.post}"
+
+
+class PostTag(models.Model):
+    """
+    Links a post to one of its tags.
+
+    The unique (post, tag) index serves a post's tags; the (tag, post)
+    index serves the posts with a tag.
+    """
+
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="tag_links")
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="post_links")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["post", "tag"], name="posttag_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["tag", "post"], name="posttag_tag_post_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.tag} on {self.post}"
+
+
 class Comment(models.Model):
     """
     Represents a comment made on a post by an author.
@@ -62,12 +350,147 @@ class Comment(models.Model):
         author (ForeignKey): The author who made the comment.
         content (TextField): The actual comment text.
         created_at (DateTimeField): Timestamp when the comment was created.
+        parent (ForeignKey): The comment this one replies to, if any.
+        path (CharField): Materialized path of zero-padded ids from the top-level
+            comment down to this one (see blog.threads).
+        depth (PositiveSmallIntegerField): Nesting level; 0 for top-level comments.
+        reply_count (PositiveIntegerField): Denormalized number of direct replies.
     """
 
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="comments")
     author = models.ForeignKey(Author, on_delete=models.CASCADE)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    parent = models.ForeignKey(
+        "self",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="replies",
+    )
+    path = models.CharField(max_length=255, blank=True, editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+    reply_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["post", "created_at", "id"], name="comment_post_created_idx"
+            ),
+            models.Index(fields=["post", "path"], name="comment_post_path_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Save the comment, deriving depth and path from its parent.
+
+        The path ends with the comment's own id, so a new comment is
+        written with an UPDATE right after its INSERT.
+        """
+        if self.parent_id is not None:
+            self.depth = self.parent.depth + 1
+        super().save(*args, **kwargs)
+        if not self.path:
+            parent_path = self.parent.path if self.parent_id is not None else ""
+            self.path = child_path(parent_path, self.pk)
+            Comment.objects.filter(pk=self.pk).update(path=self.path)
 
     def __str__(self):
         return f"Comment by {self.author} on {self.post}"
+
+
+class FeedEntry(models.Model):
+    """
+    A post in an author's precomputed timeline (see blog.feeds).
+
+    Attributes:
+        owner (ForeignKey): The author whose timeline this entry is in.
+        post (ForeignKey): The post shown in the timeline.
+        created_at (DateTimeField): Copy of the post's created_at, so a
+            timeline page is read from the (owner, created_at, post) index alone.
+    """
+
+    owner = models.ForeignKey(
+        Author, on_delete=models.CASCADE, related_name="feed_entries"
+    )
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="+")
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["owner", "post"], name="feed_unique_post"),
+        ]
+        indexes = [
+            models.Index(
+                fields=["owner", "created_at", "post"], name="feed_owner_created_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.post} in {self.owner}'s feed"
+
+
+class ArchivedPost(models.Model):
+    """
+    A soft-deleted post moved out of the Post table by archive_posts.
+
+    Keeps the post's id and plain ids instead of foreign keys, so archiving
+    never locks or cascades into live tables.
+
+    Attributes:
+        id (BigIntegerField): The post's original id.
+        author_id (BigIntegerField): Id of the post's author.
+        title (CharField): Title of the post.
+        slug (SlugField): Slug of the post when it was deleted.
+        content (TextField): Full text content of the post.
+        created_at (DateTimeField): When the post was created.
+        updated_at (DateTimeField): When the post was last updated.
+        deleted_at (DateTimeField): When the post was soft-deleted.
+        archived_at (DateTimeField): When the post was archived.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    author_id = models.BigIntegerField()
+    title = models.CharField(max_length=200)
+    slug = models.SlugField(max_length=220, db_index=False)
+    content = models.TextField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    deleted_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.title
+
+
+class ArchivedComment(models.Model):
+    """
+    A comment of an archived post, moved out of the Comment table.
+
+    Attributes:
+        id (BigIntegerField): The comment's original id.
+        post_id (BigIntegerField): Id of the (archived) post.
+        author_id (BigIntegerField): Id of the comment's author.
+        parent_id (BigIntegerField): Id of the comment replied to, if any.
+        content (TextField): The comment text.
+        created_at (DateTimeField): When the comment was created.
+        archived_at (DateTimeField): When the comment was archived.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    post_id = models.BigIntegerField()
+    author_id = models.BigIntegerField()
+    parent_id = models.BigIntegerField(null=True)
+    content = models.TextField()
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["post_id", "created_at"], name="archived_comment_post_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Archived comment {self.pk} on post {self.post_id}"
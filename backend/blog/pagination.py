@@ -0,0 +1,195 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Opt-in keyset pagination keyed on (created_at, id).
+
+    Pagination only kicks in when the client sends a ``cursor`` or
+    ``page_size`` query parameter, so existing clients keep receiving
+    a plain list. Each page is fetched with a range condition on the
+    composite index instead of an OFFSET, so page N costs the same as page 1.
+
+    Response:
+        { "next": <url or null>, "results": [...] }
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 20
+    max_page_size = 100
+    descending = True
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Return one page of objects, or None if pagination was not requested.
+        """
+        page_queryset = self.get_page_queryset(queryset, request)
+        if page_queryset is None:
+            return None
+        return self.finish_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async variant of paginate_queryset for async views.
+        """
+        page_queryset = self.get_page_queryset(queryset, request)
+        if page_queryset is None:
+            return None
+        return self.finish_page([obj async for obj in page_queryset])
+
+    def get_page_queryset(self, queryset, request):
+        """
+        Build the (unevaluated) query for the requested page.
+
+        Fetches one extra row to detect whether a next page exists.
+        """
+        params = request.query_params
+        if (
+            self.cursor_query_param not in params
+            and self.page_size_query_param not in params
+        ):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position = self.decode_cursor(params.get(self.cursor_query_param))
+
+        if self.descending:
+            queryset = queryset.order_by("-created_at", "-id")
+        else:
+            queryset = queryset.order_by("created_at", "id")
+
+        if position is not None:
+            created_at, pk = position
+            # The redundant range on created_at lets the database seek the
+            # composite index directly rather than filtering from the start.
+            if self.descending:
+                queryset = queryset.filter(created_at__lte=created_at).filter(
+                    Q(created_at__lt=created_at) | Q(id__lt=pk)
+                )
+            else:
+                queryset = queryset.filter(created_at__gte=created_at).filter(
+                    Q(created_at__gt=created_at) | Q(id__gt=pk)
+                )
+
+        return queryset[: self.page_size + 1]
+
+    def finish_page(self, results):
+        """
+        Trim the look-ahead row and remember where the next page starts.
+        """
+        self.has_next = len(results) > self.page_size
+        results = results[: self.page_size]
+        self.next_position = None
+        if self.has_next:
+            last = results[-1]
+            self.next_position = (last.created_at, last.pk)
+        return results
+
+    def get_page_size(self, request):
+        """
+        Read the requested page size, clamped to max_page_size.
+        """
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def decode_cursor(self, encoded):
+        """
+        Decode a cursor string into a (created_at, id) tuple.
+        """
+        if not encoded:
+            return None
+        try:
+            raw = urlsafe_b64decode(encoded.encode("ascii")).decode("ascii")
+            created_at, pk = raw.rsplit("|", 1)
+            return datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position):
+        """
+        Encode a (created_at, id) tuple into an opaque cursor string.
+        """
+        created_at, pk = position
+        raw = f"{created_at.isoformat()}|{pk}"
+        return urlsafe_b64encode(raw.encode("ascii")).decode("ascii")
+
+    def get_next_link(self):
+        """
+        Build the URL of the next page, or None on the last page.
+        """
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_position)
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class PostCursorPagination(KeysetCursorPagination):
+    """
+    Newest posts first.
+    """
+
+    descending = True
+
+
+class CommentCursorPagination(KeysetCursorPagination):
+    """
+    Comments in the order they were written.
+    """
+
+    descending = False
+
+
+class FeedCursorPagination(KeysetCursorPagination):
+    """
+    Newest first over timeline keys (see blog.feeds.timeline).
+
+    Feeds are always paginated, so the response is always
+    { "next": <url or null>, "results": [...] }.
+    """
+
+    def paginate_keys(self, fetch, request):
+        """
+        Return one page of (created_at, post id) keys.
+
+        fetch(position, limit) returns up to `limit` keys after `position`;
+        one extra key is requested to detect whether a next page exists.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position = self.decode_cursor(request.query_params.get(self.cursor_query_param))
+        keys = fetch(position, self.page_size + 1)
+        self.has_next = len(keys) > self.page_size
+        keys = keys[: self.page_size]
+        self.next_position = tuple(keys[-1]) if self.has_next else None
+        return keys
@@ -0,0 +1,69 @@
+import html
+import re
+import threading
+
+import markdown
+import nh3
+
+# Bump when the rendering below changes; `manage.py rerender_posts --stale`
+# then re-renders every post rendered by an older version.
+RENDER_VERSION = 1
+
+EXCERPT_LENGTH = 200
+
+MARKDOWN_EXTENSIONS = ["fenced_code", "tables", "sane_lists"]
+
+_local = threading.local()
+_whitespace = re.compile(r"\s+")
+
+
+def _markdown():
+    # Markdown instances are not thread-safe but are costly to build, so
+    # each thread reuses its own.
+    if not hasattr(_local, "markdown"):
+        _local.markdown = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+    return _local.markdown
+
+
+def render_html(text):
+    """
+    Render Markdown to HTML with unsafe tags, attributes and URLs removed.
+    """
+    converter = _markdown()
+    try:
+        return nh3.clean(converter.convert(text))
+    finally:
+        converter.reset()
+
+
+def truncate_excerpt(text, length=EXCERPT_LENGTH):
+    """
+    Cut text to at most `length` characters at a word boundary.
+    """
+    if len(text) <= length:
+        return text
+    head = text[:length]
+    space = head.rfind(" ")
+    if space > 0:
+        head = head[:space]
+    return head.rstrip() + "…"
+
+
+def plain_excerpt(content_html):
+    """
+    Return a plain-text excerpt of rendered HTML.
+    """
+    text = html.unescape(nh3.clean(content_html, tags=set()))
+    return truncate_excerpt(_whitespace.sub(" ", text).strip())
+
+
+def rendered_fields(content):
+    """
+    Return the precomputed Post fields for `content`, for save() or update().
+    """
+    content_html = render_html(content)
+    return {
+        "content_html": content_html,
+        "excerpt": plain_excerpt(content_html),
+        "render_version": RENDER_VERSION,
+    }
@@ -0,0 +1,89 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+# Set for the duration of a request whose reads may go to a replica.
+reads_from_replica = ContextVar("blog_reads_from_replica", default=False)
+
+
+class ReplicaRouter:
+    """
+    Sends reads to a replica in settings.DATABASE_REPLICAS, writes to default.
+
+    Reads only go to a replica inside views using ReplicaRoutingMixin, for
+    safe methods and outside a user's sticky window; everything else (admin,
+    management commands, writes and the reads they make) uses the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if reads_from_replica.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Instances read from a replica would otherwise be saved back to it.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive schema changes through replication.
+        return db not in settings.DATABASE_REPLICAS
+
+
+def sticky_key(user_id):
+    return f"db:sticky:{user_id}"
+
+
+class ReplicaRoutingMixin:
+    """
+    View mixin that routes a request's reads to a replica when it is safe.
+
+    GET/HEAD/OPTIONS requests read from a replica unless the user wrote
+    within the last REPLICA_STICKY_SECONDS, so users see their own writes
+    despite replication lag. A successful write marks the user sticky. The
+    sticky flag lives in the cache, so checking it runs no database query.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in ("GET", "HEAD", "OPTIONS") and settings.DATABASE_REPLICAS:
+            self._replica_token = reads_from_replica.set(not self.is_sticky(request))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_replica_token", None)
+        if token is not None:
+            reads_from_replica.reset(token)
+            self._replica_token = None
+        elif (
+            request.method not in ("GET", "HEAD", "OPTIONS")
+            and response.status_code < 400
+            and settings.DATABASE_REPLICAS
+        ):
+            self.mark_sticky(request)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    @staticmethod
+    def sticky_user_id(request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return user.pk
+        return None
+
+    def is_sticky(self, request):
+        user_id = self.sticky_user_id(request)
+        if user_id is None:
+            return False
+        return caches[settings.BLOG_CACHE_ALIAS].get(sticky_key(user_id)) is not None
+
+    def mark_sticky(self, request):
+        user_id = self.sticky_user_id(request)
+        if user_id is not None:
+            caches[settings.BLOG_CACHE_ALIAS].set(
+                sticky_key(user_id), 1, timeout=settings.REPLICA_STICKY_SECONDS
+            )
@@ -0,0 +1,168 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, Q
+
+SEARCH_CONFIG = "english"
+
+# PostgreSQL: search_vector is filled by a BEFORE trigger (title weighted A,
+# content weighted B) and indexed with GIN. Installed by migration 0004.
+POSTGRES_INSTALL_SQL = [
+    f"""
+    CREATE OR REPLACE FUNCTION blog_post_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.content, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER blog_post_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, content ON blog_post
+    FOR EACH ROW EXECUTE FUNCTION blog_post_search_vector_update()
+    """,
+    f"""
+    UPDATE blog_post SET search_vector =
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'B')
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS blog_post_search_vector_gin
+    ON blog_post USING gin (search_vector)
+    """,
+]
+
+POSTGRES_UNINSTALL_SQL = [
+    "DROP INDEX IF EXISTS blog_post_search_vector_gin",
+    "DROP TRIGGER IF EXISTS blog_post_search_vector_trigger ON blog_post",
+    "DROP FUNCTION IF EXISTS blog_post_search_vector_update()",
+]
+
+# SQLite: an external-content FTS5 table kept in sync by triggers. SQLite
+# drops triggers whenever a migration rebuilds blog_post, so these are
+# (re)installed after every migrate run rather than by a migration.
+SQLITE_TRIGGERS = {
+    "blog_post_fts_ai": """
+        CREATE TRIGGER blog_post_fts_ai AFTER INSERT ON blog_post BEGIN
+            INSERT INTO blog_post_fts(rowid, title, content)
+            VALUES (new.id, new.title, new.content);
+        END
+    """,
+    "blog_post_fts_ad": """
+        CREATE TRIGGER blog_post_fts_ad AFTER DELETE ON blog_post BEGIN
+            INSERT INTO blog_post_fts(blog_post_fts, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+        END
+    """,
+    "blog_post_fts_au": """
+        CREATE TRIGGER blog_post_fts_au AFTER UPDATE OF title, content ON blog_post
+        BEGIN
+            INSERT INTO blog_post_fts(blog_post_fts, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO blog_post_fts(rowid, title, content)
+            VALUES (new.id, new.title, new.content);
+        END
+    """,
+}
+
+
+def install_postgres_search(apps, schema_editor):
+    """
+    Migration hook: install the tsvector trigger and GIN index on PostgreSQL.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for sql in POSTGRES_INSTALL_SQL:
+        schema_editor.execute(sql)
+
+
+def uninstall_postgres_search(apps, schema_editor):
+    """
+    Migration hook: remove the tsvector trigger and GIN index on PostgreSQL.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for sql in POSTGRES_UNINSTALL_SQL:
+        schema_editor.execute(sql)
+
+
+def install_sqlite_search(using="default", **kwargs):
+    """
+    Create the FTS5 table and its triggers on SQLite if they are missing.
+
+    Connected to post_migrate. Rebuilds the index when triggers had to be
+    recreated, since rows written without them are not indexed.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+        if "blog_post" not in tables:
+            return
+        cursor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_fts USING fts5("
+            "title, content, content='blog_post', content_rowid='id')"
+        )
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s",
+            ["blog_post"],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        missing = [name for name in SQLITE_TRIGGERS if name not in existing]
+        for name in missing:
+            cursor.execute(SQLITE_TRIGGERS[name])
+        if missing:
+            cursor.execute(
+                "INSERT INTO blog_post_fts(blog_post_fts) VALUES ('rebuild')"
+            )
+
+
+def _fts5_query(query):
+    """
+    Quote each term so user input cannot inject FTS5 query syntax.
+    """
+    terms = query.split()
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def search_posts(queryset, query, limit):
+    """
+    Return up to ``limit`` posts from ``queryset`` matching ``query``, best first.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type="websearch")
+        return list(
+            queryset.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F("search_vector"), search_query))
+            .order_by("-rank", "-id")[:limit]
+        )
+
+    if connection.vendor == "sqlite":
+        # Restrict matches to the queryset's rows (e.g. live, published posts)
+        # before LIMIT, so hidden posts cannot crowd out visible ones.
+        visible, params = (
+            queryset.order_by()
+            .values("id")
+            .query.get_compiler(using=queryset.db)
+            .as_sql()
+        )
+        with connection.cursor() as cursor:
+            # Title hits weigh ten times content hits; lower bm25 is better.
+            cursor.execute(
+                "SELECT rowid FROM blog_post_fts WHERE blog_post_fts MATCH %s "
+                f"AND rowid IN ({visible}) "
+                "ORDER BY bm25(blog_post_fts, 10.0, 1.0) LIMIT %s",
+                [_fts5_query(query), *params, limit],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        posts = queryset.in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
+
+    return list(
+        queryset.filter(
+            Q(title__icontains=query) | Q(content__icontains=query)
+        ).order_by("-created_at", "-id")[:limit]
+    )
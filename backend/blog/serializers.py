@@ -1,7 +1,13 @@
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db.models import Prefetch
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
-from blog.models import Author, Comment, Post
+from blog.images import srcset
+from blog.models import Author, Category, Comment, Post, PostStatus
+from blog.tags import normalize_tags, set_post_tags
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -28,6 +34,25 @@ class RegisterSerializer(serializers.ModelSerializer):
         return user
 
 
+class AuthorTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Token serializer that embeds the user's author id in the token claims.
+
+    Lets AuthorJWTAuthentication resolve request.user.author without a query.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        """
+        Add the author_id claim to the refresh token (and its access tokens).
+        """
+        token = super().get_token(user)
+        token["author_id"] = (
+            Author.objects.filter(user=user).values_list("id", flat=True).first()
+        )
+        return token
+
+
 class AuthorSerializer(serializers.ModelSerializer):
     """
     Serializer for the Author model.
@@ -36,6 +61,7 @@ class AuthorSerializer(serializers.ModelSerializer):
     """
 
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    profile_picture_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Author
@@ -44,19 +70,181 @@ class AuthorSerializer(serializers.ModelSerializer):
             "user",
             "bio",
             "profile_picture",
+            "profile_picture_srcset",
             "website",
+            "follower_count",
             "created_at",
             "updated_at",
         ]
 
+    def get_profile_picture_srcset(self, obj):
+        """
+        Resized profile pictures as {"webp": "<url> 320w, ...", "jpeg": ...}.
+        """
+        return srcset(obj.profile_picture_renditions, self.context.get("request"))
+
+
+class AuthorPreviewSerializer(serializers.ModelSerializer):
+    """
+    Compact read-only author (username and avatar) embedded by ?expand=.
+    """
+
+    username = serializers.CharField(source="user.username", read_only=True)
+    profile_picture_srcset = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Author
+        fields = ["id", "username", "profile_picture", "profile_picture_srcset"]
+        read_only_fields = fields
+
+    def get_profile_picture_srcset(self, obj):
+        return srcset(obj.profile_picture_renditions, self.context.get("request"))
+
+
+class CommentPreviewSerializer(serializers.ModelSerializer):
+    """
+    Read-only comment with its author inlined, embedded by ?expand=.
+    """
+
+    author = AuthorPreviewSerializer(read_only=True)
+
+    class Meta:
+        model = Comment
+        fields = ["id", "author", "content", "created_at", "parent", "depth"]
+        read_only_fields = fields
+
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def requested_fields(request):
+    """
+    Parse ?fields=a,b,c into a set of names, or None when absent.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    raw = request.GET.get("fields")
+    if not raw:
+        return None
+    return {name.strip() for name in raw.split(",") if name.strip()}
+
 
-class PostSerializer(serializers.ModelSerializer):
+def requested_expansions(request):
+    """
+    Parse ?expand=author,latest_comments into a set of names.
+
+    Raises ValidationError for unknown names.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return set()
+    raw = request.GET.get("expand")
+    if not raw:
+        return set()
+    names = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = names - {"author", "latest_comments"}
+    if unknown:
+        raise serializers.ValidationError(
+            {"expand": [f"Unknown expansions: {', '.join(sorted(unknown))}."]}
+        )
+    return names
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin for ?fields=a,b sparse fieldsets on reads.
+
+    Unrequested fields are dropped from the output. columns_for() maps the
+    requested fields to the model columns the view should load with
+    .only(); Meta.field_columns lists the columns of computed fields.
+    """
+
+    # Loaded even if not requested: the primary key and pagination key.
+    required_columns = ("id", "created_at")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = requested_fields(self.context.get("request"))
+        if fields is not None:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+    @classmethod
+    def columns_for(cls, fields):
+        """
+        Return the model columns needed to render `fields`.
+
+        Raises ValidationError for unknown field names.
+        """
+        unknown = fields - set(cls.Meta.fields)
+        if unknown:
+            raise serializers.ValidationError(
+                {"fields": [f"Unknown fields: {', '.join(sorted(unknown))}."]}
+            )
+        extra = getattr(cls.Meta, "field_columns", {})
+        columns = set(cls.required_columns)
+        for name in fields:
+            columns.update(extra.get(name, (name,)))
+        return columns
+
+
+class TagListField(serializers.ListField):
+    """
+    A post's tags as a list of names.
+
+    Reads the (prefetched) tags relation; writes are normalized names,
+    at most POST_MAX_TAGS of them.
+    """
+
+    child = serializers.CharField(max_length=50)
+
+    def to_representation(self, value):
+        return [tag.name for tag in value.all()]
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [data]
+        names = normalize_tags(
+            part for name in super().to_internal_value(data) for part in name.split(",")
+        )
+        if len(names) > settings.POST_MAX_TAGS:
+            raise serializers.ValidationError(
+                f"Ensure there are at most {settings.POST_MAX_TAGS} tags."
+            )
+        return names
+
+
+class PostSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for the Post model.
     Handles converting post data to/from JSON format.
+
+    Tags are written as a list (or comma-separated string) of names and
+    created as needed with one upsert (see blog.tags).
+
+    Posts are published on save unless sent with "status": "draft", or
+    "scheduled" with a "publish_at" time (see blog.publishing).
+
+    Reads accept ?expand=author to inline the author's username and avatar
+    instead of the id, and ?expand=latest_comments to add the newest
+    POST_EXPAND_COMMENTS comments. Views load both with expand_queryset().
     """
 
     author = serializers.PrimaryKeyRelatedField(read_only=True)
+    # Unique among live posts, like the post_title_live_unique constraint.
+    title = serializers.CharField(
+        max_length=200,
+        validators=[
+            UniqueValidator(
+                queryset=Post.objects.all(),
+                message="post with this title already exists.",
+            )
+        ],
+    )
+    image_srcset = serializers.SerializerMethodField()
+    category = serializers.PrimaryKeyRelatedField(
+        queryset=Category.objects.all(), required=False, allow_null=True
+    )
+    tags = TagListField(required=False)
 
     class Meta:
         model = Post
@@ -64,15 +252,224 @@ class PostSerializer(serializers.ModelSerializer):
             "id",
             "author",
             "title",
+            "slug",
             "content",
+            "content_html",
+            "excerpt",
             "image",
+            "image_srcset",
             "created_at",
             "updated_at",
+            "comment_count",
+            "last_comment_at",
+            "view_count",
+            "category",
+            "tags",
+            "status",
+            "publish_at",
         ]
+        read_only_fields = [
+            "content_html",
+            "excerpt",
+            "comment_count",
+            "last_comment_at",
+            "view_count",
+        ]
+        field_columns = {"image_srcset": ("image_renditions",), "tags": ()}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        expand = requested_expansions(self.context.get("request"))
+        if "author" in expand and "author" in self.fields:
+            self.fields["author"] = AuthorPreviewSerializer(read_only=True)
+        if "latest_comments" in expand:
+            self.fields["latest_comments"] = CommentPreviewSerializer(
+                many=True, read_only=True
+            )
+
+    @staticmethod
+    def expand_queryset(queryset, request):
+        """
+        Load what the request's ?expand= embeds, in a fixed number of queries.
+
+        Authors and their users are joined into the post query; the latest
+        comments of all the posts come from one windowed prefetch query.
+        """
+        expand = requested_expansions(request)
+        fields = requested_fields(request)
+        if "author" in expand and (fields is None or "author" in fields):
+            queryset = queryset.select_related("author__user")
+        if "latest_comments" in expand:
+            comments = Comment.objects.select_related("author__user").order_by(
+                "-created_at", "-id"
+            )[: settings.POST_EXPAND_COMMENTS]
+            queryset = queryset.prefetch_related(
+                Prefetch("comments", queryset=comments, to_attr="latest_comments")
+            )
+        return queryset
+
+    def validate(self, attrs):
+        """
+        Require publish_at for scheduled posts.
+        """
+        status = attrs.get("status", getattr(self.instance, "status", None))
+        publish_at = attrs.get("publish_at", getattr(self.instance, "publish_at", None))
+        if status == PostStatus.SCHEDULED and publish_at is None:
+            raise serializers.ValidationError(
+                {"publish_at": ["Scheduled posts need a publish_at time."]}
+            )
+        return attrs
+
+    def create(self, validated_data):
+        """
+        Create the post, then attach its tags.
+        """
+        names = validated_data.pop("tags", [])
+        post = super().create(validated_data)
+        if names:
+            set_post_tags(post, names, created=True)
+        return post
+
+    def update(self, instance, validated_data):
+        """
+        Update the post; tags are replaced only when sent.
+        """
+        names = validated_data.pop("tags", None)
+        post = super().update(instance, validated_data)
+        if names is not None:
+            set_post_tags(post, names)
+            # Drop the stale prefetched tags before rendering the response.
+            getattr(post, "_prefetched_objects_cache", {}).pop("tags", None)
+        return post
+
+    def get_image_srcset(self, obj):
+        """
+        Resized images as {"webp": "<url> 320w, ...", "jpeg": ...}.
+        """
+        return srcset(obj.image_renditions, self.context.get("request"))
+
+
+class PostSummarySerializer(PostSerializer):
+    """
+    Lightweight read-only Post representation for list views.
+
+    Returns the stored excerpt instead of the content. Views pair it with
+    summary_queryset(), so the content columns are never sent by the database.
+    """
+
+    class Meta(PostSerializer.Meta):
+        fields = [
+            "id",
+            "author",
+            "title",
+            "slug",
+            "excerpt",
+            "image",
+            "image_srcset",
+            "created_at",
+            "updated_at",
+            "comment_count",
+            "last_comment_at",
+            "view_count",
+            "category",
+            "tags",
+            "status",
+            "publish_at",
+        ]
+        read_only_fields = fields
+
+    @staticmethod
+    def summary_queryset(queryset):
+        """
+        Defer the content and rendered HTML columns.
+        """
+        return queryset.defer("content", "content_html")
+
+
+class CategorySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Category
+        fields = ["id", "name"]
 
 
 class CommentSerializer(serializers.ModelSerializer):
+    parent = serializers.PrimaryKeyRelatedField(
+        queryset=Comment.objects.only("id", "post_id", "path", "depth"),
+        required=False,
+        allow_null=True,
+    )
+
     class Meta:
         model = Comment
-        fields = ["id", "post", "author", "content", "created_at"]
-        read_only_fields = ["id", "post", "author", "created_at"]
+        fields = [
+            "id",
+            "post",
+            "author",
+            "content",
+            "created_at",
+            "parent",
+            "path",
+            "depth",
+            "reply_count",
+        ]
+        read_only_fields = [
+            "id",
+            "post",
+            "author",
+            "created_at",
+            "path",
+            "depth",
+            "reply_count",
+        ]
+
+
+class CommentImportSerializer(serializers.Serializer):
+    """
+    Validates one nested comment of an NDJSON import row.
+    Authors are referenced by username and resolved in bulk by the command.
+    """
+
+    author = serializers.CharField(max_length=150)
+    content = serializers.CharField()
+    created_at = serializers.DateTimeField(required=False)
+    replies = serializers.ListField(child=serializers.DictField(), required=False)
+
+    def validate_replies(self, value):
+        """
+        Validate nested replies with this serializer, recursively.
+        """
+        serializer = CommentImportSerializer(data=value, many=True)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+
+class PostImportSerializer(serializers.Serializer):
+    """
+    Validates one NDJSON import row (a post plus its comments).
+
+    Runs no database queries; title uniqueness and author lookups are
+    checked once per batch by the import_posts command.
+    """
+
+    author = serializers.CharField(max_length=150)
+    title = serializers.CharField(max_length=200)
+    content = serializers.CharField()
+    created_at = serializers.DateTimeField(required=False)
+    updated_at = serializers.DateTimeField(required=False)
+    status = serializers.ChoiceField(
+        choices=PostStatus.choices, default=PostStatus.PUBLISHED
+    )
+    publish_at = serializers.DateTimeField(required=False, allow_null=True)
+    tags = TagListField(required=False)
+    category = serializers.CharField(max_length=100, required=False, allow_null=True)
+    comments = CommentImportSerializer(many=True, required=False)
+
+    def validate(self, attrs):
+        """
+        Require publish_at for scheduled posts.
+        """
+        if attrs["status"] == PostStatus.SCHEDULED and not attrs.get("publish_at"):
+            raise serializers.ValidationError(
+                {"publish_at": ["Scheduled posts need a publish_at time."]}
+            )
+        return attrs
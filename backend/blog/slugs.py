@@ -0,0 +1,178 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.text import slugify
+
+from .models import Post, PostSlugHistory
+
+SLUG_MAX_LENGTH = 220
+
+
+def slug_base(title):
+    """
+    Return the slug a title maps to before any de-duplicating suffix.
+    """
+    return slugify(title)[:SLUG_MAX_LENGTH].strip("-") or "post"
+
+
+def with_suffix(base, number):
+    suffix = f"-{number}"
+    return base[: SLUG_MAX_LENGTH - len(suffix)].rstrip("-") + suffix
+
+
+def _taken(lookup, post=None):
+    """
+    Return the slugs matching `lookup` that belong to another post,
+    either as its current slug or in its slug history.
+    """
+    # Deleted posts keep their slugs (the column is unique) until archived.
+    current = Post.all_objects.filter(**lookup)
+    history = PostSlugHistory.objects.filter(**lookup)
+    if post is not None:
+        current = current.exclude(pk=post.pk)
+        history = history.exclude(post=post)
+    return set(current.values_list("slug", flat=True)) | set(
+        history.values_list("slug", flat=True)
+    )
+
+
+def _unique(base, taken, post=None):
+    """
+    Return `base`, or `base` with the lowest free "-N" suffix.
+
+    `taken` is extended with every suffixed slug on the first collision.
+    """
+    if base not in taken:
+        return base
+    # with_suffix() trims long bases, so match on a prefix that survives.
+    taken |= _taken({"slug__startswith": base[: SLUG_MAX_LENGTH - 10]}, post)
+    number = 2
+    while with_suffix(base, number) in taken:
+        number += 1
+    return with_suffix(base, number)
+
+
+def assign_slugs(posts):
+    """
+    Set a unique slug on each of `posts` (unsaved) from its title.
+
+    Costs two queries for the whole list, plus two per colliding title.
+    Slugs in the history stay reserved so old URLs keep redirecting.
+    A concurrent writer can still take a slug first; the unique index then
+    rejects the insert.
+    """
+    bases = [slug_base(post.title) for post in posts]
+    taken = _taken({"slug__in": set(bases)})
+    for post, base in zip(posts, bases):
+        post.slug = _unique(base, taken)
+        taken.add(post.slug)
+
+
+def rename_slug(post, title):
+    """
+    Return the slug for `post` renamed to `title`, keeping its old slug.
+
+    The current slug moves to the history so it redirects to the new one,
+    and is dropped from the slug caches. Call before saving the new title.
+    """
+    base = slug_base(title)
+    if base == post.slug:
+        return base
+    slug = _unique(base, _taken({"slug": base}, post), post)
+    if slug == post.slug:
+        return slug
+    with transaction.atomic():
+        # Taking back one of its own earlier slugs removes it from history.
+        PostSlugHistory.objects.filter(slug=slug, post=post).delete()
+        if post.slug:
+            PostSlugHistory.objects.update_or_create(
+                slug=post.slug, defaults={"post": post}
+            )
+    forget_slug(post.slug)
+    return slug
+
+
+class LocalSlugCache:
+    """
+    Thread-safe, size-bounded LRU of slug -> post id for this process.
+
+    Entries expire after SLUG_LOCAL_CACHE_SECONDS, which bounds how long
+    another process's rename goes unnoticed here.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, slug):
+        with self._lock:
+            entry = self._entries.get(slug)
+            if entry is None:
+                return None
+            post_id, expires = entry
+            if expires < time.monotonic():
+                del self._entries[slug]
+                return None
+            self._entries.move_to_end(slug)
+            return post_id
+
+    def set(self, slug, post_id):
+        expires = time.monotonic() + settings.SLUG_LOCAL_CACHE_SECONDS
+        with self._lock:
+            self._entries[slug] = (post_id, expires)
+            self._entries.move_to_end(slug)
+            while len(self._entries) > settings.SLUG_LOCAL_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def delete(self, slug):
+        with self._lock:
+            self._entries.pop(slug, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+local_slugs = LocalSlugCache()
+
+
+def _slug_key(slug):
+    return f"blog:slug:{slug}"
+
+
+def forget_slug(slug):
+    """
+    Drop a slug from the local LRU and the shared cache.
+    """
+    local_slugs.delete(slug)
+    caches[settings.BLOG_CACHE_ALIAS].delete(_slug_key(slug))
+
+
+def resolve_slug(slug):
+    """
+    Map a slug to (post id, None), or (post id, current slug) for an old slug.
+
+    Returns (None, None) for unknown slugs. Current slugs are served from
+    the local LRU, then the shared cache, and only then the database.
+    """
+    post_id = local_slugs.get(slug)
+    if post_id is not None:
+        return post_id, None
+    cache = caches[settings.BLOG_CACHE_ALIAS]
+    post_id = cache.get(_slug_key(slug))
+    if post_id is None:
+        post_id = Post.objects.filter(slug=slug).values_list("id", flat=True).first()
+        if post_id is None:
+            moved = (
+                PostSlugHistory.objects.filter(slug=slug, post__deleted_at__isnull=True)
+                .values_list("post_id", "post__slug")
+                .first()
+            )
+            return moved if moved is not None else (None, None)
+        cache.set(_slug_key(slug), post_id, settings.BLOG_CACHE_TIMEOUT)
+    local_slugs.set(slug, post_id)
+    return post_id, None
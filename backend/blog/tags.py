@@ -0,0 +1,133 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Prefetch
+
+from .counters import recount_tags
+from .models import Category, PostStatus, PostTag, Tag
+
+
+def normalize_tags(names):
+    """
+    Strip and lower-case tag names, dropping blanks and duplicates in order.
+    """
+    normalized = []
+    for name in names:
+        name = name.strip().lower()
+        if name and name not in normalized:
+            normalized.append(name)
+    return normalized
+
+
+def upsert_tags(names):
+    """
+    Return Tag rows for `names`, creating the missing ones.
+
+    One INSERT ... ON CONFLICT (name) DO UPDATE ... RETURNING for any number
+    of names, so existing and new tags come back with their ids.
+    """
+    return Tag.objects.bulk_create(
+        [Tag(name=name) for name in names],
+        update_conflicts=True,
+        unique_fields=["name"],
+        update_fields=["name"],
+    )
+
+
+def upsert_categories(names):
+    """
+    Return Category rows for `names`, creating the missing ones, as upsert_tags.
+    """
+    return Category.objects.bulk_create(
+        [Category(name=name) for name in names],
+        update_conflicts=True,
+        unique_fields=["name"],
+        update_fields=["name"],
+    )
+
+
+def set_post_tags(post, names, created=False):
+    """
+    Make `names` the tags of `post`, keeping Tag.post_count up to date.
+
+    Pass created=True for a new post to skip reading its current tags.
+    Unpublished posts do not count towards post_count.
+    """
+    counted = post.status == PostStatus.PUBLISHED
+    names = normalize_tags(names)
+    current = {}
+    if not created:
+        current = dict(
+            PostTag.objects.filter(post=post).values_list("tag__name", "tag_id")
+        )
+    added = [name for name in names if name not in current]
+    removed = [tag_id for name, tag_id in current.items() if name not in names]
+    with transaction.atomic():
+        if added:
+            tag_ids = [tag.pk for tag in upsert_tags(added)]
+            PostTag.objects.bulk_create(
+                [PostTag(post=post, tag_id=tag_id) for tag_id in tag_ids],
+                ignore_conflicts=True,
+            )
+            if counted:
+                Tag.objects.filter(pk__in=tag_ids).update(
+                    post_count=F("post_count") + 1
+                )
+        if removed:
+            PostTag.objects.filter(post=post, tag_id__in=removed).delete()
+            if counted:
+                Tag.objects.filter(pk__in=removed).update(
+                    post_count=F("post_count") - 1
+                )
+
+
+def release_post_tags(post):
+    """
+    Decrement the post counts of a post's tags before the post is deleted.
+    """
+    if post.status == PostStatus.PUBLISHED:
+        Tag.objects.filter(post_links__post=post).update(post_count=F("post_count") - 1)
+
+
+def recount_post_tags(post_ids):
+    """
+    Recount the tags of posts that were just published or unpublished.
+    """
+    recount_tags(Tag.objects.filter(post_links__post_id__in=post_ids))
+
+
+def with_tags(queryset):
+    """
+    Prefetch post tags (names only) in one query for the whole queryset.
+    """
+    return queryset.prefetch_related(
+        Prefetch("tags", queryset=Tag.objects.only("id", "name"))
+    )
+
+
+def filter_by_tags(queryset, names):
+    """
+    Restrict a Post queryset to posts carrying every one of `names`.
+
+    Names are resolved to ids up front so each tag adds one join on the
+    (tag, post) index rather than a join through the Tag table.
+    """
+    names = normalize_tags(names)[: settings.POST_MAX_TAGS]
+    tag_ids = list(Tag.objects.filter(name__in=names).values_list("id", flat=True))
+    if len(tag_ids) < len(names):
+        return queryset.none()
+    for tag_id in tag_ids:
+        queryset = queryset.filter(tag_links__tag_id=tag_id)
+    return queryset
+
+
+def tag_cloud(limit):
+    """
+    Return the `limit` most used tags as {"name", "post_count"} dicts.
+
+    Read from the (-post_count, name) index; no GROUP BY over PostTag.
+    """
+    return list(
+        Tag.objects.filter(post_count__gt=0)
+        .order_by("-post_count", "name")
+        .values("name", "post_count")[:limit]
+    )
@@ -0,0 +1,52 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from blog.cache import stats
+from blog.events import reset_broker
+from blog.metrics import registry
+from blog.models import Author
+from blog.slugs import local_slugs
+from blog.viewcounts import buffer as view_buffer
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    stats.reset()
+    registry.reset()
+    reset_broker()
+    view_buffer.reset()
+    local_slugs.clear()
+    yield
+    cache.clear()
+    reset_broker()
+
+
+@pytest.fixture
+def make_auth_client():
+    """
+    Create a user with an author profile and return (client, user), the
+    client carrying the user's access token.
+    """
+
+    def make(username="testuser", password="testpass123"):
+        user = User.objects.create_user(username=username, password=password)
+        Author.objects.create(user=user)
+        client = APIClient()
+        response = client.post(
+            "/api/token/", {"username": username, "password": password}
+        )
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        return client, user
+
+    return make
+
+
+@pytest.fixture
+def auth_client(make_auth_client):
+    """
+    (client, user) for a logged-in "testuser".
+    """
+    return make_auth_client()
@@ -0,0 +1,57 @@
+import pytest
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+
+from blog.models import Comment, Post
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_post_list_matches_sync(auth_client):
+    client, user = auth_client
+    for i in range(3):
+        Post.objects.create(author=user.author, title=f"Post {i}", content="Body")
+    sync = client.get("/posts/", {"page_size": 2})
+    response = client.get("/async/posts/", {"page_size": 2})
+    assert response.status_code == 200
+    assert response.json()["results"] == sync.json()["results"]
+    assert response.json()["next"].startswith("http://testserver/async/posts/")
+
+    etag = response["ETag"]
+    response = client.get("/async/posts/", {"page_size": 2}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_post_detail_and_comments(auth_client):
+    client, user = auth_client
+    post = Post.objects.create(author=user.author, title="Detail", content="Body")
+    comment = Comment.objects.create(post=post, author=user.author, content="Hi")
+    Comment.objects.create(post=post, author=user.author, content="Yo", parent=comment)
+    response = client.get(f"/async/posts/{post.id}/")
+    assert response.json()["title"] == "Detail"
+    response = client.get(f"/async/posts/{post.id}/comments/")
+    assert [c["content"] for c in response.json()] == ["Hi"]
+    assert response.json()[0]["replies"][0]["content"] == "Yo"
+    response = client.get(f"/async/posts/{post.id}/comments/", {"parent": comment.id})
+    assert response.json()["replies"][0]["content"] == "Yo"
+    assert client.get("/async/posts/999/").status_code == 404
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_views_without_author_claim(auth_client):
+    client, user = auth_client
+    post = Post.objects.create(author=user.author, title="Public", content="Body")
+    User.objects.create_superuser(username="admin", password="adminpass123")
+    response = client.post(
+        "/api/token/", {"username": "admin", "password": "adminpass123"}
+    )
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+    assert client.get(f"/async/posts/{post.id}/").status_code == 200
+    assert client.get(f"/async/posts/{post.id}/comments/").status_code == 200
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_views_require_authentication():
+    response = APIClient().get("/async/posts/")
+    assert response.status_code == 401
+    assert response.has_header("WWW-Authenticate")
@@ -0,0 +1,54 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Author, Post
+
+
+def auth_queries(queries):
+    return [
+        q["sql"]
+        for q in queries.captured_queries
+        if '"auth_user"' in q["sql"] or '"blog_author"' in q["sql"]
+    ]
+
+
+@pytest.mark.django_db
+def test_create_post_runs_no_auth_queries(auth_client):
+    client, user = auth_client
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post("/posts/", {"title": "Fast", "content": "Body"})
+    assert response.status_code == 201
+    assert response.data["author"] == user.author.id
+    assert auth_queries(queries) == []
+
+
+@pytest.mark.django_db
+def test_add_comment_runs_no_auth_queries(auth_client):
+    client, user = auth_client
+    post = Post.objects.create(author=user.author, title="Post", content="Body")
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(f"/posts/{post.id}/comments/", {"content": "Hi"})
+    assert response.status_code == 201
+    assert response.data["author"] == user.author.id
+    assert auth_queries(queries) == []
+
+
+@pytest.mark.django_db
+def test_update_other_authors_post_is_forbidden(auth_client):
+    client, user = auth_client
+    other = User.objects.create_user(username="other", password="otherpass123")
+    post = Post.objects.create(
+        author=Author.objects.create(user=other), title="Theirs", content="Body"
+    )
+    response = client.put(f"/posts/{post.id}/", {"title": "Mine", "content": "x"})
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_get_author_profile_from_token(auth_client):
+    client, user = auth_client
+    response = client.get("/author/")
+    assert response.status_code == 200
+    assert response.data["id"] == user.author.id
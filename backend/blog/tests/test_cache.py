@@ -0,0 +1,37 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.cache import stats
+from blog.models import Post
+
+
+@pytest.mark.django_db
+def test_post_detail_served_from_cache(auth_client):
+    client, user = auth_client
+    post = Post.objects.create(author=user.author, title="Cached", content="Body")
+    client.get(f"/posts/{post.id}/")
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f"/posts/{post.id}/")
+    assert response.data["title"] == "Cached"
+    assert not any("blog_post" in q["sql"] for q in queries.captured_queries)
+    assert stats.snapshot()["hits"] == 1
+
+
+@pytest.mark.django_db
+def test_post_update_invalidates_cache(auth_client):
+    client, user = auth_client
+    post = Post.objects.create(author=user.author, title="Before", content="Body")
+    client.get(f"/posts/{post.id}/")
+    client.get("/posts/")
+    client.put(f"/posts/{post.id}/", {"title": "After", "content": "Body"})
+    assert client.get(f"/posts/{post.id}/").data["title"] == "After"
+    assert client.get("/posts/").data[0]["title"] == "After"
+
+
+@pytest.mark.django_db
+def test_post_create_invalidates_list_cache(auth_client):
+    client, user = auth_client
+    assert client.get("/posts/").data == []
+    client.post("/posts/", {"title": "New", "content": "Body"})
+    assert len(client.get("/posts/").data) == 1
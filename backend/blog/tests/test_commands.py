@@ -0,0 +1,255 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog import cache as post_cache
+from blog.models import (
+    ArchivedComment,
+    ArchivedPost,
+    Author,
+    Category,
+    Comment,
+    FeedEntry,
+    Follow,
+    Post,
+    PostStatus,
+    Tag,
+)
+from blog.rendering import RENDER_VERSION
+from blog.tags import set_post_tags
+
+
+@pytest.mark.django_db
+def create_authors():
+    alice = Author.objects.create(user=User.objects.create_user(username="alice"))
+    bob = Author.objects.create(user=User.objects.create_user(username="bob"))
+    return alice, bob
+
+
+@pytest.mark.django_db
+def test_import_posts(tmp_path):
+    alice, bob = create_authors()
+    rows = [
+        {
+            "author": "alice",
+            "title": "First",
+            "content": "Body",
+            "created_at": "2020-01-01T00:00:00Z",
+            "comments": [{"author": "bob", "content": "Nice"}],
+        },
+        {"author": "bob", "title": "Second", "content": "Body"},
+        {"author": "nobody", "title": "Orphan", "content": "Body"},
+        {"author": "alice", "title": "First", "content": "Duplicate"},
+        {"author": "alice", "content": "No title"},
+    ]
+    path = tmp_path / "posts.ndjson"
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\nnot json\n")
+
+    out, err = StringIO(), StringIO()
+    call_command("import_posts", str(path), "--batch-size", "2", stdout=out, stderr=err)
+
+    assert set(Post.objects.values_list("title", flat=True)) == {"First", "Second"}
+    first = Post.objects.get(title="First")
+    assert first.created_at.year == 2020
+    assert first.comments.get().author == bob
+    assert first.comment_count == 1
+    assert "skipped 4 rows" in out.getvalue()
+    assert "rows/sec" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_import_posts_resolves_reply_authors(tmp_path):
+    alice, bob = create_authors()
+    carol = Author.objects.create(user=User.objects.create_user(username="carol"))
+    reply = {"author": "carol", "content": "Agreed"}
+    rows = [
+        {
+            "author": "alice",
+            "title": "Thread",
+            "content": "Body",
+            "comments": [{"author": "bob", "content": "Nice", "replies": [reply]}],
+        },
+        {
+            "author": "alice",
+            "title": "Stranger",
+            "content": "Body",
+            "comments": [
+                {
+                    "author": "bob",
+                    "content": "Nice",
+                    "replies": [{"author": "nobody", "content": "Hi"}],
+                }
+            ],
+        },
+    ]
+    path = tmp_path / "posts.ndjson"
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n")
+
+    out, err = StringIO(), StringIO()
+    call_command("import_posts", str(path), stdout=out, stderr=err)
+
+    post = Post.objects.get()
+    assert post.title == "Thread"
+    assert post.comments.get(depth=1).author == carol
+    assert "unknown authors ['nobody']" in err.getvalue()
+    assert "skipped 1 rows" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_export_import_round_trip(tmp_path):
+    alice, bob = create_authors()
+    category = Category.objects.create(name="Notes")
+    post = Post.objects.create(
+        author=alice, title="Exported", content="Body", category=category
+    )
+    set_post_tags(post, ["django", "python"], created=True)
+    comment = Comment.objects.create(post=post, author=bob, content="Reply")
+    Comment.objects.create(post=post, author=alice, content="Thanks", parent=comment)
+    Post.objects.create(
+        author=bob, title="Unfinished", content="Body", status=PostStatus.DRAFT
+    )
+    path = tmp_path / "posts.ndjson"
+
+    call_command("export_posts", str(path), "--chunk-size", "1", stdout=StringIO())
+    row = json.loads(path.read_text().splitlines()[0])
+    assert row["author"] == "alice"
+    assert row["comments"][0]["author"] == "bob"
+    assert (row["tags"], row["category"]) == (["django", "python"], "Notes")
+
+    Post.objects.all().delete()
+    Tag.objects.all().delete()
+    Category.objects.all().delete()
+    call_command("import_posts", str(path), stdout=StringIO())
+    imported = Post.objects.get(title="Exported")
+    assert imported.category.name == "Notes"
+    assert sorted(imported.tags.values_list("name", flat=True)) == [
+        "django",
+        "python",
+    ]
+    assert set(Tag.objects.values_list("post_count", flat=True)) == {1}
+    assert imported.created_at == post.created_at
+    top = imported.comments.get(parent=None)
+    assert (top.content, top.reply_count) == ("Reply", 1)
+    reply = top.replies.get()
+    assert (reply.content, reply.depth) == ("Thanks", 1)
+    assert reply.path.startswith(top.path)
+    assert imported.publish_at == post.created_at
+    draft = Post.objects.get(title="Unfinished")
+    assert (draft.status, draft.publish_at) == (PostStatus.DRAFT, None)
+
+
+@pytest.mark.django_db
+def test_recount_comments():
+    alice, bob = create_authors()
+    post = Post.objects.create(author=alice, title="Drifted", content="Body")
+    empty = Post.objects.create(author=alice, title="Empty", content="Body")
+    comment = Comment.objects.create(post=post, author=bob, content="Reply")
+    Post.objects.filter(pk=empty.pk).update(comment_count=7)
+
+    call_command("recount_comments", "--batch-size", "1", stdout=StringIO())
+
+    post.refresh_from_db()
+    empty.refresh_from_db()
+    assert (post.comment_count, post.last_comment_at) == (1, comment.created_at)
+    assert (empty.comment_count, empty.last_comment_at) == (0, None)
+
+
+@pytest.mark.django_db
+def test_rerender_posts_stale():
+    alice, bob = create_authors()
+    stale = Post.objects.create(author=alice, title="Stale", content="*New*")
+    current = Post.objects.create(
+        author=alice,
+        title="Current",
+        content="Body",
+        content_html="<p>kept</p>",
+        render_version=RENDER_VERSION,
+    )
+    post_cache.set_post(stale.pk, "variant", ({}, {"content_html": "<p>old</p>"}))
+    rendered_at = stale.updated_at
+
+    call_command(
+        "rerender_posts",
+        "--workers",
+        "1",
+        "--batch-size",
+        "1",
+        "--stale",
+        stdout=StringIO(),
+    )
+
+    stale.refresh_from_db()
+    current.refresh_from_db()
+    assert (stale.content_html, stale.excerpt) == ("<p><em>New</em></p>", "New")
+    assert stale.render_version == RENDER_VERSION
+    assert stale.updated_at > rendered_at
+    assert post_cache.get_post(stale.pk, "variant") is None
+    assert current.content_html == "<p>kept</p>"
+
+
+@pytest.mark.django_db
+def test_archive_posts():
+    alice, bob = create_authors()
+    old = Post.objects.create(author=alice, title="Old", content="Body")
+    recent = Post.objects.create(author=alice, title="Recent", content="Body")
+    top = Comment.objects.create(post=old, author=bob, content="Top")
+    reply = Comment.objects.create(post=old, author=alice, content="Re", parent=top)
+    Comment.objects.create(post=old, author=bob, content="Re re", parent=reply)
+    Comment.objects.create(post=recent, author=bob, content="Kept")
+    FeedEntry.objects.create(owner=bob, post=old, created_at=old.created_at)
+    Post.objects.filter(pk=old.pk).soft_delete()
+    Post.all_objects.filter(pk=old.pk).update(
+        deleted_at=timezone.now() - timedelta(days=40)
+    )
+    Post.objects.filter(pk=recent.pk).soft_delete()
+
+    out = StringIO()
+    call_command("archive_posts", "--older-than", "30", "--batch-size", "2", stdout=out)
+
+    assert "Archived 1 posts and 3 comments." in out.getvalue()
+    assert list(Post.all_objects.values_list("title", flat=True)) == ["Recent"]
+    assert Comment.objects.get().content == "Kept"
+    assert not FeedEntry.objects.exists()
+    assert ArchivedPost.objects.get().slug == "old"
+    archived = ArchivedComment.objects.order_by("id")
+    assert [(c.content, c.parent_id) for c in archived] == [
+        ("Top", None),
+        ("Re", top.pk),
+        ("Re re", reply.pk),
+    ]
+
+
+@pytest.mark.django_db
+def test_publish_scheduled():
+    alice, bob = create_authors()
+    Follow.objects.create(follower=bob, followee=alice)
+    now = timezone.now()
+    due = Post.objects.create(
+        author=alice,
+        title="Due",
+        content="Body",
+        status=PostStatus.SCHEDULED,
+        publish_at=now - timedelta(minutes=1),
+    )
+    Post.objects.create(
+        author=alice,
+        title="Not yet",
+        content="Body",
+        status=PostStatus.SCHEDULED,
+        publish_at=now + timedelta(hours=1),
+    )
+
+    out = StringIO()
+    call_command("publish_scheduled", "--batch-size", "1", stdout=out)
+
+    assert "Published 1 scheduled posts." in out.getvalue()
+    due.refresh_from_db()
+    assert due.status == PostStatus.PUBLISHED
+    assert due.created_at == due.publish_at
+    assert list(Post.objects.published().values_list("title", flat=True)) == ["Due"]
+    assert FeedEntry.objects.get(owner=bob).post == due
@@ -2,7 +2,7 @@ import pytest
 from django.contrib.auth.models import User
 from rest_framework.test import APIClient
 
-from blog.models import Author, Post
+from blog.models import Author, Comment, Post
 
 
 @pytest.mark.django_db
@@ -26,3 +26,132 @@ def test_add_comment():
     response = client.post(f"/posts/{post.id}/comments/", data)
     assert response.status_code == 201
     assert post.comments.count() == 1
+
+
+@pytest.mark.django_db
+def test_list_comments_cursor_pagination():
+    client, post, author = create_user_post()
+    for i in range(3):
+        Comment.objects.create(post=post, author=author, content=f"Comment {i}")
+    response = client.get(f"/posts/{post.id}/comments/", {"page_size": 2})
+    assert response.status_code == 200
+    assert [c["content"] for c in response.data["results"]] == [
+        "Comment 0",
+        "Comment 1",
+    ]
+    response = client.get(response.data["next"])
+    assert [c["content"] for c in response.data["results"]] == ["Comment 2"]
+    assert response.data["next"] is None
+
+
+@pytest.mark.django_db
+def test_list_comments_conditional_get():
+    client, post, author = create_user_post()
+    response = client.get(f"/posts/{post.id}/comments/")
+    etag = response["ETag"]
+    response = client.get(f"/posts/{post.id}/comments/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    client.post(f"/posts/{post.id}/comments/", {"content": "New"})
+    response = client.get(f"/posts/{post.id}/comments/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_add_comment_updates_post_counters():
+    client, post, author = create_user_post()
+    client.post(f"/posts/{post.id}/comments/", {"content": "One"})
+    client.post(f"/posts/{post.id}/comments/", {"content": "Two"})
+    post.refresh_from_db()
+    assert post.comment_count == 2
+    assert post.last_comment_at == post.comments.latest("created_at").created_at
+
+    response = client.get(f"/posts/{post.id}/")
+    assert response.data["comment_count"] == 2
+    response = client.get("/posts/active/")
+    assert [p["id"] for p in response.data] == [post.id]
+
+
+@pytest.mark.django_db
+def test_reply_threads_are_nested():
+    client, post, author = create_user_post()
+    root = client.post(f"/posts/{post.id}/comments/", {"content": "Root"}).data
+    reply = client.post(
+        f"/posts/{post.id}/comments/", {"content": "Reply", "parent": root["id"]}
+    ).data
+    client.post(
+        f"/posts/{post.id}/comments/", {"content": "Deep", "parent": reply["id"]}
+    )
+    client.post(f"/posts/{post.id}/comments/", {"content": "Other"})
+
+    response = client.get(f"/posts/{post.id}/comments/")
+    assert [c["content"] for c in response.data] == ["Root", "Other"]
+    [reply_node] = response.data[0]["replies"]
+    assert (reply_node["content"], reply_node["depth"]) == ("Reply", 1)
+    assert reply_node["replies"][0]["content"] == "Deep"
+    assert response.data[0]["reply_count"] == 1
+    post.refresh_from_db()
+    assert post.comment_count == 4
+
+    response = client.get(f"/posts/{post.id}/comments/", {"depth": 1})
+    assert response.data[0]["replies"][0]["replies"] == []
+
+    response = client.get(f"/posts/{post.id}/comments/", {"parent": reply["id"]})
+    assert response.data["content"] == "Reply"
+    assert [c["content"] for c in response.data["replies"]] == ["Deep"]
+
+
+@pytest.mark.django_db
+def test_deep_threads_cost_the_same_queries(django_assert_num_queries):
+    client, post, author = create_user_post()
+    shallow = Comment.objects.create(post=post, author=author, content="Shallow")
+    # Post state for the ETag, one page of comments, then all of their replies.
+    with django_assert_num_queries(3):
+        client.get(f"/posts/{post.id}/comments/", {"page_size": 10})
+
+    parent = shallow
+    for i in range(6):
+        parent = Comment.objects.create(
+            post=post, author=author, content=f"Level {i}", parent=parent
+        )
+    with django_assert_num_queries(3):
+        response = client.get(f"/posts/{post.id}/comments/", {"page_size": 10})
+    node = response.data["results"][0]
+    for _ in range(6):
+        [node] = node["replies"]
+    assert node["content"] == "Level 5"
+
+
+@pytest.mark.django_db
+def test_reply_cap_applies_per_comment(settings):
+    settings.COMMENT_TREE_MAX_REPLIES = 2
+    client, post, author = create_user_post()
+    busy = Comment.objects.create(post=post, author=author, content="Busy")
+    quiet = Comment.objects.create(post=post, author=author, content="Quiet")
+    for i in range(3):
+        Comment.objects.create(post=post, author=author, content=f"R{i}", parent=busy)
+    Comment.objects.create(post=post, author=author, content="Answer", parent=quiet)
+
+    response = client.get(f"/posts/{post.id}/comments/")
+    busy_node, quiet_node = response.data
+    assert [c["content"] for c in busy_node["replies"]] == ["R0", "R1"]
+    assert [c["content"] for c in quiet_node["replies"]] == ["Answer"]
+
+
+@pytest.mark.django_db
+def test_reply_validation(settings):
+    client, post, author = create_user_post()
+    other = Post.objects.create(author=author, title="Other", content="Body")
+    foreign = Comment.objects.create(post=other, author=author, content="Elsewhere")
+    response = client.post(
+        f"/posts/{post.id}/comments/", {"content": "Hi", "parent": foreign.id}
+    )
+    assert response.status_code == 400
+
+    settings.COMMENT_MAX_DEPTH = 1
+    root = Comment.objects.create(post=post, author=author, content="Root")
+    reply = Comment.objects.create(post=post, author=author, content="R", parent=root)
+    response = client.post(
+        f"/posts/{post.id}/comments/", {"content": "Too deep", "parent": reply.id}
+    )
+    assert response.status_code == 400
+    assert post.comments.count() == 2
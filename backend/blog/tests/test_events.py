@@ -0,0 +1,72 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from blog.events import get_broker, publish_comment
+from blog.models import Comment, Post
+
+
+@pytest.mark.django_db
+def test_new_comment_is_published(
+    settings, django_capture_on_commit_callbacks, auth_client
+):
+    settings.EVENTS_BACKEND = "blog.events.RecordingBackend"
+    client, user = auth_client
+    post = Post.objects.create(author=user.author, title="Live", content="Body")
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(f"/posts/{post.id}/comments/", {"content": "Hi"})
+    assert response.status_code == 201
+    [(channel, message)] = get_broker().backend.published
+    assert channel == f"comments:{post.id}"
+    assert message["id"] == response.data["id"]
+    assert json.loads(message["data"])["content"] == "Hi"
+
+    # Streaming needs the ASGI handler; the WSGI test client is refused.
+    response = client.get(f"/posts/{post.id}/comments/stream/")
+    assert response.status_code == 501
+
+
+@pytest.mark.django_db(transaction=True)
+def test_comment_stream_replays_and_pushes(settings, auth_client):
+    settings.EVENTS_HEARTBEAT_SECONDS = 0.05
+    client, user = auth_client
+    token = client.post(
+        "/api/token/", {"username": "testuser", "password": "testpass123"}
+    ).data["access"]
+    post = Post.objects.create(author=user.author, title="Live", content="Body")
+    seen = Comment.objects.create(post=post, author=user.author, content="Seen")
+    missed = Comment.objects.create(post=post, author=user.author, content="Missed")
+
+    async def read_stream():
+        response = await AsyncClient().get(
+            f"/posts/{post.id}/comments/stream/",
+            {"token": token},
+            headers={"Last-Event-ID": str(seen.id)},
+        )
+        assert response["Content-Type"] == "text/event-stream"
+        stream = aiter(response.streaming_content)
+        frames = [await anext(stream)]
+        publish_comment(missed.id + 1, post.id, {"content": "Live"})
+        frames += [await anext(stream), await anext(stream)]
+        assert get_broker().subscriber_count(f"comments:{post.id}") == 1
+        await stream.aclose()
+        return [frame.decode() for frame in frames]
+
+    replayed, live, keepalive = async_to_sync(read_stream)()
+    assert replayed.startswith(f"id: {missed.id}\nevent: comment\n")
+    assert json.loads(replayed.split("data: ")[1])["content"] == "Missed"
+    assert (
+        live == f'id: {missed.id + 1}\nevent: comment\ndata: {{"content": "Live"}}\n\n'
+    )
+    assert keepalive == ": keepalive\n\n"
+    assert get_broker().subscriber_count() == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_comment_stream_requires_authentication():
+    async def open_stream():
+        return await AsyncClient().get("/posts/1/comments/stream/")
+
+    assert async_to_sync(open_stream)().status_code == 401
@@ -0,0 +1,88 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import FeedEntry, Post
+
+
+@pytest.mark.django_db
+def test_follow_fans_out_new_posts(make_auth_client):
+    reader, reader_user = make_auth_client("reader")
+    writer, writer_user = make_auth_client("writer")
+    old = Post.objects.create(author=writer_user.author, title="Old", content="Old")
+
+    response = reader.post(f"/authors/{writer_user.author.pk}/follow/")
+    assert response.status_code == 201
+    assert reader.post(f"/authors/{writer_user.author.pk}/follow/").status_code == 200
+    writer_user.author.refresh_from_db()
+    assert writer_user.author.follower_count == 1
+
+    response = writer.post("/posts/", {"title": "New", "content": "New post"})
+    assert response.status_code == 201
+    response = reader.get("/feed/")
+    assert response.status_code == 200
+    assert [post["title"] for post in response.data["results"]] == ["New", "Old"]
+    assert FeedEntry.objects.filter(owner=reader_user.author).count() == 2
+    assert old.pk in [post["id"] for post in response.data["results"]]
+
+    response = reader.delete(f"/authors/{writer_user.author.pk}/follow/")
+    assert response.status_code == 204
+    assert reader.get("/feed/").data["results"] == []
+    assert reader.delete(f"/authors/{writer_user.author.pk}/follow/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_follow_self_rejected(auth_client):
+    client, user = auth_client
+    response = client.post(f"/authors/{user.author.pk}/follow/")
+    assert response.status_code == 400
+    assert client.post("/authors/999999/follow/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_feed_merges_pulled_authors(settings, make_auth_client):
+    settings.FEED_FANOUT_MAX_FOLLOWERS = 1
+    reader, reader_user = make_auth_client("reader")
+    other, other_user = make_auth_client("other")
+    popular, popular_user = make_auth_client("popular")
+    regular, regular_user = make_auth_client("regular")
+    reader.post(f"/authors/{regular_user.author.pk}/follow/")
+    other.post(f"/authors/{popular_user.author.pk}/follow/")
+    reader.post(f"/authors/{popular_user.author.pk}/follow/")
+    popular_user.author.refresh_from_db()
+    assert popular_user.author.pulled_into_feeds
+
+    titles = []
+    for i in range(3):
+        for client, name in ((popular, "popular"), (regular, "regular")):
+            title = f"{name} {i}"
+            client.post("/posts/", {"title": title, "content": "Body"})
+            titles.insert(0, title)
+    assert not FeedEntry.objects.filter(post__author=popular_user.author).exists()
+
+    with CaptureQueriesContext(connection) as queries:
+        response = reader.get("/feed/", {"page_size": 4})
+    # Pulled author ids, timeline page, pulled authors' page, posts, tags.
+    assert len(queries) == 5
+    seen = [post["title"] for post in response.data["results"]]
+    response = reader.get(response.data["next"])
+    seen += [post["title"] for post in response.data["results"]]
+    assert seen == titles
+    assert response.data["next"] is None
+
+
+@pytest.mark.django_db
+def test_trim_feeds(make_auth_client):
+    reader, reader_user = make_auth_client("reader")
+    writer, writer_user = make_auth_client("writer")
+    reader.post(f"/authors/{writer_user.author.pk}/follow/")
+    for i in range(5):
+        writer.post("/posts/", {"title": f"Post {i}", "content": "Body"})
+
+    call_command("trim_feeds", "--max-length", "2", stdout=StringIO())
+
+    kept = FeedEntry.objects.filter(owner=reader_user.author)
+    assert sorted(kept.values_list("post__title", flat=True)) == ["Post 3", "Post 4"]
@@ -0,0 +1,66 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from blog.models import Post
+
+
+@pytest.fixture(autouse=True)
+def media_settings(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.IMAGE_RENDITION_EAGER = True
+    settings.IMAGE_RENDITION_WIDTHS = [100, 200, 800]
+    settings.IMAGE_RENDITION_FORMATS = ["webp", "jpeg"]
+
+
+def make_upload(name="photo.jpg", size=(400, 300)):
+    buffer = BytesIO()
+    exif = Image.Exif()
+    exif[0x010F] = "Camera Maker"
+    Image.new("RGB", size, "red").save(buffer, "JPEG", exif=exif)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+
+@pytest.mark.django_db
+def test_post_image_renditions(django_capture_on_commit_callbacks, auth_client):
+    client, user = auth_client
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(
+            "/posts/",
+            {"title": "Photo", "content": "Body", "image": make_upload()},
+            format="multipart",
+        )
+    assert response.status_code == 201
+
+    post = Post.objects.get(title="Photo")
+    sizes = {(r["format"], r["width"], r["height"]) for r in post.image_renditions}
+    assert sizes == {
+        ("webp", 100, 75),
+        ("webp", 200, 150),
+        ("jpeg", 100, 75),
+        ("jpeg", 200, 150),
+    }
+    for rendition in post.image_renditions:
+        with post.image.storage.open(rendition["name"]) as stored:
+            assert not Image.open(stored).getexif()
+
+    response = client.get(f"/posts/{post.id}/")
+    assert response.data["image_srcset"]["webp"].endswith("200w")
+    assert "100w, " in response.data["image_srcset"]["jpeg"]
+
+
+@pytest.mark.django_db
+def test_profile_picture_renditions(django_capture_on_commit_callbacks, auth_client):
+    client, user = auth_client
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.put(
+            "/author/",
+            {"profile_picture": make_upload("me.jpg", (150, 150))},
+            format="multipart",
+        )
+    assert response.status_code == 200
+    user.author.refresh_from_db()
+    widths = {r["width"] for r in user.author.profile_picture_renditions}
+    assert widths == {100}
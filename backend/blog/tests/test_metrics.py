@@ -0,0 +1,81 @@
+import logging
+
+import pytest
+from rest_framework.test import APIClient
+
+from blog.metrics import Registry, RequestStats, registry
+from blog.models import Comment, Post
+
+
+@pytest.mark.django_db
+def test_metrics_record_requests_and_queries_per_endpoint(auth_client):
+    client, user = auth_client
+    Post.objects.create(author=user.author, title="Post", content="Body")
+    client.get("/posts/")
+    client.get("/posts/")
+
+    response = APIClient().get("/metrics")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+    body = response.content.decode()
+    assert (
+        'blog_http_requests_total{endpoint="post-list",method="GET",status="200"} 2'
+        in body
+    )
+    assert 'blog_http_request_duration_seconds_count{endpoint="post-list"} 2' in body
+    assert registry.queries["post-list"] > 0
+    assert 'blog_db_queries_total{endpoint="token_obtain_pair"}' in body
+    assert 'blog_post_cache_events_total{event="hits"} 1' in body
+
+
+@pytest.mark.django_db
+def test_metrics_count_async_view_queries(auth_client):
+    client, user = auth_client
+    Post.objects.create(author=user.author, title="Post", content="Body")
+    response = client.get("/async/posts/")
+    assert response.status_code == 200
+    assert registry.queries["async_post_list"] > 0
+
+
+@pytest.mark.django_db
+def test_query_threshold_logs_possible_n_plus_one(settings, caplog, auth_client):
+    client, user = auth_client
+    post = Post.objects.create(author=user.author, title="Post", content="Body")
+    Comment.objects.create(post=post, author=user.author, content="Hi")
+
+    settings.METRICS_QUERY_WARNING_THRESHOLD = 0
+    client.get(f"/posts/{post.id}/comments/")
+    assert not caplog.records
+
+    settings.METRICS_QUERY_WARNING_THRESHOLD = 1
+    with caplog.at_level(logging.WARNING, logger="blog.metrics"):
+        client.get(f"/posts/{post.id}/comments/")
+    assert "Possible N+1" in caplog.text
+    assert "post_comments" in caplog.text
+
+
+@pytest.mark.django_db
+def test_metrics_token_required_when_configured(settings):
+    settings.METRICS_TOKEN = "scrape-secret"
+    assert APIClient().get("/metrics").status_code == 401
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer scrape-secret")
+    assert client.get("/metrics").status_code == 200
+
+
+@pytest.mark.django_db
+def test_metrics_sum_all_workers(settings, tmp_path, auth_client):
+    settings.METRICS_DIR = str(tmp_path)
+    other_worker = Registry()
+    other_worker.observe("post-list", "GET", 200, 0.01, RequestStats())
+    other_worker.publish()
+
+    client, user = auth_client
+    client.get("/posts/")
+    body = APIClient().get("/metrics").content.decode()
+    assert len(list(tmp_path.glob("*.json"))) == 2
+    assert (
+        'blog_http_requests_total{endpoint="post-list",method="GET",status="200"} 2'
+        in body
+    )
+    assert 'blog_http_request_duration_seconds_count{endpoint="post-list"} 2' in body
@@ -1,8 +1,13 @@
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
-from blog.models import Author, Post
+from blog.models import Author, Category, Comment, Post, PostStatus, Tag
+from blog.rendering import rendered_fields
+from blog.viewcounts import flush_views
 
 
 @pytest.mark.django_db
@@ -50,6 +55,14 @@ def test_retrieve_post_detail():
     assert response.data["title"] == "Detail Post"
 
 
+@pytest.mark.django_db
+def test_retrieve_post_with_invalid_id():
+    client, user = create_user_and_login()
+    response = client.get("/posts/abc/")
+    assert response.status_code == 404
+    assert response.data["detail"] == "Post not found."
+
+
 @pytest.mark.django_db
 def test_update_post():
     client, user = create_user_and_login()
@@ -61,6 +74,21 @@ def test_update_post():
     assert response.status_code == 200
     post.refresh_from_db()
     assert post.title == "New Title"
+    assert post.content_html == "<p>Updated content</p>"
+
+
+@pytest.mark.django_db
+def test_create_post_renders_markdown():
+    client, user = create_user_and_login()
+    data = {
+        "title": "Rendered",
+        "content": "Some **bold** text.\n\n<script>alert(1)</script>",
+    }
+    response = client.post("/posts/", data)
+    assert response.status_code == 201
+    assert response.data["content_html"].startswith("<p>Some <strong>bold</strong>")
+    assert "<script>" not in response.data["content_html"]
+    assert response.data["excerpt"] == "Some bold text."
 
 
 @pytest.mark.django_db
@@ -72,3 +100,355 @@ def test_delete_post():
     response = client.delete(f"/posts/{post.id}/")
     assert response.status_code == 204
     assert not Post.objects.filter(id=post.id).exists()
+    assert Post.all_objects.get(id=post.id).deleted_at is not None
+    assert client.get(f"/posts/{post.id}/").status_code == 404
+    assert client.get(f"/posts/{post.id}/comments/").status_code == 404
+    # The title is free again; the slug stays reserved until archived.
+    response = client.post("/posts/", {"title": "To Be Deleted", "content": "Back"})
+    assert response.status_code == 201
+    assert response.data["slug"] == "to-be-deleted-2"
+
+
+@pytest.mark.django_db
+def test_list_posts_cursor_pagination():
+    client, user = create_user_and_login()
+    for i in range(5):
+        Post.objects.create(author=user.author, title=f"Post {i}", content="Body")
+    response = client.get("/posts/", {"page_size": 2})
+    assert response.status_code == 200
+    titles = [post["title"] for post in response.data["results"]]
+    assert titles == ["Post 4", "Post 3"]
+
+    seen = list(titles)
+    next_url = response.data["next"]
+    while next_url:
+        response = client.get(next_url)
+        assert len(response.data["results"]) <= 2
+        seen += [post["title"] for post in response.data["results"]]
+        next_url = response.data["next"]
+    assert seen == [f"Post {i}" for i in range(4, -1, -1)]
+
+
+@pytest.mark.django_db
+def test_list_posts_invalid_cursor():
+    client, user = create_user_and_login()
+    response = client.get("/posts/", {"cursor": "not-a-cursor"})
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_retrieve_post_conditional_get():
+    client, user = create_user_and_login()
+    post = Post.objects.create(author=user.author, title="Etag", content="Body")
+    response = client.get(f"/posts/{post.id}/")
+    etag = response["ETag"]
+    assert response.has_header("Last-Modified")
+
+    response = client.get(f"/posts/{post.id}/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    client.put(f"/posts/{post.id}/", {"title": "Etag", "content": "Changed"})
+    response = client.get(f"/posts/{post.id}/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_list_posts_conditional_get():
+    client, user = create_user_and_login()
+    Post.objects.create(author=user.author, title="One", content="Body")
+    etag = client.get("/posts/")["ETag"]
+    assert client.get("/posts/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+    client.post("/posts/", {"title": "Two", "content": "Body"})
+    assert client.get("/posts/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_search_posts_ranks_title_matches_first():
+    client, user = create_user_and_login()
+    Post.objects.create(author=user.author, title="Cooking", content="About django")
+    Post.objects.create(author=user.author, title="Django tips", content="Basics")
+    Post.objects.create(author=user.author, title="Gardening", content="Plants")
+    response = APIClient().get("/posts/search/", {"q": "django"})
+    assert response.status_code == 200
+    assert [post["title"] for post in response.data] == ["Django tips", "Cooking"]
+
+
+@pytest.mark.django_db
+def test_search_posts_follows_updates_and_deletes():
+    client, user = create_user_and_login()
+    post = Post.objects.create(author=user.author, title="Old", content="Body")
+    client.put(f"/posts/{post.id}/", {"title": "Renamed", "content": "Body"})
+    assert client.get("/posts/search/", {"q": "old"}).data == []
+    assert len(client.get("/posts/search/", {"q": "renamed"}).data) == 1
+    client.delete(f"/posts/{post.id}/")
+    assert client.get("/posts/search/", {"q": "renamed"}).data == []
+
+
+@pytest.mark.django_db
+def test_search_posts_limit_skips_hidden_posts():
+    client, user = create_user_and_login()
+    for i in range(2):
+        Post.objects.create(author=user.author, title=f"Post {i}", content="django")
+    for i in range(3):
+        Post.objects.create(
+            author=user.author,
+            title=f"Django draft {i}",
+            content="django",
+            status=PostStatus.DRAFT,
+        )
+    deleted = Post.objects.create(
+        author=user.author, title="Django deleted", content="django"
+    )
+    client.delete(f"/posts/{deleted.id}/")
+    response = client.get("/posts/search/", {"q": "django", "limit": 2})
+    assert sorted(post["title"] for post in response.data) == ["Post 0", "Post 1"]
+
+
+@pytest.mark.django_db
+def test_search_posts_loads_only_rendered_columns():
+    client, user = create_user_and_login()
+    Post.objects.create(author=user.author, title="Django tips", content="Body")
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/posts/search/", {"q": "django", "fields": "id,title"})
+    assert [post["title"] for post in response.data] == ["Django tips"]
+    select = [q["sql"] for q in queries.captured_queries if '"title"' in q["sql"]]
+    assert select and '"content"' not in select[-1]
+
+    response = client.get("/posts/search/", {"q": "django", "view": "summary"})
+    assert "excerpt" in response.data[0] and "content" not in response.data[0]
+
+
+@pytest.mark.django_db
+def test_search_posts_requires_query():
+    response = APIClient().get("/posts/search/")
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_list_posts_sparse_fieldsets():
+    client, user = create_user_and_login()
+    Post.objects.create(author=user.author, title="Sparse", content="Long body")
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/posts/", {"fields": "id,title"})
+    assert response.status_code == 200
+    assert response.data == [{"id": response.data[0]["id"], "title": "Sparse"}]
+    select = [q["sql"] for q in queries.captured_queries if '"title"' in q["sql"]]
+    assert select and '"content"' not in select[0]
+
+    response = client.get("/posts/", {"fields": "title,secret"})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_list_posts_summary_view():
+    client, user = create_user_and_login()
+    body = "word " * 100
+    Post.objects.create(
+        author=user.author, title="Summary", content=body, **rendered_fields(body)
+    )
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/posts/my/", {"view": "summary"})
+    [post] = response.data
+    assert "content" not in post
+    assert post["excerpt"].endswith("…") and len(post["excerpt"]) <= 201
+    select = [q["sql"] for q in queries.captured_queries if '"excerpt"' in q["sql"]]
+    assert select and '"content' not in select[0]
+
+    response = client.get("/posts/", {"view": "summary", "fields": "id,excerpt"})
+    assert set(response.data[0]) == {"id", "excerpt"}
+
+
+@pytest.mark.django_db
+def test_post_views_are_buffered_and_flushed():
+    client, user = create_user_and_login()
+    quiet = Post.objects.create(author=user.author, title="Quiet", content="Body")
+    busy = Post.objects.create(author=user.author, title="Busy", content="Body")
+    client.get(f"/posts/{quiet.id}/")
+    for _ in range(3):
+        response = client.get(f"/posts/{busy.id}/")
+    client.get(f"/posts/{busy.id}/", HTTP_IF_NONE_MATCH=response["ETag"])
+    busy.refresh_from_db()
+    assert busy.view_count == 0
+
+    with CaptureQueriesContext(connection) as queries:
+        assert flush_views() == 2
+    assert len(queries) == 1
+    assert Post.objects.get(pk=busy.pk).view_count == 4
+    assert Post.objects.get(pk=quiet.pk).view_count == 1
+
+    response = client.get("/posts/most-viewed/", {"fields": "id,view_count"})
+    assert [post["id"] for post in response.data] == [busy.id, quiet.id]
+    assert response.data[0]["view_count"] == 4
+
+
+@pytest.mark.django_db
+def test_post_views_flush_when_due(settings):
+    settings.VIEW_COUNT_FLUSH_SECONDS = 0
+    client, user = create_user_and_login()
+    post = Post.objects.create(author=user.author, title="Now", content="Body")
+    client.get(f"/posts/{post.id}/")
+    post.refresh_from_db()
+    assert post.view_count == 1
+
+
+@pytest.mark.django_db
+def test_post_tags_and_category():
+    client, user = create_user_and_login()
+    news = Category.objects.create(name="News")
+    Tag.objects.create(name="django")
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(
+            "/posts/",
+            {"title": "Tagged", "content": "Body", "tags": "Django, ORM, orm"},
+        )
+    assert response.status_code == 201
+    assert response.data["tags"] == ["django", "orm"]
+    upserts = [q for q in queries.captured_queries if 'INTO "blog_tag"' in q["sql"]]
+    assert len(upserts) == 1
+    post_id = response.data["id"]
+    client.post("/posts/", {"title": "Other", "content": "Body", "tags": ["orm"]})
+
+    response = client.get("/posts/", {"tag": ["orm", "DJANGO"]})
+    assert [post["title"] for post in response.data] == ["Tagged"]
+    assert client.get("/posts/", {"tag": ["orm", "missing"]}).data == []
+
+    response = client.patch(
+        f"/posts/{post_id}/",
+        {"tags": ["orm", "api"], "category": news.id},
+        format="json",
+    )
+    assert response.data["tags"] == ["orm", "api"]
+    response = client.get("/posts/", {"category": news.id})
+    assert [post["title"] for post in response.data] == ["Tagged"]
+
+    response = client.get("/tags/")
+    assert response.data == [
+        {"name": "orm", "post_count": 2},
+        {"name": "api", "post_count": 1},
+    ]
+    client.delete(f"/posts/{post_id}/")
+    assert Tag.objects.get(name="orm").post_count == 1
+
+
+@pytest.mark.django_db
+def test_post_slugs_and_redirects():
+    client, user = create_user_and_login()
+    response = client.post("/posts/", {"title": "Hello, World!", "content": "Body"})
+    assert response.data["slug"] == "hello-world"
+    post_id = response.data["id"]
+    response = client.post("/posts/", {"title": "Hello World", "content": "Body"})
+    assert response.data["slug"] == "hello-world-2"
+
+    response = client.get("/posts/by-slug/hello-world/")
+    assert response.status_code == 200
+    assert response.data["id"] == post_id
+    # Slug and post are both cached now.
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/posts/by-slug/hello-world/")
+    assert len(queries) == 0
+    assert response.data["id"] == post_id
+
+    client.patch(f"/posts/{post_id}/", {"title": "Goodbye"}, format="json")
+    response = client.get("/posts/by-slug/hello-world/", {"fields": "id"})
+    assert response.status_code == 301
+    assert response["Location"] == "/posts/by-slug/goodbye/?fields=id"
+    assert client.get("/posts/by-slug/goodbye/").data["title"] == "Goodbye"
+    # Old slugs stay reserved for the post that had them.
+    response = client.post("/posts/", {"title": "Hello world.", "content": "Body"})
+    assert response.data["slug"] == "hello-world-3"
+
+    client.patch(f"/posts/{post_id}/", {"title": "Hello, world"}, format="json")
+    assert client.get("/posts/by-slug/hello-world/").data["id"] == post_id
+    assert client.get("/posts/by-slug/goodbye/").status_code == 301
+    assert client.get("/posts/by-slug/missing/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_list_posts_expand_author_and_latest_comments(settings):
+    settings.POST_EXPAND_COMMENTS = 2
+    client, user = create_user_and_login()
+
+    def expanded_page(count):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(
+                "/posts/",
+                {"page_size": 50, "expand": "author,latest_comments"},
+            )
+        assert len(response.data["results"]) == count
+        return response, len(queries)
+
+    def add_posts(start, count):
+        for i in range(start, start + count):
+            post = Post.objects.create(
+                author=user.author, title=f"Post {i}", content="Body"
+            )
+            Comment.objects.bulk_create(
+                Comment(post=post, author=user.author, content=f"Comment {j}")
+                for j in range(3)
+            )
+        # Written behind the API's back, so drop the cached list.
+        cache.clear()
+
+    add_posts(0, 5)
+    response, small_page_queries = expanded_page(5)
+    post = response.data["results"][0]
+    assert post["author"] == {
+        "id": user.author.pk,
+        "username": "testuser",
+        "profile_picture": None,
+        "profile_picture_srcset": {},
+    }
+    assert [c["content"] for c in post["latest_comments"]] == [
+        "Comment 2",
+        "Comment 1",
+    ]
+    assert post["latest_comments"][0]["author"]["username"] == "testuser"
+
+    add_posts(5, 45)
+    # Validators, posts joined with authors, tags, windowed comments.
+    assert expanded_page(50)[1] == small_page_queries == 4
+
+    response = client.get("/posts/", {"expand": "comments"})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_drafts_and_scheduled_posts_are_private():
+    client, user = create_user_and_login()
+    reader = User.objects.create_user(username="reader", password="testpass123")
+    Author.objects.create(user=reader)
+    other = APIClient()
+    token = other.post(
+        "/api/token/", {"username": "reader", "password": "testpass123"}
+    ).data["access"]
+    other.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    response = client.post(
+        "/posts/", {"title": "Later", "content": "Body", "status": "scheduled"}
+    )
+    assert response.status_code == 400
+    assert "publish_at" in response.data
+    response = client.post(
+        "/posts/",
+        {"title": "Draft", "content": "Body", "status": "draft", "tags": ["secret"]},
+        format="json",
+    )
+    assert response.data["status"] == "draft"
+    post_id = response.data["id"]
+    assert client.get("/tags/").data == []
+
+    assert client.get(f"/posts/{post_id}/").status_code == 200
+    assert other.get(f"/posts/{post_id}/").status_code == 404
+    assert other.get("/posts/by-slug/draft/").status_code == 404
+    assert other.get(f"/posts/{post_id}/comments/").status_code == 404
+    assert client.get("/posts/").data == []
+    assert [post["title"] for post in client.get("/posts/my/").data] == ["Draft"]
+
+    response = client.patch(
+        f"/posts/{post_id}/", {"status": "published"}, format="json"
+    )
+    assert response.data["publish_at"] is not None
+    assert other.get(f"/posts/{post_id}/").status_code == 200
+    assert client.get("/tags/").data == [{"name": "secret", "post_count": 1}]
+    assert [post["title"] for post in other.get("/posts/").data] == ["Draft"]
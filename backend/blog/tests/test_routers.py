@@ -0,0 +1,57 @@
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+
+pytestmark = pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+    settings.REPLICA_STICKY_SECONDS = 5
+
+
+def capture(client, method, path, data=None):
+    with CaptureQueriesContext(connections["default"]) as primary:
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            response = getattr(client, method)(path, data)
+    return response, len(primary.captured_queries), len(replica.captured_queries)
+
+
+def test_reads_go_to_replica(replica, auth_client):
+    client, user = auth_client
+    post = Post.objects.create(author=user.author, title="Routed", content="Body")
+
+    response, primary, replica_queries = capture(client, "get", f"/posts/{post.id}/")
+    assert response.data["title"] == "Routed"
+    assert primary == 0 and replica_queries > 0
+
+    response, primary, replica_queries = capture(client, "get", "/author/")
+    assert response.status_code == 200
+    assert primary == 0 and replica_queries > 0
+
+
+def test_writes_stick_user_to_primary(replica, auth_client):
+    client, user = auth_client
+    post = Post.objects.create(author=user.author, title="Sticky", content="Body")
+
+    response, primary, replica_queries = capture(
+        client, "post", f"/posts/{post.id}/comments/", {"content": "Hi"}
+    )
+    assert response.status_code == 201
+    assert primary > 0 and replica_queries == 0
+
+    response, primary, replica_queries = capture(
+        client, "get", f"/posts/{post.id}/comments/"
+    )
+    assert [c["content"] for c in response.data] == ["Hi"]
+    assert primary > 0 and replica_queries == 0
+
+
+def test_routing_disabled_without_replicas(auth_client):
+    client, user = auth_client
+    response, primary, replica_queries = capture(client, "get", "/posts/")
+    assert response.status_code == 200
+    assert primary > 0 and replica_queries == 0
@@ -0,0 +1,97 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from blog.models import Author, Post
+from blog.throttling import LoginIPThrottle
+
+
+@pytest.fixture
+def rates(settings):
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_RATES": {
+            "register": "2/hour",
+            "login": "3/min",
+            "login_username": "2/min",
+            "comment": "100/min",
+            "comment_user": "1/min",
+        },
+    }
+
+
+@pytest.mark.django_db
+def test_register_throttled_per_ip(rates):
+    client = APIClient()
+    for i in range(2):
+        response = client.post(
+            "/api/register/",
+            {
+                "username": f"user{i}",
+                "email": f"u{i}@example.com",
+                "password": "newpass123",
+            },
+        )
+        assert response.status_code == 201
+    response = client.post(
+        "/api/register/",
+        {"username": "user2", "email": "u2@example.com", "password": "newpass123"},
+    )
+    assert response.status_code == 429
+    assert 1700 <= int(response["Retry-After"]) <= 1800
+    assert not User.objects.filter(username="user2").exists()
+
+    other = APIClient(REMOTE_ADDR="10.0.0.2")
+    response = other.post(
+        "/api/register/",
+        {"username": "user3", "email": "u3@example.com", "password": "newpass123"},
+    )
+    assert response.status_code == 201
+
+
+@pytest.mark.django_db
+def test_token_throttled_per_username_before_hashing(rates):
+    User.objects.create_user(username="victim", password="secret")
+    for address in ("10.0.0.1", "10.0.0.2"):
+        response = APIClient(REMOTE_ADDR=address).post(
+            "/api/token/", {"username": "victim", "password": "guess"}
+        )
+        assert response.status_code == 401
+    with CaptureQueriesContext(connection) as queries:
+        response = APIClient(REMOTE_ADDR="10.0.0.3").post(
+            "/api/token/", {"username": "victim", "password": "guess"}
+        )
+    assert response.status_code == 429
+    assert "Retry-After" in response
+    assert queries.captured_queries == []
+
+
+@pytest.mark.django_db
+def test_comment_posts_throttled_per_user(rates):
+    user = User.objects.create_user(username="writer", password="newpass123")
+    author = Author.objects.create(user=user)
+    post = Post.objects.create(author=author, title="Post", content="Body")
+    client = APIClient()
+    token = client.post("/api/token/", {"username": "writer", "password": "newpass123"})
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.data['access']}")
+
+    assert (
+        client.post(f"/posts/{post.id}/comments/", {"content": "1"}).status_code == 201
+    )
+    response = client.post(f"/posts/{post.id}/comments/", {"content": "2"})
+    assert response.status_code == 429
+    assert client.get(f"/posts/{post.id}/comments/").status_code == 200
+
+
+def test_bucket_refills_over_time(rates, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("blog.throttling.time.time", lambda: now[0])
+    request = RequestFactory().post("/api/token/", REMOTE_ADDR="10.1.1.1")
+    results = [LoginIPThrottle().allow_request(request, None) for _ in range(4)]
+    assert results == [True, True, True, False]
+    now[0] += 20
+    assert LoginIPThrottle().allow_request(request, None)
+    assert not LoginIPThrottle().allow_request(request, None)
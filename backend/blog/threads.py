@@ -0,0 +1,120 @@
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber, Substr
+from rest_framework.exceptions import ValidationError
+
+# Each level of a comment's path is its id, zero-padded to PATH_WIDTH digits.
+# Paths are digit-only, so they sort the same under every collation: a
+# comment sorts right before its replies, and its subtree is the range
+# [path, next_path(path)).
+PATH_WIDTH = 10
+
+
+def child_path(parent_path, pk):
+    """
+    Return the path of comment `pk` under a parent path ("" for top level).
+    """
+    return f"{parent_path}{pk:0{PATH_WIDTH}d}"
+
+
+def next_path(path):
+    """
+    Return the first path after the subtree rooted at `path`.
+    """
+    head, last = path[:-PATH_WIDTH], int(path[-PATH_WIDTH:])
+    return child_path(head, last + 1)
+
+
+def assign_paths(comments):
+    """
+    Fill in paths for bulk-created comments, whose parents already have one.
+
+    bulk_create skips Comment.save(), so callers create comments level by
+    level and call this after each level.
+    """
+    from .models import Comment
+
+    for comment in comments:
+        parent_path = comment.parent.path if comment.parent_id else ""
+        comment.path = child_path(parent_path, comment.pk)
+    Comment.objects.bulk_update(comments, ["path"], batch_size=1000)
+
+
+def get_reply_depth(request):
+    """
+    Parse ?depth=<n>, the number of reply levels returned under each comment.
+    """
+    limit = settings.COMMENT_MAX_DEPTH
+    value = request.GET.get("depth")
+    if value is None:
+        return limit
+    try:
+        depth = int(value)
+    except ValueError:
+        raise ValidationError({"depth": "Must be an integer."})
+    if depth < 0:
+        raise ValidationError({"depth": "Must not be negative."})
+    return min(depth, limit)
+
+
+def replies_queryset(roots, depth):
+    """
+    Replies under `roots`, at most `depth` levels deep, in one query.
+
+    All roots share one depth. Each root's subtree is read as its own
+    (post, path) index range, so comments outside the page are never
+    scanned. Every root gets at most COMMENT_TREE_MAX_REPLIES replies,
+    shallow ones first, so a huge thread is cut at its deepest levels and
+    cannot starve the roots after it.
+    """
+    from .models import Comment
+
+    if not roots or depth == 0:
+        return Comment.objects.none()
+    base = roots[0].depth
+    subtrees = reduce(
+        or_,
+        (
+            Q(post_id=root.post_id, path__gt=root.path, path__lt=next_path(root.path))
+            for root in roots
+        ),
+    )
+    return (
+        Comment.objects.filter(subtrees, depth__gt=base, depth__lte=base + depth)
+        .annotate(
+            # The root's path is the first (base + 1) levels of the reply's.
+            rank=Window(
+                RowNumber(),
+                partition_by=Substr("path", 1, (base + 1) * PATH_WIDTH),
+                order_by=[F("depth").asc(), F("path").asc()],
+            )
+        )
+        .filter(rank__lte=settings.COMMENT_TREE_MAX_REPLIES)
+        .order_by("depth", "path")
+    )
+
+
+def build_tree(roots, replies):
+    """
+    Nest serialized replies under their parents in a single pass.
+
+    `roots` and `replies` are lists of serialized comments. Roots keep their
+    order; each reply is attached to its parent once the parent is placed.
+    Replies whose parent is not in the result are dropped.
+    """
+    nodes = {}
+    tree = []
+    for data in roots:
+        node = {**data, "replies": []}
+        nodes[node["id"]] = node
+        tree.append(node)
+    for data in sorted(replies, key=lambda reply: reply["path"]):
+        parent = nodes.get(data["parent"])
+        if parent is not None:
+            node = {**data, "replies": []}
+            nodes[node["id"]] = node
+            parent["replies"].append(node)
+    return tree
@@ -0,0 +1,134 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """
+    Parse "<capacity>/<period>" (e.g. "10/min") into (capacity, seconds).
+
+    The bucket holds `capacity` tokens and refills at capacity/seconds per
+    second, so clients may burst up to `capacity` requests and then sustain
+    the average rate.
+    """
+    capacity, period = rate.split("/")
+    return int(capacity), PERIODS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token-bucket throttle backed by the Django cache.
+
+    Each bucket is a (tokens, updated_at) pair stored under a key derived
+    from the scope and get_ident(). Checking a bucket is one cache get and
+    one cache set, and never touches the database. The read-modify-write
+    is not atomic, so concurrent requests on different workers may let a
+    few extra requests through; the limit is meant to stop bursts, not to
+    count exactly.
+
+    Rates come from REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"][scope]; a rate
+    of None disables the throttle.
+    """
+
+    scope = None
+
+    def __init__(self):
+        self.retry_after = None
+
+    def get_ident(self, request):
+        """
+        Return the bucket identity for this request, or None to skip it.
+        """
+        raise NotImplementedError(".get_ident() must be overridden")
+
+    def get_cache_key(self, ident):
+        digest = hashlib.md5(str(ident).encode()).hexdigest()
+        return f"throttle:{self.scope}:{digest}"
+
+    def allow_request(self, request, view):
+        if not settings.THROTTLE_ENABLED:
+            return True
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if rate is None:
+            return True
+        ident = self.get_ident(request)
+        if ident is None:
+            return True
+
+        capacity, period = parse_rate(rate)
+        refill = capacity / period
+        cache = caches[settings.THROTTLE_CACHE_ALIAS]
+        key = self.get_cache_key(ident)
+        now = time.time()
+        tokens, updated_at = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        else:
+            self.retry_after = (1 - tokens) / refill
+        # Expire the bucket once it would have refilled completely.
+        cache.set(key, (tokens, now), timeout=int(period) + 1)
+        return allowed
+
+    def wait(self):
+        return self.retry_after
+
+
+class IPThrottle(TokenBucketThrottle):
+    """
+    Buckets per client IP (honouring NUM_PROXIES for X-Forwarded-For).
+    """
+
+    def get_ident(self, request):
+        return BaseThrottle.get_ident(self, request)
+
+
+class UserThrottle(TokenBucketThrottle):
+    """
+    Buckets per authenticated user id, read from the token without queries.
+    """
+
+    def get_ident(self, request):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        return None
+
+
+class RegisterIPThrottle(IPThrottle):
+    scope = "register"
+
+
+class LoginIPThrottle(IPThrottle):
+    scope = "login"
+
+
+class LoginUsernameThrottle(TokenBucketThrottle):
+    """
+    Buckets per attempted username, so guessing one account's password from
+    many addresses is limited too.
+    """
+
+    scope = "login_username"
+
+    def get_ident(self, request):
+        username = (
+            request.data.get("username") if hasattr(request.data, "get") else None
+        )
+        if not isinstance(username, str) or not username:
+            return None
+        return username.lower()
+
+
+class CommentIPThrottle(IPThrottle):
+    scope = "comment"
+
+
+class CommentUserThrottle(UserThrottle):
+    scope = "comment_user"
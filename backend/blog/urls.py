@@ -1,17 +1,27 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
-)
+from rest_framework_simplejwt.views import TokenRefreshView
 
+from blog.async_views import (
+    AsyncCommentListView,
+    AsyncPostDetailView,
+    AsyncPostListView,
+    CommentStreamView,
+)
 from blog.views import (
     AuthorAPIView,
+    CacheStatsView,
+    CategoryListView,
     CommentListCreateAPIView,
+    FeedAPIView,
+    FollowAPIView,
     HealthCheckView,
+    MetricsView,
     PostViewSet,
     ReadinessCheckView,
     RegisterView,
+    TagCloudView,
+    ThrottledTokenObtainPairView,
 )
 
 router = DefaultRouter()
@@ -21,14 +31,44 @@ router.register(r"posts", PostViewSet, basename="post")
 urlpatterns = [
     path("", include(router.urls)),
     path("author/", AuthorAPIView.as_view(), name="author"),
+    path(
+        "authors/<int:author_id>/follow/",
+        FollowAPIView.as_view(),
+        name="author_follow",
+    ),
+    path("feed/", FeedAPIView.as_view(), name="feed"),
+    path("tags/", TagCloudView.as_view(), name="tag_cloud"),
+    path("categories/", CategoryListView.as_view(), name="category_list"),
     path(
         "posts/<int:post_id>/comments/",
         CommentListCreateAPIView.as_view(),
         name="post_comments",
     ),
+    path(
+        "posts/<int:post_id>/comments/stream/",
+        CommentStreamView.as_view(),
+        name="post_comment_stream",
+    ),
+    path("async/posts/", AsyncPostListView.as_view(), name="async_post_list"),
+    path(
+        "async/posts/<int:pk>/",
+        AsyncPostDetailView.as_view(),
+        name="async_post_detail",
+    ),
+    path(
+        "async/posts/<int:post_id>/comments/",
+        AsyncCommentListView.as_view(),
+        name="async_post_comments",
+    ),
     path("api/register/", RegisterView.as_view(), name="register_user"),
-    path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path(
+        "api/token/",
+        ThrottledTokenObtainPairView.as_view(),
+        name="token_obtain_pair",
+    ),
     path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("cache/stats/", CacheStatsView.as_view(), name="cache_stats"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
     path("health/", HealthCheckView.as_view(), name="health"),
     path("readiness/", ReadinessCheckView.as_view(), name="readiness"),
 ]
@@ -0,0 +1,148 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Case, F, PositiveBigIntegerField, Value, When
+
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+
+class ViewBuffer:
+    """
+    Thread-safe per-process tally of post views not yet written to the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._last_flush = time.monotonic()
+
+    def add(self, post_id):
+        with self._lock:
+            self._counts[post_id] += 1
+
+    def due(self):
+        """
+        True once VIEW_COUNT_FLUSH_SECONDS have passed since the last flush,
+        or VIEW_COUNT_MAX_PENDING posts are waiting.
+        """
+        with self._lock:
+            if not self._counts:
+                return False
+            elapsed = time.monotonic() - self._last_flush
+            return (
+                elapsed >= settings.VIEW_COUNT_FLUSH_SECONDS
+                or len(self._counts) >= settings.VIEW_COUNT_MAX_PENDING
+            )
+
+    def drain(self):
+        """
+        Take and clear the pending counts.
+        """
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._last_flush = time.monotonic()
+        return counts
+
+    def restore(self, counts):
+        """
+        Put back counts whose write failed, to be retried with the next flush.
+        """
+        with self._lock:
+            self._counts.update(counts)
+
+    def pending(self):
+        with self._lock:
+            return sum(self._counts.values())
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+            self._last_flush = time.monotonic()
+
+
+buffer = ViewBuffer()
+
+
+def record_view(post_id):
+    """
+    Count a view of a post, flushing the buffer if a flush is due.
+
+    Views only touch memory; at most one request per VIEW_COUNT_FLUSH_SECONDS
+    in each worker pays for the write. Use arecord_view() in async views.
+    """
+    buffer.add(post_id)
+    if buffer.due():
+        flush_views()
+
+
+async def arecord_view(post_id):
+    """
+    Async variant of record_view; the flush runs in a worker thread.
+    """
+    buffer.add(post_id)
+    if buffer.due():
+        await sync_to_async(flush_views)()
+
+
+def write_view_counts(counts):
+    """
+    Add {post id: views} to Post.view_count, one UPDATE per VIEW_COUNT_BATCH_SIZE posts.
+
+    Each UPDATE adds a per-row CASE amount to the current value, so
+    concurrent flushes from other workers never lose increments. Rows are
+    listed in id order so concurrent flushes lock them in the same order.
+    Returns the number of rows updated.
+    """
+    post_ids = sorted(counts)
+    size = settings.VIEW_COUNT_BATCH_SIZE
+    updated = 0
+    for start in range(0, len(post_ids), size):
+        batch = post_ids[start : start + size]
+        increment = Case(
+            *[When(pk=post_id, then=Value(counts[post_id])) for post_id in batch],
+            default=Value(0),
+            output_field=PositiveBigIntegerField(),
+        )
+        updated += Post.objects.filter(pk__in=batch).update(
+            view_count=F("view_count") + increment
+        )
+    return updated
+
+
+def flush_views():
+    """
+    Write this process's buffered views to the database.
+
+    On a database error the counts go back into the buffer, so they are
+    only lost if the worker dies before a later flush succeeds. Returns the
+    number of posts updated.
+    """
+    counts = buffer.drain()
+    if not counts:
+        return 0
+    try:
+        return write_view_counts(counts)
+    except DatabaseError:
+        logger.exception("Could not flush %d post view counts", len(counts))
+        buffer.restore(counts)
+        return 0
+
+
+def _flush_at_exit():
+    try:
+        flush_views()
+    except Exception:
+        logger.exception("Could not flush post view counts at exit")
+
+
+# Workers stopped gracefully (deploys, max_requests) keep their pending
+# views; a killed worker loses at most VIEW_COUNT_FLUSH_SECONDS of them.
+atexit.register(_flush_at_exit)
@@ -1,18 +1,70 @@
+import hmac
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import NotFound, PermissionDenied
-from rest_framework.generics import ListCreateAPIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.generics import GenericAPIView, ListAPIView, ListCreateAPIView
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-
-from .models import Author, Comment, Post
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from . import cache as post_cache
+from .authentication import author_id_of
+from .conditional import (
+    latest,
+    make_etag,
+    not_modified_response,
+    set_conditional_headers,
+)
+from .counters import comment_added
+from .events import publish_comment
+from .feeds import fan_out, follow, timeline, unfollow
+from .images import schedule_renditions
+from .metrics import collect
+from .models import Author, Category, Comment, Post, PostStatus
+from .pagination import (
+    CommentCursorPagination,
+    FeedCursorPagination,
+    PostCursorPagination,
+)
+from .publishing import publish_now
+from .rendering import rendered_fields
+from .routers import ReplicaRoutingMixin
+from .search import search_posts
 from .serializers import (
     AuthorSerializer,
+    SAFE_METHODS,
+    CategorySerializer,
     CommentSerializer,
     PostSerializer,
+    PostSummarySerializer,
     RegisterSerializer,
+    requested_fields,
+)
+from .slugs import forget_slug, rename_slug, resolve_slug
+from .tags import (
+    filter_by_tags,
+    recount_post_tags,
+    release_post_tags,
+    tag_cloud,
+    with_tags,
+)
+from .threads import build_tree, get_reply_depth, replies_queryset
+from .throttling import (
+    CommentIPThrottle,
+    CommentUserThrottle,
+    LoginIPThrottle,
+    LoginUsernameThrottle,
+    RegisterIPThrottle,
 )
+from .viewcounts import record_view
 
 
 class RegisterView(APIView):
@@ -25,10 +77,12 @@ class RegisterView(APIView):
     Returns:
         201 - User registered successfully
         400 - Validation errors
+        429 - Too many registrations from this IP (see Retry-After)
     """
 
     authentication_classes = []
     permission_classes = []
+    throttle_classes = [RegisterIPThrottle]
 
     def post(self, request):
         """
@@ -48,7 +102,7 @@ class RegisterView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class AuthorAPIView(APIView):
+class AuthorAPIView(ReplicaRoutingMixin, APIView):
     """
     Author API View
 
@@ -72,7 +126,7 @@ class AuthorAPIView(APIView):
 
         Returns author data or not found message.
         """
-        author = Author.objects.filter(user=request.user).first()
+        author = Author.objects.filter(user_id=request.user.pk).first()
         if not author:
             return Response({"detail": "Author profile not found."}, status=404)
         serializer = AuthorSerializer(author)
@@ -84,7 +138,7 @@ class AuthorAPIView(APIView):
 
         Returns updated data or errors.
         """
-        author = Author.objects.filter(user=request.user).first()
+        author = Author.objects.filter(user_id=request.user.pk).first()
         if not author:
             return Response(
                 {"detail": "Author profile not found."},
@@ -92,12 +146,16 @@ class AuthorAPIView(APIView):
             )
         serializer = AuthorSerializer(author, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            if "profile_picture" in serializer.validated_data:
+                author = serializer.save(profile_picture_renditions=[])
+                schedule_renditions(author, "profile_picture")
+            else:
+                serializer.save()
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(ReplicaRoutingMixin, viewsets.ModelViewSet):
     """
     Post ViewSet
 
@@ -107,35 +165,254 @@ class PostViewSet(viewsets.ModelViewSet):
         GET    /posts/         - List user's posts
         POST   /posts/         - Create a post
         GET    /posts/<id>/    - Retrieve a post
+        GET    /posts/by-slug/<slug>/ - Retrieve a post by slug; old slugs
+                                        redirect (301) to the current one
         PUT    /posts/<id>/    - Update a post (owner only)
-        DELETE /posts/<id>/    - Delete a post (owner only)
+        DELETE /posts/<id>/    - Soft-delete a post (owner only)
         GET    /posts/my/       - List only user's uploaded posts
+        GET    /posts/search/?q= - Full-text search over posts (public)
+        GET    /posts/active/   - Posts ordered by latest comment
+        GET    /posts/most-viewed/ - Posts ordered by view count
+        GET    /posts/?tag=a&tag=b&category=<id> - Posts with all those tags,
+                                                in that category
+
+    List endpoints accept ?page_size=<n> and ?cursor=<token> to opt in
+    to keyset pagination on (created_at, id).
+
+    Reads accept ?fields=id,title,... to return (and load from the
+    database) only those fields, and ?expand=author,latest_comments to
+    inline the author and the newest comments of each post. Lists also accept ?view=summary for a
+    lightweight representation with an excerpt instead of the content.
+    content_html and excerpt are rendered on write, never on read.
+
+    List pages and post details are served from the post cache and
+    invalidated on every write. Both carry ETag / Last-Modified headers
+    derived from Post.updated_at and Post.last_comment_at and answer
+    conditional GETs with 304.
+
+    Retrieving a post counts a view (including 304s). Views are buffered
+    per worker and written in batches (see blog.viewcounts), so view_count
+    lags by up to VIEW_COUNT_FLUSH_SECONDS, plus the cache timeout for
+    cached responses. It is left out of the ETag so views do not defeat
+    304s: a client revalidating its copy keeps the count it has until the
+    post or its comments change.
+
+    Lists and search only show published posts. Drafts and scheduled posts
+    (published later by publish_scheduled) are readable by their author
+    only, through /posts/<id>/, /posts/by-slug/<slug>/ and /posts/my/.
+
+    Slugs are resolved to ids through a per-worker LRU and the shared cache
+    (see blog.slugs), so a by-slug read of a cached post runs no queries.
     """
 
     serializer_class = PostSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PostCursorPagination
+    list_limit = 20
+    max_list_limit = 100
+    summary_actions = ("list", "my_posts", "active", "most_viewed", "search")
 
     def get_queryset(self):
         """
-        Get all posts.
+        Get the posts the request may read, loading only the columns a read needs.
+
+        Lists are cached for everyone, so they hold published posts only;
+        a single post is also readable by its author before it is published.
+        """
+        queryset = Post.objects.all()
+        if self.request.method in SAFE_METHODS:
+            if self.action in ("retrieve", "by_slug"):
+                queryset = queryset.visible_to(author_id_of(self.request.user))
+            elif self.action != "my_posts":
+                queryset = queryset.published()
+            queryset = self.shape_queryset(queryset)
+        return queryset
+
+    def get_serializer_class(self):
+        """
+        Use the summary serializer for ?view=summary on list actions.
+        """
+        if (
+            self.action in self.summary_actions
+            and self.request.query_params.get("view") == "summary"
+        ):
+            return PostSummarySerializer
+        return PostSerializer
+
+    def shape_queryset(self, queryset):
+        """
+        Defer columns the response does not render.
+
+        The search vector is never rendered; summaries skip the content and
+        ?fields= narrows the loaded columns to the requested fields. Tags
+        are prefetched in one query when they are rendered, and ?expand=
+        adds a join or one prefetch query per expansion.
+        """
+        serializer_class = self.get_serializer_class()
+        queryset = queryset.defer("search_vector")
+        if serializer_class is PostSummarySerializer:
+            queryset = PostSummarySerializer.summary_queryset(queryset)
+        fields = requested_fields(self.request)
+        if fields is not None:
+            queryset = queryset.only(*serializer_class.columns_for(fields))
+        if fields is None or "tags" in fields:
+            queryset = with_tags(queryset)
+        return PostSerializer.expand_queryset(queryset, self.request)
+
+    def filter_queryset(self, queryset):
+        """
+        Apply ?tag= (repeatable, all must match) and ?category= to the list.
+        """
+        queryset = super().filter_queryset(queryset)
+        if self.action != "list":
+            return queryset
+        tags = self.request.query_params.getlist("tag")
+        if tags:
+            queryset = filter_by_tags(queryset, tags)
+        category = self.request.query_params.get("category")
+        if category is not None:
+            if not category.isdigit():
+                raise ValidationError({"category": ["A valid integer is required."]})
+            queryset = queryset.filter(category_id=category)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        """
+        List posts, served from the cache when possible.
+
+        Cache misses run a single aggregate query to build the validators,
+        so a conditional GET is answered before the queryset is evaluated.
+        """
+        variant = post_cache.request_variant(request)
+        cached = post_cache.get_post_list(variant)
+        if cached is not None:
+            state, data = cached
+        else:
+            aggregate = Post.objects.published().aggregate(
+                updated=Max("updated_at"),
+                commented=Max("last_comment_at"),
+                total=Count("id"),
+            )
+            state = {
+                "last_modified": latest(aggregate["updated"], aggregate["commented"]),
+                "total": aggregate["total"],
+            }
+            data = None
+        etag = make_etag("posts", state["last_modified"], state["total"], variant)
+        not_modified = not_modified_response(request, etag, state["last_modified"])
+        if not_modified is not None:
+            return not_modified
+
+        if data is not None:
+            response = Response(data)
+        else:
+            response = super().list(request, *args, **kwargs)
+            post_cache.set_post_list(variant, (state, response.data))
+        return set_conditional_headers(response, etag, state["last_modified"])
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Retrieve a post, served from the cache when possible, and count the view.
         """
-        return Post.objects.all()
+        try:
+            post_id = int(kwargs["pk"])
+        except ValueError:
+            raise NotFound("Post not found.")
+        variant = post_cache.request_variant(request)
+        cached = post_cache.get_post(post_id, variant)
+        if cached is not None:
+            state, data = cached
+        else:
+            row = (
+                Post.objects.filter(pk=post_id)
+                .values_list(
+                    "updated_at",
+                    "last_comment_at",
+                    "comment_count",
+                    "status",
+                    "author_id",
+                )
+                .first()
+            )
+            if row is None:
+                raise NotFound("Post not found.")
+            state = {
+                "last_modified": latest(row[0], row[1]),
+                "comments": row[2],
+                # Unpublished posts (and their cached copies) are the author's only.
+                "owner": None if row[3] == PostStatus.PUBLISHED else row[4],
+            }
+            data = None
+        owner = state.get("owner")
+        if owner is not None and owner != author_id_of(request.user):
+            raise NotFound("Post not found.")
+        record_view(post_id)
+        last_modified = state["last_modified"]
+        etag = make_etag("post", post_id, last_modified, state["comments"], variant)
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        if data is not None:
+            response = Response(data)
+        else:
+            response = super().retrieve(request, *args, **kwargs)
+            post_cache.set_post(post_id, variant, (state, response.data))
+        return set_conditional_headers(response, etag, last_modified)
 
     def perform_create(self, serializer):
         """
-        Save a new post with the logged-in user as author.
+        Save a new post with the logged-in user as author and its rendered content,
+        and push it into the author's followers' feeds if it is published.
         """
         image = self.request.FILES.get("image")
         author = getattr(self.request.user, "author", None)
         if not author:
             Author.objects.create(user=self.request.user)
-        serializer.save(author=self.request.user.author, image=image)
+        changes = rendered_fields(serializer.validated_data["content"])
+        status = serializer.validated_data.get("status", PostStatus.PUBLISHED)
+        if status == PostStatus.PUBLISHED:
+            changes["publish_at"] = timezone.now()
+        post = serializer.save(author=self.request.user.author, image=image, **changes)
+        schedule_renditions(post, "image")
+        if post.status == PostStatus.PUBLISHED:
+            fan_out(post)
+            post_cache.invalidate_post_list()
+
+    def perform_update(self, serializer):
+        """
+        Save a post, re-rendering its content and image renditions if they changed
+        and moving its slug if the title changed. Publishing a draft or
+        scheduled post pushes it into followers' feeds; publishing or
+        unpublishing recounts its tags.
+        """
+        was_published = serializer.instance.status == PostStatus.PUBLISHED
+        publishing = (
+            not was_published
+            and serializer.validated_data.get("status") == PostStatus.PUBLISHED
+        )
+        changes = publish_now() if publishing else {}
+        if "title" in serializer.validated_data:
+            changes["slug"] = rename_slug(
+                serializer.instance, serializer.validated_data["title"]
+            )
+        if "content" in serializer.validated_data:
+            changes.update(rendered_fields(serializer.validated_data["content"]))
+        if "image" in serializer.validated_data:
+            changes["image_renditions"] = []
+        post = serializer.save(**changes)
+        if "image" in serializer.validated_data:
+            schedule_renditions(post, "image")
+        if publishing:
+            fan_out(post)
+        if was_published != (post.status == PostStatus.PUBLISHED):
+            recount_post_tags([post.pk])
 
     def check_author_permission(self, post):
         """
         Check if the logged-in user is the post's author.
         """
-        if post.author != self.request.user.author:
+        if post.author_id != self.request.user.author.pk:
             raise PermissionDenied("You can only modify your own posts.")
 
     def update(self, request, *args, **kwargs):
@@ -145,27 +422,139 @@ class PostViewSet(viewsets.ModelViewSet):
 
         post = self.get_object()
         self.check_author_permission(post)
-        return super().update(request, *args, **kwargs)
+        response = super().update(request, *args, **kwargs)
+        post_cache.invalidate_post(post.pk)
+        return response
 
     def destroy(self, request, *args, **kwargs):
         """
-        Delete a post if the user is the author.
+        Soft-delete a post if the user is the author.
+
+        A single-row UPDATE whatever the number of comments; the post's
+        rows are removed later, in batches, by archive_posts.
         """
         post = self.get_object()
         self.check_author_permission(post)
-        return super().destroy(request, *args, **kwargs)
+        with transaction.atomic():
+            release_post_tags(post)
+            Post.objects.filter(pk=post.pk).soft_delete()
+        post_cache.invalidate_post(post.pk)
+        forget_slug(post.slug)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=["get"], url_path=r"by-slug/(?P<slug>[-\w]+)")
+    def by_slug(self, request, slug):
+        """
+        Retrieve a post by its slug, or redirect from one of its old slugs.
+
+        Shares the post cache, validators and view counting with retrieve.
+        """
+        post_id, current = resolve_slug(slug)
+        if post_id is None:
+            raise NotFound("Post not found.")
+        if current is not None:
+            location = reverse("post-by-slug", kwargs={"slug": current})
+            query = request.META.get("QUERY_STRING")
+            if query:
+                location = f"{location}?{query}"
+            return Response(
+                status=status.HTTP_301_MOVED_PERMANENTLY,
+                headers={"Location": location},
+            )
+        self.kwargs["pk"] = post_id
+        try:
+            return self.retrieve(request, pk=post_id)
+        except NotFound:
+            # The slug was cached for a post since deleted (possibly by
+            # another worker); look it up afresh next time.
+            forget_slug(slug)
+            raise
 
     @action(detail=False, methods=["get"], url_path="my")
     def my_posts(self, request):
         """
         List posts created by the logged-in user.
         """
-        posts = Post.objects.filter(author=request.user.author)
+        posts = self.get_queryset().filter(author=request.user.author)
+        page = self.paginate_queryset(posts)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(posts, many=True)
+        return Response(serializer.data)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="search",
+        permission_classes=[AllowAny],
+    )
+    def search(self, request):
+        """
+        Search posts by title and content, best match first.
+
+        Title matches rank above content matches. Accepts ?limit=<n>, and
+        ?fields= / ?view=summary like the list.
+        """
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": ["This query parameter is required."]})
+        posts = search_posts(self.get_queryset(), query, self.get_limit(request))
+        serializer = self.get_serializer(posts, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=["get"], url_path="active")
+    def active(self, request):
+        """
+        List the most recently commented posts, newest activity first.
+
+        Served from the (last_comment_at, id) index. Accepts ?limit=<n>.
+        """
+        posts = (
+            self.get_queryset()
+            .filter(last_comment_at__isnull=False)
+            .order_by("-last_comment_at", "-id")[: self.get_limit(request)]
+        )
         serializer = self.get_serializer(posts, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=["get"], url_path="most-viewed")
+    def most_viewed(self, request):
+        """
+        List the most viewed posts, most views first.
+
+        Served from the (view_count, id) index. Accepts ?limit=<n>.
+        """
+        posts = self.get_queryset().order_by("-view_count", "-id")[
+            : self.get_limit(request)
+        ]
+        serializer = self.get_serializer(posts, many=True)
+        return Response(serializer.data)
+
+    def get_limit(self, request):
+        """
+        Read ?limit=<n>, clamped to max_list_limit.
+        """
+        try:
+            limit = int(request.query_params.get("limit", self.list_limit))
+        except ValueError:
+            raise ValidationError({"limit": ["A valid integer is required."]})
+        return max(1, min(limit, self.max_list_limit))
+
 
-class CommentListCreateAPIView(ListCreateAPIView):
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    """
+    POST /api/token/
+
+    simplejwt's token view, throttled per client IP and per attempted
+    username before any password is hashed. Over the limit it answers 429
+    with a Retry-After header.
+    """
+
+    throttle_classes = [LoginIPThrottle, LoginUsernameThrottle]
+
+
+class CommentListCreateAPIView(ReplicaRoutingMixin, ListCreateAPIView):
     """
     Comment ListCreateAPIView
 
@@ -174,31 +563,303 @@ class CommentListCreateAPIView(ListCreateAPIView):
     Endpoints:
         GET  /posts/<id>/comments/   - List all comments for the given post
         POST /posts/<id>/comments/   - Add a comment to the post (auth required)
+        GET  /posts/<id>/comments/stream/ - New comments as server-sent events
+                                            (see CommentStreamView)
+
+    Comments are threaded: POST with "parent": <comment id> to reply.
+    Listing returns top-level comments with their replies nested under
+    "replies", using one query for the comments and one for all their
+    replies however deep the threads are. ?depth=<n> limits the reply
+    levels returned and ?parent=<id> returns the subtree of one comment.
+    Large threads are cut at COMMENT_TREE_MAX_REPLIES replies per listed
+    comment; compare a comment's reply_count with its returned replies to
+    spot truncation.
+
+    Listing accepts ?page_size=<n> and ?cursor=<token> to opt in
+    to keyset pagination of top-level comments on (created_at, id).
+    Responses carry ETag / Last-Modified headers derived from the newest
+    comment and answer conditional GETs with 304.
     """
 
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CommentCursorPagination
+
+    def get_throttles(self):
+        """
+        Throttle posting comments per IP and per user; reads are not throttled.
+        """
+        if self.request.method == "POST":
+            return [CommentIPThrottle(), CommentUserThrottle()]
+        return []
 
     def get_queryset(self):
         """
         Returns all comments related to the specified post.
-        Raises 404 if the post does not exist.
+        Raises 404 if the post does not exist or is not visible to the user.
+        """
+        return Comment.objects.filter(post=self.get_post())
+
+    def get_post(self):
+        """
+        Fetch the post from the URL, or raise 404 if the user may not read it.
         """
-        post_id = self.kwargs["post_id"]
+        posts = Post.objects.visible_to(author_id_of(self.request.user))
         try:
-            post = Post.objects.get(pk=post_id)
+            return posts.get(pk=self.kwargs["post_id"])
         except Post.DoesNotExist:
             raise NotFound("Post not found.")
-        return Comment.objects.filter(post=post)
+
+    def list(self, request, *args, **kwargs):
+        """
+        List comments, answering conditional GETs before the queryset is evaluated.
+        """
+        state = (
+            Post.objects.visible_to(author_id_of(request.user))
+            .filter(pk=self.kwargs["post_id"])
+            .annotate(
+                last_modified=Max("comments__created_at"), total=Count("comments")
+            )
+            .values("last_modified", "total")
+            .first()
+        )
+        if state is None:
+            raise NotFound("Post not found.")
+        etag = make_etag(
+            "comments",
+            self.kwargs["post_id"],
+            state["last_modified"],
+            state["total"],
+            post_cache.request_variant(request),
+        )
+        not_modified = not_modified_response(request, etag, state["last_modified"])
+        if not_modified is not None:
+            return not_modified
+        response = self.list_tree(request)
+        return set_conditional_headers(response, etag, state["last_modified"])
+
+    def list_tree(self, request):
+        """
+        Return the paginated top-level comments, or one subtree, with nested replies.
+        """
+        depth = get_reply_depth(request)
+        comments = Comment.objects.filter(post_id=self.kwargs["post_id"])
+        parent_id = request.query_params.get("parent")
+        if parent_id is not None:
+            root = (
+                comments.filter(pk=parent_id).first() if parent_id.isdigit() else None
+            )
+            if root is None:
+                raise NotFound("Comment not found.")
+            replies = list(replies_queryset([root], depth))
+            data = self.get_serializer([root] + replies, many=True).data
+            return Response(build_tree(data[:1], data[1:])[0])
+
+        roots = comments.filter(parent__isnull=True)
+        page = self.paginate_queryset(roots)
+        roots = page if page is not None else list(roots)
+        replies = list(replies_queryset(roots, depth))
+        data = self.get_serializer(roots + replies, many=True).data
+        tree = build_tree(data[: len(roots)], data[len(roots) :])
+        if page is not None:
+            return self.get_paginated_response(tree)
+        return Response(tree)
 
     def perform_create(self, serializer):
         """
         Creates a new comment for the specified post using the authenticated user as the author.
+        Replies must target a comment on the same post, at most COMMENT_MAX_DEPTH deep.
+        Open comment streams receive the comment once it is committed.
         """
-        post_id = self.kwargs["post_id"]
-        post = Post.objects.get(pk=post_id)
+        post = self.get_post()
         author = self.request.user.author
-        serializer.save(post=post, author=author)
+        parent = serializer.validated_data.get("parent")
+        if parent is not None:
+            if parent.post_id != post.pk:
+                raise ValidationError({"parent": "Must be a comment on this post."})
+            if parent.depth >= settings.COMMENT_MAX_DEPTH:
+                raise ValidationError({"parent": "Replies are nested too deeply."})
+        comment = serializer.save(post=post, author=author)
+        comment_added(comment)
+        post_cache.invalidate_post(post.pk)
+        data = serializer.data
+        transaction.on_commit(lambda: publish_comment(comment.pk, post.pk, data))
+
+
+class FollowAPIView(ReplicaRoutingMixin, APIView):
+    """
+    Follow API View
+
+    Follows or unfollows another author. Their posts are added to (or
+    removed from) your feed right away.
+
+    Endpoints:
+        POST   /authors/<id>/follow/   - Follow an author
+        DELETE /authors/<id>/follow/   - Unfollow an author
+
+    Returns:
+        201 - Now following (200 if you already did)
+        204 - Unfollowed
+        400 - Tried to follow yourself
+        404 - Author not found, or not followed
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get_follower(self, request):
+        """
+        Return the logged-in user's author profile, or raise 404.
+        """
+        author = getattr(request.user, "author", None)
+        if author is None:
+            raise NotFound("Author profile not found.")
+        return author
+
+    def post(self, request, author_id):
+        """
+        Follow the author with the given id.
+        """
+        follower = self.get_follower(request)
+        if follower.pk == author_id:
+            raise ValidationError({"detail": "You cannot follow yourself."})
+        if not Author.objects.filter(pk=author_id).exists():
+            raise NotFound("Author not found.")
+        created = follow(follower.pk, author_id)
+        return Response(
+            {"following": author_id},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    def delete(self, request, author_id):
+        """
+        Unfollow the author with the given id.
+        """
+        follower = self.get_follower(request)
+        if not unfollow(follower.pk, author_id):
+            raise NotFound("You do not follow this author.")
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class FeedAPIView(ReplicaRoutingMixin, GenericAPIView):
+    """
+    GET /feed/
+
+    Posts by the authors you follow, newest first.
+
+    Pages are read from your precomputed timeline (see blog.feeds), merged
+    with the latest posts of followed authors too popular to fan out, so a
+    page costs the same however long the timeline is. Always paginated:
+    accepts ?page_size=<n> and ?cursor=<token>, plus ?fields=id,title,...
+    and ?expand=... like the post endpoints.
+    """
+
+    serializer_class = PostSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = FeedCursorPagination
+
+    def get(self, request):
+        """
+        Return one page of the logged-in user's feed.
+        """
+        author = getattr(request.user, "author", None)
+        if author is None:
+            keys = []
+        else:
+            keys = self.paginator.paginate_keys(
+                lambda position, limit: timeline(author.pk, position, limit),
+                request,
+            )
+        ids = [post_id for _, post_id in keys]
+        posts = Post.objects.published().defer("search_vector")
+        fields = requested_fields(request)
+        if fields is not None:
+            posts = posts.only(*PostSerializer.columns_for(fields))
+        if fields is None or "tags" in fields:
+            posts = with_tags(posts)
+        posts = PostSerializer.expand_queryset(posts, request).in_bulk(ids)
+        serializer = self.get_serializer(
+            [posts[post_id] for post_id in ids if post_id in posts], many=True
+        )
+        return self.paginator.get_paginated_response(serializer.data)
+
+
+class TagCloudView(ReplicaRoutingMixin, APIView):
+    """
+    GET /tags/?limit=<n>
+
+    The most used tags with their post counts, most used first. Read from
+    the maintained Tag.post_count index, never counted on request.
+    """
+
+    permission_classes = [AllowAny]
+    default_limit = 50
+    max_limit = 200
+
+    def get(self, request):
+        """
+        Tag cloud endpoint. Public.
+        """
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            raise ValidationError({"limit": ["A valid integer is required."]})
+        limit = max(1, min(limit, self.max_limit))
+        return Response(tag_cloud(limit))
+
+
+class CategoryListView(ReplicaRoutingMixin, ListAPIView):
+    """
+    GET /categories/
+
+    All categories, for picking a post's category by id.
+    """
+
+    queryset = Category.objects.order_by("name")
+    serializer_class = CategorySerializer
+    permission_classes = [AllowAny]
+
+
+class CacheStatsView(APIView):
+    """
+    Returns post cache hit/miss/eviction counters for this worker.
+    Used to size the cache.
+
+    - GET /cache/stats/ → { "hits": 0, "misses": 0, ... }
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """
+        Cache statistics endpoint. Staff only.
+        """
+        return Response(post_cache.stats.snapshot(), status=status.HTTP_200_OK)
+
+
+class MetricsView(APIView):
+    """
+    Exposes per-endpoint request, latency and query metrics for Prometheus.
+    Values are summed over all workers when METRICS_DIR is set (see
+    blog.metrics.collect), else they are for the worker serving the scrape.
+
+    - GET /metrics → text/plain exposition format
+    """
+
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request):
+        """
+        Metrics endpoint. Requires the METRICS_TOKEN bearer token when set.
+        """
+        if settings.METRICS_TOKEN:
+            expected = f"Bearer {settings.METRICS_TOKEN}"
+            provided = request.headers.get("Authorization", "")
+            if not hmac.compare_digest(provided.encode(), expected.encode()):
+                return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+        return HttpResponse(
+            collect().render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
 
 
 class HealthCheckView(APIView):
@@ -29,6 +29,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "blog.middleware.MetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -45,13 +46,28 @@ CORS_ALLOWED_ORIGINS = json.loads(
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "blog.authentication.AuthorJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # Token-bucket rates for blog.throttling ("<burst>/<period>"); override
+    # any of them with a JSON object in THROTTLE_RATES, null disables one.
+    "DEFAULT_THROTTLE_RATES": {
+        "register": "10/hour",
+        "login": "20/min",
+        "login_username": "10/min",
+        "comment": "30/min",
+        "comment_user": "20/min",
+        **json.loads(os.getenv("THROTTLE_RATES", "{}")),
+    },
+    "NUM_PROXIES": (
+        int(os.getenv("NUM_PROXIES")) if os.getenv("NUM_PROXIES") else None
+    ),
 }
 
+THROTTLE_ENABLED = os.getenv("THROTTLE_ENABLED", "True") == "True"
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(
         minutes=int(os.getenv("ACCESS_TOKEN_LIFETIME", 15))
@@ -59,6 +75,7 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(
         days=int(os.getenv("REFRESH_TOKEN_LIFETIME", 7))
     ),
+    "TOKEN_OBTAIN_SERIALIZER": "blog.serializers.AuthorTokenObtainPairSerializer",
 }
 
 ROOT_URLCONF = "blogapi.urls"
@@ -85,9 +102,34 @@ if "pytest" in sys.argv[0]:
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": ":memory:",
+        },
+        # Mirrors default; routing tests enable it via DATABASE_REPLICAS.
+        "replica": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": ":memory:",
+            "TEST": {"MIRROR": "default"},
+        },
+    }
+elif os.getenv("DB_ENGINE") == "sqlite":
+    # Local runs without PostgreSQL (e.g. the benchmark suite).
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("SQLITE_PATH", str(BASE_DIR / "db.sqlite3")),
         }
     }
+    # A copy of the primary file standing in for a replica.
+    if os.getenv("SQLITE_REPLICA_PATH"):
+        DATABASES["replica_1"] = {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("SQLITE_REPLICA_PATH"),
+        }
 else:
+    # DB_POOL=True keeps a psycopg connection pool per worker process
+    # (DB_POOL_MAX_SIZE defaults to the gunicorn thread count, see
+    # gunicorn.conf.py). Otherwise connections persist for DB_CONN_MAX_AGE
+    # seconds, checked before reuse when DB_CONN_HEALTH_CHECKS is on.
+    DB_POOL = os.getenv("DB_POOL", "False") == "True"
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.postgresql",
@@ -96,8 +138,132 @@ else:
             "PASSWORD": os.getenv("POSTGRES_PASSWORD", "pass"),
             "HOST": os.getenv("POSTGRES_HOST", "postgres-service"),
             "PORT": os.getenv("POSTGRES_PORT", "5432"),
+            # The pool owns connection reuse, so Django must close (return)
+            # connections after every request in pooled mode.
+            "CONN_MAX_AGE": 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", 60)),
+            "CONN_HEALTH_CHECKS": os.getenv("DB_CONN_HEALTH_CHECKS", "True") == "True",
+            "OPTIONS": {},
         }
     }
+    if DB_POOL:
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 1)),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", 4)),
+            # Seconds a request waits for a free connection before failing.
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+            "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", 300)),
+        }
+
+    # Streaming replicas of the primary, one alias per host.
+    for number, host in enumerate(
+        filter(None, os.getenv("POSTGRES_REPLICA_HOSTS", "").split(",")), start=1
+    ):
+        DATABASES[f"replica_{number}"] = {
+            **DATABASES["default"],
+            "HOST": host.strip(),
+            "OPTIONS": dict(DATABASES["default"]["OPTIONS"]),
+        }
+
+# Safe-method reads in the API views go to these aliases (blog.routers).
+# After a write, the writing user reads from the primary for
+# REPLICA_STICKY_SECONDS; keep it above the usual replication lag. Post
+# cache entries filled from a replica expire after the same window.
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias.startswith("replica_")]
+DATABASE_ROUTERS = ["blog.routers.ReplicaRouter"]
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 5))
+
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "blog.cache.LRUCache",
+            "LOCATION": "blog",
+            "OPTIONS": {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", 5000))},
+        }
+    }
+
+BLOG_CACHE_ALIAS = os.getenv("BLOG_CACHE_ALIAS", "default")
+BLOG_CACHE_TIMEOUT = int(os.getenv("BLOG_CACHE_TIMEOUT", 300))
+THROTTLE_CACHE_ALIAS = os.getenv("THROTTLE_CACHE_ALIAS", BLOG_CACHE_ALIAS)
+
+IMAGE_RENDITION_WIDTHS = json.loads(
+    os.getenv("IMAGE_RENDITION_WIDTHS", "[320, 640, 1280]")
+)
+IMAGE_RENDITION_FORMATS = json.loads(
+    os.getenv("IMAGE_RENDITION_FORMATS", '["webp", "jpeg"]')
+)
+IMAGE_RENDITION_WORKERS = int(os.getenv("IMAGE_RENDITION_WORKERS", 2))
+IMAGE_RENDITION_EAGER = os.getenv("IMAGE_RENDITION_EAGER", "False") == "True"
+
+# Deepest allowed reply level (top-level comments are 0); paths must fit
+# 255 chars, so at most 24.
+COMMENT_MAX_DEPTH = int(os.getenv("COMMENT_MAX_DEPTH", 8))
+# Most replies returned under each comment of a page.
+COMMENT_TREE_MAX_REPLIES = int(os.getenv("COMMENT_TREE_MAX_REPLIES", 500))
+
+# Timelines (blog.feeds): posts are fanned out to follower timelines on
+# write unless the author has more than FEED_FANOUT_MAX_FOLLOWERS followers,
+# in which case followers pull them on read. trim_feeds keeps each timeline
+# at FEED_MAX_LENGTH entries.
+FEED_FANOUT_MAX_FOLLOWERS = int(os.getenv("FEED_FANOUT_MAX_FOLLOWERS", 1000))
+FEED_FANOUT_BATCH_SIZE = int(os.getenv("FEED_FANOUT_BATCH_SIZE", 500))
+FEED_MAX_LENGTH = int(os.getenv("FEED_MAX_LENGTH", 800))
+# Latest posts copied into a timeline when following an author.
+FEED_BACKFILL_SIZE = int(os.getenv("FEED_BACKFILL_SIZE", 20))
+FEED_PULL_CACHE_SECONDS = int(os.getenv("FEED_PULL_CACHE_SECONDS", 60))
+
+# Comment streams (blog.events). LocalBackend only reaches streams in the
+# same process; RedisBackend, the default when REDIS_URL is set, reaches
+# every worker and pod.
+EVENTS_BACKEND = os.getenv(
+    "EVENTS_BACKEND",
+    (
+        "blog.events.RedisBackend"
+        if os.getenv("REDIS_URL")
+        else "blog.events.LocalBackend"
+    ),
+)
+EVENTS_REDIS_URL = os.getenv("EVENTS_REDIS_URL", os.getenv("REDIS_URL", ""))
+# Messages a stream may fall behind before it is closed.
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", 100))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", 15))
+# Most missed comments sent to a stream reconnecting with Last-Event-ID.
+EVENTS_REPLAY_LIMIT = int(os.getenv("EVENTS_REPLAY_LIMIT", 100))
+
+# Post views are counted in memory per worker and written at most every
+# VIEW_COUNT_FLUSH_SECONDS (or once VIEW_COUNT_MAX_PENDING posts are
+# waiting); a killed worker loses at most that window of views.
+VIEW_COUNT_FLUSH_SECONDS = float(os.getenv("VIEW_COUNT_FLUSH_SECONDS", 10))
+VIEW_COUNT_MAX_PENDING = int(os.getenv("VIEW_COUNT_MAX_PENDING", 5000))
+VIEW_COUNT_BATCH_SIZE = int(os.getenv("VIEW_COUNT_BATCH_SIZE", 500))
+
+# Most tags a post may carry (and a ?tag= filter may combine).
+POST_MAX_TAGS = int(os.getenv("POST_MAX_TAGS", 10))
+
+# Comments inlined per post by ?expand=latest_comments.
+POST_EXPAND_COMMENTS = int(os.getenv("POST_EXPAND_COMMENTS", 3))
+
+# Slug -> post id entries kept in each worker's LRU, in front of the shared
+# cache. Entries expire after SLUG_LOCAL_CACHE_SECONDS so a rename made by
+# another worker is picked up within that window.
+SLUG_LOCAL_CACHE_SIZE = int(os.getenv("SLUG_LOCAL_CACHE_SIZE", 10000))
+SLUG_LOCAL_CACHE_SECONDS = float(os.getenv("SLUG_LOCAL_CACHE_SECONDS", 60))
+
+# Requests running more queries than this log a possible-N+1 warning (0 disables).
+METRICS_QUERY_WARNING_THRESHOLD = int(os.getenv("METRICS_QUERY_WARNING_THRESHOLD", 20))
+# When set, GET /metrics requires "Authorization: Bearer <METRICS_TOKEN>".
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+# Directory where every worker writes its metrics, so GET /metrics reports
+# all workers whichever one serves the scrape. gunicorn sets it; empty
+# reports only the serving worker. Workers write every METRICS_PUBLISH_SECONDS.
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_PUBLISH_SECONDS = float(os.getenv("METRICS_PUBLISH_SECONDS", 5))
 
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -0,0 +1,70 @@
+import multiprocessing
+import os
+import tempfile
+from pathlib import Path
+
+# Set GUNICORN_ASYNC=True to serve the ASGI app (blogapi.asgi) with uvicorn
+# workers, so the async endpoints under /async/ don't tie up a worker while
+# waiting on slow clients or the database.
+ASYNC_WORKERS = os.getenv("GUNICORN_ASYNC", "False") == "True"
+
+bind = f"0.0.0.0:{os.getenv('GUNICORN_PORT', '5000')}"
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", 1))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+
+if ASYNC_WORKERS:
+    wsgi_app = "blogapi.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+    # Persistent connections are not reused across requests under ASGI;
+    # use DB_POOL=True instead.
+    os.environ.setdefault("DB_CONN_MAX_AGE", "0")
+else:
+    wsgi_app = "blogapi.wsgi:application"
+    worker_class = "gthread" if threads > 1 else "sync"
+    # A WSGI worker serves at most `threads` requests at once, so that many
+    # pooled connections per worker is enough. Settings are read in each
+    # worker after fork, so this default reaches blogapi.settings.
+    os.environ.setdefault("DB_POOL_MAX_SIZE", str(threads))
+
+# Each worker writes its metrics here, so whichever worker answers a scrape
+# of /metrics reports them all (blog.metrics.collect).
+os.environ.setdefault(
+    "METRICS_DIR", os.path.join(tempfile.gettempdir(), "blog-metrics")
+)
+
+
+def on_starting(server):
+    """
+    Clear the previous run's metrics. Warn when the workers' pools could
+    exceed PostgreSQL's connection limit, and when several workers or
+    replicas would each keep their own cache.
+    """
+    metrics_dir = Path(os.environ["METRICS_DIR"])
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+    for path in metrics_dir.glob("*.json"):
+        path.unlink()
+    if not os.getenv("REDIS_URL") and (
+        workers > 1 or os.getenv("POSTGRES_REPLICA_HOSTS")
+    ):
+        # The per-process LRUCache is not shared: other workers keep serving
+        # stale posts and 304s after a write, throttles allow N times their
+        # rate and the replica read-your-writes flag is only seen locally.
+        server.log.warning(
+            "%d workers without REDIS_URL each keep a private cache; "
+            "set REDIS_URL so they share cached posts, throttles and "
+            "replica stickiness",
+            workers,
+        )
+    if os.getenv("DB_POOL", "False") != "True":
+        return
+    total = workers * int(os.getenv("DB_POOL_MAX_SIZE", 4))
+    limit = int(os.getenv("DB_MAX_CONNECTIONS", 100))
+    if total > limit:
+        server.log.warning(
+            "%d workers x DB_POOL_MAX_SIZE can open %d connections, "
+            "more than DB_MAX_CONNECTIONS=%d",
+            workers,
+            total,
+            limit,
+        )